@@ -0,0 +1,98 @@
+"""
+Benchmark the per-team save and load cost of the state file codecs.
+
+Usage
+-----
+    python scripts/benchmark_codecs.py [--teams 500] [--solved 13] [--repeat 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from models import TeamState  # noqa: E402
+from models.codecs import CODECS, load_file  # noqa: E402
+
+
+def benchmark_pure_python_yaml(directory: Path, teams: list[dict]) -> tuple[float, float]:
+    """Time the original pure-Python `yaml.dump` and `yaml.safe_load` implementation."""
+    start = time.perf_counter()
+    for team in teams:
+        with open(directory / f"{team['name']}.yaml", "w") as file:
+            yaml.dump(team, file, default_flow_style=False)
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for team in teams:
+        with open(directory / f"{team['name']}.yaml", "r") as file:
+            TeamState(file_path=file.name, **yaml.safe_load(file))
+    load_time = time.perf_counter() - start
+
+    return save_time, load_time
+
+
+def benchmark_codec(directory: Path, suffix: str, teams: list[dict]) -> tuple[float, float]:
+    """Time saving and loading every team with the codec for `suffix`."""
+    team_states = [
+        TeamState(file_path=str(directory / f"{team['name']}{suffix}"), **team) for team in teams
+    ]
+
+    start = time.perf_counter()
+    for team_state in team_states:
+        team_state.save()
+    save_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for team_state in team_states:
+        file_path = directory / f"{team_state.name}{suffix}"
+        TeamState(file_path=str(file_path), **load_file(file_path))
+    load_time = time.perf_counter() - start
+
+    return save_time, load_time
+
+
+def main() -> None:
+    """Run the benchmark and print the cost per team in microseconds."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teams", type=int, default=500)
+    parser.add_argument("--solved", type=int, default=13)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    teams = [
+        {
+            "name": f"Team{ix}",
+            "goal_location_name": "Three doors",
+            "solved": {f"Location {location}": 1 for location in range(args.solved)},
+        }
+        for ix in range(args.teams)
+    ]
+
+    benchmarks = {
+        "yaml (pure python)": lambda directory: benchmark_pure_python_yaml(directory, teams)
+    }
+    for codec_name, codec in CODECS.items():
+        benchmarks[codec_name.value] = lambda directory, suffix=codec.suffix: benchmark_codec(
+            directory, suffix, teams
+        )
+
+    print(f"{'codec':<20}{'save [us/team]':>16}{'load [us/team]':>16}")
+    for name, benchmark in benchmarks.items():
+        timings = []
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                timings.append(benchmark(Path(temp_dir)))
+
+        save_time = min(timing[0] for timing in timings) / args.teams * 1e6
+        load_time = min(timing[1] for timing in timings) / args.teams * 1e6
+        print(f"{name:<20}{save_time:>16.1f}{load_time:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
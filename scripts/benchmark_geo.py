@@ -0,0 +1,78 @@
+"""
+Benchmark the vectorized bearing and distance helpers against their scalar versions.
+
+Usage
+-----
+    python scripts/benchmark_geo.py [--points 1000000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from geopy.distance import geodesic
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from helpers import calculate_bearing, calculate_bearings, calculate_distances  # noqa: E402
+
+# the scalar versions are timed on a sample and extrapolated, a million calls take minutes
+SCALAR_POINTS = 10_000
+
+
+def best_time(function, repeat: int) -> float:
+    """Return the fastest of `repeat` calls of a function in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print the total time and the cost per point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    generator = np.random.default_rng(0)
+    latitudes = generator.uniform(50, 54, size=(2, args.points))
+    longitudes = generator.uniform(3, 7, size=(2, args.points))
+    sample = min(args.points, SCALAR_POINTS)
+    locations_1 = list(zip(latitudes[0, :sample], longitudes[0, :sample], strict=True))
+    locations_2 = list(zip(latitudes[1, :sample], longitudes[1, :sample], strict=True))
+
+    benchmarks = {
+        "calculate_bearings": (
+            args.points,
+            lambda: calculate_bearings(latitudes[0], longitudes[0], latitudes[1], longitudes[1]),
+        ),
+        "calculate_distances": (
+            args.points,
+            lambda: calculate_distances(latitudes[0], longitudes[0], latitudes[1], longitudes[1]),
+        ),
+        "calculate_bearing": (
+            sample,
+            lambda: [
+                calculate_bearing(*pair) for pair in zip(locations_1, locations_2, strict=True)
+            ],
+        ),
+        "geodesic": (
+            sample,
+            lambda: [geodesic(*pair).meters for pair in zip(locations_1, locations_2, strict=True)],
+        ),
+    }
+
+    print(f"{'function':<22}{'points':>10}{f'total for {args.points} [s]':>26}{'[us/point]':>12}")
+    for name, (points, benchmark) in benchmarks.items():
+        per_point = best_time(benchmark, args.repeat) / points
+        print(f"{name:<22}{points:>10}{per_point * args.points:>26.3f}{per_point * 1e6:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Convert an NDJSON location log, including its rotated segments, to a binary ping log.
+
+Usage
+-----
+    python scripts/convert_location_log.py [--source state/location_log.ndjson]
+        [--target state/location_log.pings]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from helpers.ping_log import convert_ndjson_to_pings  # noqa: E402
+
+
+def main() -> None:
+    """Convert the log and print the number of pings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--source", default="state/location_log.ndjson")
+    parser.add_argument("--target", default=None, help="Defaults to the source with `.pings`.")
+    args = parser.parse_args()
+
+    target = args.target or str(Path(args.source).with_suffix(".pings"))
+    if Path(target).exists():
+        parser.error(f"'{target}' already exists, the pings would be appended twice.")
+
+    start = time.perf_counter()
+    n_pings = convert_ndjson_to_pings(args.source, target)
+    print(f"Converted {n_pings} pings to '{target}' in {time.perf_counter() - start:.1f} s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Simulate teams playing a game to compare the next location mechanics and radii.
+
+Usage
+-----
+    python scripts/simulate_game.py [--game game_data/game.yaml] [--teams 100000]
+        [--mechanic nearest_when_correct ...] [--radius 50 100 ...] [--p-correct 0.6]
+        [--p-dont-know 0.1] [--speed 1.2] [--answer-time 180] [--processes 4] [--seed 1]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from models import Game, NextLocationMechanic  # noqa: E402
+from helpers.simulate_game import simulate_game  # noqa: E402
+
+
+def main() -> None:
+    """Run the simulation for every mechanic and radius and print the summaries."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--game", default="game_data/game.yaml")
+    parser.add_argument("--teams", type=int, default=100_000)
+    parser.add_argument(
+        "--mechanic",
+        nargs="+",
+        type=NextLocationMechanic,
+        default=list(NextLocationMechanic),
+        help="Defaults to all mechanics.",
+    )
+    parser.add_argument(
+        "--radius", nargs="+", type=float, default=None, help="Defaults to the game radius."
+    )
+    parser.add_argument("--p-correct", type=float, default=0.6)
+    parser.add_argument("--p-dont-know", type=float, default=0.1)
+    parser.add_argument("--speed", type=float, default=1.2, help="Walking speed in m/s.")
+    parser.add_argument("--answer-time", type=float, default=180.0, help="Mean in seconds.")
+    parser.add_argument("--start-spread", type=float, default=600.0, help="In seconds.")
+    parser.add_argument("--window", type=float, default=300.0, help="Congestion window in s.")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    game = Game.from_yaml_file(args.game)
+    radii = args.radius or [game.radius]
+
+    print(
+        f"{'mechanic':<24}{'radius':>8}{'km p5':>8}{'km p50':>8}{'km p95':>8}"
+        f"{'min p5':>8}{'min p50':>9}{'min p95':>9}{'congestion':>12}{'time [s]':>10}"
+    )
+    for mechanic in args.mechanic:
+        for radius in radii:
+            start = time.perf_counter()
+            result = simulate_game(
+                game,
+                mechanic=mechanic,
+                n_teams=args.teams,
+                radius=radius,
+                p_correct=args.p_correct,
+                p_dont_know=args.p_dont_know,
+                walking_speed=args.speed,
+                answer_time=args.answer_time,
+                start_spread=args.start_spread,
+                congestion_window=args.window,
+                processes=args.processes,
+                seed=args.seed,
+            )
+            elapsed = time.perf_counter() - start
+
+            summary = result.summary()
+            print(
+                f"{mechanic.value:<24}{radius:>8g}"
+                f"{summary['distance_p5_km']:>8.2f}{summary['distance_p50_km']:>8.2f}"
+                f"{summary['distance_p95_km']:>8.2f}{summary['duration_p5_min']:>8.1f}"
+                f"{summary['duration_p50_min']:>9.1f}{summary['duration_p95_min']:>9.1f}"
+                f"{summary['max_congestion']:>12.0f}{elapsed:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
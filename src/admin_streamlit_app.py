@@ -1,20 +1,31 @@
 """Advanced Analytics scavenger hunt application."""
 
 from pathlib import Path
-import json
 
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from geopy.distance import geodesic
 
-from models import State, Game, Location
-from constants import STATE_FILE, GAME_FILE, LOGGING_FILE
-
-
-# Get game files
-game = Game.from_yaml_file(file_path=GAME_FILE)
-state = State.from_yaml_file(file_path=STATE_FILE, game=game)
+from helpers import (
+    calculate_travel_distances,
+    get_log_tail,
+    get_ping_log,
+    get_track_simplifier,
+)
+from models import State, Location
+from models.game_provider import get_game_provider
+from constants import (
+    STATE_FILE,
+    GAME_FILE,
+    LOGGING_FILE,
+    LOGGING_FORMAT,
+    MAP_TOLERANCE,
+    MAP_MAX_VERTICES,
+)
+
+
+# Get game files, shared by all sessions and only reloaded when they change
+game, state = get_game_provider(game_file=GAME_FILE, state_file=STATE_FILE).get()
 
 # Reload variables from state
 if "index" not in st.session_state:
@@ -39,9 +50,10 @@ def scavenger_admin():
         st.subheader("Team statistics")
 
         teams = state.get_teams_as_dict()
+        n_active_teams = state.n_active_teams
 
-        if state.n_active_teams > 0:
-            st.write(f"Number of registered teams: {state.n_active_teams}")
+        if n_active_teams > 0:
+            st.write(f"Number of registered teams: {n_active_teams}")
             team_statistics = []
             for team in teams.values():
                 current_goal = (
@@ -64,21 +76,26 @@ def scavenger_admin():
 
         ## Puzzle statistics
         st.subheader("Puzzle statistics")
+        n_answered = [0] * len(game.index)
+        n_correct = [0] * len(game.index)
+        for team in teams.values():
+            for location_name, score in team.solved.items():
+                if location_name in game.index:
+                    ordinal = game.index.ordinal(location_name)
+                    n_answered[ordinal] += 1
+                    n_correct[ordinal] += score > 0
+
         puzzle_statistics = []
         for ix, location in enumerate(game.locations):
-            n_teams_solved = sum(1 for team in teams.values() if location.name in team.solved)
-            n_teams_correct = sum(
-                1
-                for team in teams.values()
-                if location.name in team.solved and team.solved[location.name] > 0
-            )
+            n_teams_solved = n_answered[ix]
+            n_teams_correct = n_correct[ix]
             n_teams_incorrect = n_teams_solved - n_teams_correct
             puzzle_statistics.append(
                 {
                     "Id": ix + 1,
                     "Location": location.name,
                     "Teams answered": n_teams_solved,
-                    "Teams unanswered": state.n_active_teams - n_teams_solved,
+                    "Teams unanswered": n_active_teams - n_teams_solved,
                     "Teams correct": n_teams_correct,
                     "Teams incorrect": n_teams_incorrect,
                 }
@@ -115,9 +132,12 @@ def scavenger_admin():
         )
         if st.checkbox(label="Delete all team data"):
             if st.button(label="Confirm deletion"):
+                state.delete_all_teams()
+
                 state_folder = Path(STATE_FILE).parent
                 for file in state_folder.glob("*"):
-                    file.unlink()
+                    if file.is_file():
+                        file.unlink()
 
                 st.write("All team data has been deleted.")
 
@@ -163,19 +183,27 @@ def scavenger_admin():
         ## Title
         st.subheader("Map")
 
-        if not Path(LOGGING_FILE).exists():
+        # load the binary pings, or the lines appended to the ndjson logging file since the
+        # last refresh
+        if LOGGING_FORMAT == "binary":
+            logs = get_ping_log(str(Path(LOGGING_FILE).with_suffix(".pings"))).to_dataframe()
+        else:
+            logs = get_log_tail(LOGGING_FILE).read()
+        if logs.empty:
             st.write("No logging file found.")
             return
 
-        # load ndjson logging file
-        with open(LOGGING_FILE, "r") as f:
-            logs = pd.DataFrame([json.loads(line) for line in f])
-
         # Create map
         logs["timestamp"] = pd.to_datetime(logs["timestamp"])
-        logs_sorted = logs.sort_values(by="timestamp")
+        logs_sorted = logs.sort_values(by="timestamp", kind="stable")
+        full_resolution = st.checkbox(label="Full resolution", value=False)
+        if full_resolution:
+            tracks = logs_sorted
+        else:
+            simplifier = get_track_simplifier(LOGGING_FILE, MAP_TOLERANCE, MAP_MAX_VERTICES)
+            tracks = simplifier.simplify(logs_sorted)
         fig = px.line_mapbox(
-            data_frame=logs_sorted,
+            data_frame=tracks,
             lat="latitude",
             lon="longitude",
             hover_name="current_goal",
@@ -218,49 +246,9 @@ def scavenger_admin():
         }
 
         # Distance statistics
-        def calculate_distance(lat1, lon1, lat2, lon2):
-            if pd.isnull(lat1) or pd.isnull(lon1) or pd.isnull(lat2) or pd.isnull(lon2):
-                return 0
-            return geodesic((lat1, lon1), (lat2, lon2)).kilometers
-
-        logs_sorted["prev_latitude"] = logs_sorted["latitude"].shift()
-        logs_sorted["prev_longitude"] = logs_sorted["longitude"].shift()
-        no_beam_logs = logs_sorted[logs_sorted["beam_to_location"] == 0]
-        beam_logs = logs_sorted[logs_sorted["beam_to_location"] == 1]
-        no_beam_logs["distance"] = no_beam_logs.apply(
-            lambda row: calculate_distance(
-                row["latitude"], row["longitude"], row["prev_latitude"], row["prev_longitude"]
-            ),
-            axis=1,
-        )
-        beam_logs["distance"] = beam_logs.apply(
-            lambda row: calculate_distance(
-                row["latitude"], row["longitude"], row["prev_latitude"], row["prev_longitude"]
-            ),
-            axis=1,
-        )
-
-        summary_df = (
-            logs_sorted.groupby("team_name")
-            .apply(
-                lambda group: pd.Series(
-                    {
-                        "points_clicked": no_beam_logs[
-                            no_beam_logs["team_name"] == group.name
-                        ].shape[0],
-                        "distance_traveled": no_beam_logs[no_beam_logs["team_name"] == group.name][
-                            "distance"
-                        ].sum(),
-                        "distance_beamed": beam_logs[beam_logs["team_name"] == group.name][
-                            "distance"
-                        ].sum(),
-                        "total_score": scores[group.name] if group.name in scores else 0,
-                    }
-                ),
-                include_groups=False,
-            )
-            .sort_values(by="total_score", ascending=False)
-        )
+        summary_df = calculate_travel_distances(logs_sorted)
+        summary_df["total_score"] = [scores.get(team_name, 0) for team_name in summary_df.index]
+        summary_df = summary_df.sort_values(by="total_score", ascending=False)
 
         st.dataframe(summary_df)
         st.download_button(
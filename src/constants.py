@@ -5,6 +5,22 @@ Default values are provided for the following environment variables:
 - `GAME_FILE`: The path to the game data file.
 - `STATE_FILE`: The path to the application state file.
 - `LOGGING_FILE`: The path to the location logging file.
+- `LOGGING_FORMAT`: `ndjson` or `binary`. The binary format stores fixed-width pings in
+  `LOGGING_FILE` with the suffix `.pings`, see `helpers.PingLog`.
+- `LOGGING_MIN_DISTANCE`: Log a position once the team moved this many meters.
+- `LOGGING_MIN_INTERVAL`: Log a position once this many seconds passed, even when the team
+  did not move (0 = log every position).
+- `LOGGING_FLUSH_INTERVAL`: The maximum number of seconds a location log record waits
+  before it is written.
+- `LOGGING_QUEUE_SIZE`: The maximum number of location log records waiting to be written.
+- `LOGGING_OVERFLOW`: `drop` or `block`, what to do with a record when the queue is full.
+- `LOGGING_MAX_BYTES`: Rotate the location log into a segment at this size (0 = never).
+- `LOGGING_MAX_AGE`: Rotate the location log after this many seconds (0 = never).
+- `LOGGING_COMPRESS`: Gzip the sealed segments of the location log (`1` or `0`).
+- `LOGGING_RETENTION_SEGMENTS`: Keep at most this many segments (0 = all).
+- `LOGGING_RETENTION_BYTES`: Keep at most this many bytes of segments (0 = all).
+- `MAP_TOLERANCE`: Simplify the tracks on the admin map to within this many meters.
+- `MAP_MAX_VERTICES`: Draw at most this many vertices on the admin map (0 = no bound).
 
 If the environment variables are not set, the default values are used.
 """
@@ -14,7 +30,39 @@ import os
 DEFAULT_GAME_FILE = "game_data/game.yaml"
 DEFAULT_STATE_FILE = "state/application_state.yaml"
 DEFAULT_LOGGING_FILE = "state/location_log.ndjson"
+DEFAULT_LOGGING_FORMAT = "ndjson"
+DEFAULT_LOGGING_MIN_DISTANCE = "10.0"
+DEFAULT_LOGGING_MIN_INTERVAL = "60.0"
+DEFAULT_LOGGING_FLUSH_INTERVAL = "1.0"
+DEFAULT_LOGGING_QUEUE_SIZE = "10000"
+DEFAULT_LOGGING_OVERFLOW = "drop"
+DEFAULT_LOGGING_MAX_BYTES = str(64 * 2**20)
+DEFAULT_LOGGING_MAX_AGE = "0"
+DEFAULT_LOGGING_COMPRESS = "1"
+DEFAULT_LOGGING_RETENTION_SEGMENTS = "0"
+DEFAULT_LOGGING_RETENTION_BYTES = "0"
+DEFAULT_MAP_TOLERANCE = "5.0"
+DEFAULT_MAP_MAX_VERTICES = "5000"
 
 GAME_FILE = os.environ.get("GAME_FILE", DEFAULT_GAME_FILE)
 STATE_FILE = os.environ.get("STATE_FILE", DEFAULT_STATE_FILE)
 LOGGING_FILE = os.environ.get("LOGGING_FILE", DEFAULT_LOGGING_FILE)
+LOGGING_FORMAT = os.environ.get("LOGGING_FORMAT", DEFAULT_LOGGING_FORMAT)
+LOGGING_MIN_DISTANCE = float(os.environ.get("LOGGING_MIN_DISTANCE", DEFAULT_LOGGING_MIN_DISTANCE))
+LOGGING_MIN_INTERVAL = float(os.environ.get("LOGGING_MIN_INTERVAL", DEFAULT_LOGGING_MIN_INTERVAL))
+LOGGING_FLUSH_INTERVAL = float(
+    os.environ.get("LOGGING_FLUSH_INTERVAL", DEFAULT_LOGGING_FLUSH_INTERVAL)
+)
+LOGGING_QUEUE_SIZE = int(os.environ.get("LOGGING_QUEUE_SIZE", DEFAULT_LOGGING_QUEUE_SIZE))
+LOGGING_OVERFLOW = os.environ.get("LOGGING_OVERFLOW", DEFAULT_LOGGING_OVERFLOW)
+LOGGING_MAX_BYTES = int(os.environ.get("LOGGING_MAX_BYTES", DEFAULT_LOGGING_MAX_BYTES))
+LOGGING_MAX_AGE = float(os.environ.get("LOGGING_MAX_AGE", DEFAULT_LOGGING_MAX_AGE))
+LOGGING_COMPRESS = os.environ.get("LOGGING_COMPRESS", DEFAULT_LOGGING_COMPRESS) == "1"
+LOGGING_RETENTION_SEGMENTS = int(
+    os.environ.get("LOGGING_RETENTION_SEGMENTS", DEFAULT_LOGGING_RETENTION_SEGMENTS)
+)
+LOGGING_RETENTION_BYTES = int(
+    os.environ.get("LOGGING_RETENTION_BYTES", DEFAULT_LOGGING_RETENTION_BYTES)
+)
+MAP_TOLERANCE = float(os.environ.get("MAP_TOLERANCE", DEFAULT_MAP_TOLERANCE))
+MAP_MAX_VERTICES = int(os.environ.get("MAP_MAX_VERTICES", DEFAULT_MAP_MAX_VERTICES))
@@ -1,14 +1,44 @@
 """Helper functions for the project."""
 
-from .calculate_bearing import calculate_bearing
+from .append_handle import AppendHandle, get_append_handle
+from .calculate_bearing import calculate_bearing, calculate_bearings
+from .calculate_distance import calculate_distances
+from .calculate_travel_distance import calculate_travel_distances
 from .determine_next_location import determine_next_location
 from .log_ndjson import log_ndjson
+from .log_tail import LogTail, get_log_tail
+from .ndjson_writer import NdjsonWriter, OverflowPolicy, get_ndjson_writer
+from .segmented_log import SegmentedLog
+from .ping_filter import PingFilter, get_ping_filter
+from .ping_log import PingLog, convert_ndjson_to_pings, get_ping_log
 from .handle_question import handle_question
+from .simplify_track import TrackSimplifier, get_track_simplifier, simplify_track
+from .simulate_game import simulate_game
 
 
 __all__ = [
+    "AppendHandle",
     "calculate_bearing",
+    "calculate_bearings",
+    "calculate_distances",
+    "calculate_travel_distances",
+    "convert_ndjson_to_pings",
     "determine_next_location",
+    "get_append_handle",
+    "get_log_tail",
+    "get_ndjson_writer",
+    "get_ping_filter",
+    "get_ping_log",
+    "get_track_simplifier",
     "handle_question",
     "log_ndjson",
+    "LogTail",
+    "NdjsonWriter",
+    "OverflowPolicy",
+    "PingFilter",
+    "PingLog",
+    "SegmentedLog",
+    "simplify_track",
+    "simulate_game",
+    "TrackSimplifier",
 ]
@@ -0,0 +1,248 @@
+"""Process-wide descriptors of log files opened for appending."""
+
+import os
+import threading
+import time
+
+from .segmented_log import SegmentedLog, rotation_count
+
+# check whether the file was rotated or deleted by another process at most this often
+REOPEN_CHECK_INTERVAL = 1.0
+
+# the time `append` fails fast after a failed call, doubling on every next failure
+BACKOFF = 0.05
+MAX_BACKOFF = 5.0
+
+
+class AppendHandle:
+    """
+    A descriptor of a file opened with `O_APPEND`, shared by every writer of the process.
+
+    Content is appended with a single `os.write`, so lines of concurrent writers never
+    interleave. A short write is completed by writing the rest, and a write that fails
+    halfway is removed again, so a retry does not leave a torn line behind. The file is opened on the first write and reopened after a failed write,
+    after a rotation in this process, and when another process deleted or replaced it,
+    which is checked at most every `REOPEN_CHECK_INTERVAL` seconds.
+
+    Parameters
+    ----------
+    file_path : str
+        The file to append to.
+    """
+
+    def __init__(self, file_path: str):
+        """Initialize the handle, the file is opened on the first write."""
+        self.file_path = os.path.abspath(file_path)
+        self._lock = threading.Lock()
+        self._file_descriptor: int | None = None
+        self._inode = (0, 0)
+        self._rotations = 0
+        self._checked_at = 0.0
+        self._failures = 0
+        self._retry_at = 0.0
+
+    def write(self, content: bytes, tell: bool = False) -> int:
+        """
+        Append content with a single write.
+
+        Parameters
+        ----------
+        content : bytes
+            The content to append.
+        tell : bool, optional (default=False)
+            Get the size of the file after the write, which takes another system call.
+
+        Returns
+        -------
+        int
+            The size of the file after the write, or 0 when `tell` is not set.
+
+        Raises
+        ------
+        OSError
+            If the file could not be opened or written; the next write reopens it.
+        """
+        with self._lock:
+            return self._write(content, tell)
+
+    def append(self, content: bytes, retry: int, tell: bool = False) -> int:
+        """
+        Append content with a single write, reopening the file when a write fails.
+
+        When all attempts fail, the calls within a growing backoff fail at once without
+        touching the file, instead of sleeping.
+
+        Parameters
+        ----------
+        content : bytes
+            The content to append.
+        retry : int
+            The number of attempts to write the content.
+        tell : bool, optional (default=False)
+            See `write`.
+
+        Returns
+        -------
+        int
+            The size of the file after the write, or 0 when `tell` is not set.
+
+        Raises
+        ------
+        IOError
+            If all attempts failed, or a previous call failed less than the backoff ago.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._retry_at:
+                raise IOError(
+                    f"Not logging to '{self.file_path}' for {self._retry_at - now:.2f} seconds "
+                    f"after {self._failures} failed attempts."
+                )
+
+            error: OSError | None = None
+            for _ in range(retry):
+                try:
+                    size = self._write(content, tell)
+                    self._failures = 0
+                    return size
+                except OSError as e:
+                    error = e
+
+            self._failures += 1
+            self._retry_at = now + min(BACKOFF * 2 ** (self._failures - 1), MAX_BACKOFF)
+            raise IOError(f"Failed to log data after {retry} attempts due to: {error}") from error
+
+    def rotate(self, segmented_log: SegmentedLog, size: int | None = None) -> bool:
+        """
+        Seal the file into a segment when it is due, without writes in between.
+
+        The handle is locked during the rotation, so no write of this process lands in the
+        file after it was sealed.
+
+        Parameters
+        ----------
+        segmented_log : SegmentedLog
+            The segmented log of the file.
+        size : int, optional
+            The size of the file in bytes, when the caller knows it.
+
+        Returns
+        -------
+        bool
+            Whether the file was rotated.
+        """
+        with self._lock:
+            if not segmented_log.should_rotate(size):
+                return False
+
+            self._close()
+            segmented_log.rotate()
+            return True
+
+    def close(self) -> None:
+        """Close the file, the next write opens it again."""
+        with self._lock:
+            self._close()
+
+    def _write(self, content: bytes, tell: bool) -> int:
+        """Write content, reopening a stale file, with the lock held."""
+        now = time.monotonic()
+        try:
+            if self._file_descriptor is None or self._is_stale(now):
+                self._open(now)
+            assert self._file_descriptor is not None
+            self._write_all(self._file_descriptor, content)
+            return os.lseek(self._file_descriptor, 0, os.SEEK_CUR) if tell else 0
+        except OSError:
+            self._close()
+            raise
+
+    @staticmethod
+    def _write_all(file_descriptor: int, content: bytes) -> None:
+        """Write all content, removing a partial write when the rest fails."""
+        view = memoryview(content)
+        written = 0
+        try:
+            while written < len(content):
+                count = os.write(file_descriptor, view[written:])
+                if count == 0:
+                    raise OSError(f"Wrote {written} of {len(content)} bytes.")
+                written += count
+        except OSError:
+            if written:
+                # a retry writes the whole content again, so a partial line would be torn
+                # and duplicated; it is only removed while nothing was appended after it
+                end = os.lseek(file_descriptor, 0, os.SEEK_CUR)
+                if os.fstat(file_descriptor).st_size == end:
+                    os.ftruncate(file_descriptor, end - written)
+            raise
+
+    def _is_stale(self, now: float) -> bool:
+        """Check whether the open file was rotated, deleted or replaced."""
+        if rotation_count(self.file_path) != self._rotations:
+            return True
+        if now - self._checked_at < REOPEN_CHECK_INTERVAL:
+            return False
+
+        self._checked_at = now
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return True
+
+        return (stat.st_ino, stat.st_dev) != self._inode
+
+    def _open(self, now: float) -> None:
+        """Open the file for appending, closing a previously opened one."""
+        self._close()
+        self._rotations = rotation_count(self.file_path)
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        self._file_descriptor = os.open(self.file_path, flags, 0o644)
+        stat = os.fstat(self._file_descriptor)
+        self._inode = (stat.st_ino, stat.st_dev)
+        self._checked_at = now
+
+    def _close(self) -> None:
+        """Close the file, if it is open, with the lock held."""
+        if self._file_descriptor is not None:
+            try:
+                os.close(self._file_descriptor)
+            except OSError:
+                pass
+            self._file_descriptor = None
+
+
+_HANDLES: dict[str, AppendHandle] = {}
+_HANDLES_LOCK = threading.Lock()
+
+
+def get_append_handle(file_path: str) -> AppendHandle:
+    """
+    Get the process-wide append handle of a file, creating it on first use.
+
+    Parameters
+    ----------
+    file_path : str
+        The file to append to.
+
+    Returns
+    -------
+    AppendHandle
+        The handle of the file, shared by `log_ndjson` and `NdjsonWriter`.
+    """
+    key = os.path.abspath(file_path)
+    with _HANDLES_LOCK:
+        handle = _HANDLES.get(key)
+        if handle is None:
+            handle = _HANDLES[key] = AppendHandle(key)
+
+        return handle
+
+
+def close_all_handles() -> None:
+    """Close the files of all append handles, they are opened again on the next write."""
+    with _HANDLES_LOCK:
+        handles = list(_HANDLES.values())
+
+    for handle in handles:
+        handle.close()
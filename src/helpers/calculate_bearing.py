@@ -2,6 +2,8 @@
 
 import math
 
+import numpy as np
+
 
 def calculate_bearing(location_1, location_2):
     """
@@ -40,3 +42,41 @@ def calculate_bearing(location_1, location_2):
     bearing = (initial_bearing_degrees + 360) % 360
 
     return bearing
+
+
+def calculate_bearings(latitude_1, longitude_1, latitude_2, longitude_2) -> np.ndarray:
+    """
+    Calculate the bearings between arrays of geographic coordinates.
+
+    The array-in/array-out companion of `calculate_bearing`, for example for whole ping
+    tracks. The inputs are broadcast against each other, so a single coordinate can be
+    combined with an array of coordinates.
+
+    Parameters
+    ----------
+    latitude_1 : array_like of float
+        The latitudes of the first locations in decimal degrees.
+    longitude_1 : array_like of float
+        The longitudes of the first locations in decimal degrees.
+    latitude_2 : array_like of float
+        The latitudes of the second locations in decimal degrees.
+    longitude_2 : array_like of float
+        The longitudes of the second locations in decimal degrees.
+
+    Returns
+    -------
+    np.ndarray
+        The bearings from the first to the second locations in degrees, measured clockwise
+        from north, in [0, 360).
+    """
+    latitude_1 = np.radians(latitude_1)
+    latitude_2 = np.radians(latitude_2)
+    delta_longitude = np.radians(np.subtract(longitude_2, longitude_1))
+
+    cos_latitude_2 = np.cos(latitude_2)
+    x_component = np.sin(delta_longitude) * cos_latitude_2
+    y_component = np.cos(latitude_1) * np.sin(latitude_2) - np.sin(
+        latitude_1
+    ) * cos_latitude_2 * np.cos(delta_longitude)
+
+    return np.degrees(np.arctan2(x_component, y_component)) % 360
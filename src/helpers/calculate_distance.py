@@ -0,0 +1,42 @@
+"""Method to calculate the distances between arrays of geographic coordinates."""
+
+import numpy as np
+
+EARTH_RADIUS_METERS = 6_371_008.8
+
+
+def calculate_distances(latitude_1, longitude_1, latitude_2, longitude_2) -> np.ndarray:
+    """
+    Calculate the great-circle distances between arrays of geographic coordinates.
+
+    Uses the haversine formula on a sphere with the mean Earth radius, which differs less
+    than 0.5% from the geodesic distance of `geopy`. Use it for analytics over many points,
+    and `geopy.distance.geodesic` where a single distance must be exact. The inputs are
+    broadcast against each other.
+
+    Parameters
+    ----------
+    latitude_1 : array_like of float
+        The latitudes of the first locations in decimal degrees.
+    longitude_1 : array_like of float
+        The longitudes of the first locations in decimal degrees.
+    latitude_2 : array_like of float
+        The latitudes of the second locations in decimal degrees.
+    longitude_2 : array_like of float
+        The longitudes of the second locations in decimal degrees.
+
+    Returns
+    -------
+    np.ndarray
+        The distances between the first and the second locations in meters.
+    """
+    latitude_1 = np.radians(latitude_1)
+    latitude_2 = np.radians(latitude_2)
+    delta_latitude = latitude_2 - latitude_1
+    delta_longitude = np.radians(np.subtract(longitude_2, longitude_1))
+
+    haversine = (
+        np.sin(delta_latitude / 2) ** 2
+        + np.cos(latitude_1) * np.cos(latitude_2) * np.sin(delta_longitude / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(np.clip(haversine, 0.0, 1.0)))
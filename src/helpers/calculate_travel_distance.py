@@ -0,0 +1,54 @@
+"""Method to calculate the distances the teams traveled from the location log."""
+
+import numpy as np
+import pandas as pd
+
+from .calculate_distance import calculate_distances
+
+
+def calculate_travel_distances(logs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate the distances every team walked and beamed between its logged positions.
+
+    Every ping is measured against the previous ping of the same team, in a single
+    vectorized pass over all pings. The distance to a ping that beamed the team to its goal
+    is counted as beamed, the distance to any other ping as traveled. The first ping of a
+    team, and pings without coordinates, add no distance.
+
+    Parameters
+    ----------
+    logs : pd.DataFrame
+        The location log with the columns `team_name`, `latitude`, `longitude` and
+        `beam_to_location`, sorted by time.
+
+    Returns
+    -------
+    pd.DataFrame
+        Per team, the number of pings that were not beamed (`points_clicked`) and the
+        distances traveled and beamed in kilometers (`distance_traveled` and
+        `distance_beamed`).
+    """
+    previous = logs.groupby("team_name", sort=False, observed=True)[
+        ["latitude", "longitude"]
+    ].shift()
+    distances = calculate_distances(
+        previous["latitude"].to_numpy(dtype=float),
+        previous["longitude"].to_numpy(dtype=float),
+        logs["latitude"].to_numpy(dtype=float),
+        logs["longitude"].to_numpy(dtype=float),
+    )
+    distances = np.nan_to_num(distances) / 1000
+    beamed = logs["beam_to_location"].eq(True).to_numpy()
+
+    return (
+        pd.DataFrame(
+            {
+                "team_name": logs["team_name"].to_numpy(),
+                "points_clicked": ~beamed,
+                "distance_traveled": np.where(beamed, 0.0, distances),
+                "distance_beamed": np.where(beamed, distances, 0.0),
+            }
+        )
+        .groupby("team_name", sort=False, observed=True)
+        .sum()
+    )
@@ -1,16 +1,120 @@
 """Method to determine the next location for a team based on their current state, game information, and previous score."""
 
+from collections.abc import Callable, Sequence
 from random import choice
 from geopy.distance import geodesic
 
-from models import Game, TeamState
+from models import Game, NextLocationMechanic, TeamState
+from models.goal_counter import GoalCounter
+
+
+Strategy = Callable[[Sequence[int], Callable[[int], bool], int, GoalCounter | None], int]
+
+NEXT_LOCATION_STRATEGIES: dict[NextLocationMechanic, Strategy] = {}
+
+
+def register_strategy(mechanic: NextLocationMechanic) -> Callable[[Strategy], Strategy]:
+    """
+    Register a function as the strategy of a next location mechanic.
+
+    A strategy receives the ordinals of all locations sorted from nearest to furthest, a
+    function telling whether an ordinal is unsolved, the previous score and the goal counter
+    of the state, if any. It returns the ordinal of the next location and raises an
+    `IndexError` when all locations are solved.
+
+    Parameters
+    ----------
+    mechanic : NextLocationMechanic
+        The mechanic implemented by the strategy.
+
+    Returns
+    -------
+    Callable
+        A decorator that registers the strategy and returns it unchanged.
+    """
+
+    def decorator(strategy: Strategy) -> Strategy:
+        NEXT_LOCATION_STRATEGIES[mechanic] = strategy
+        return strategy
+
+    return decorator
+
+
+def _nearest(neighbors: Sequence[int], is_unsolved: Callable[[int], bool]) -> int:
+    """Return the nearest unsolved ordinal, only visiting the solved ones before it."""
+    for ordinal in neighbors:
+        if is_unsolved(ordinal):
+            return ordinal
+
+    raise IndexError("All locations are solved.")
+
+
+def _furthest(neighbors: Sequence[int], is_unsolved: Callable[[int], bool]) -> int:
+    """Return the furthest unsolved ordinal, only visiting the solved ones after it."""
+    return _nearest(neighbors[::-1], is_unsolved)
+
+
+def _random(neighbors: Sequence[int], is_unsolved: Callable[[int], bool]) -> int:
+    """Return a random unsolved ordinal."""
+    return choice([ordinal for ordinal in neighbors if is_unsolved(ordinal)])  # nosec
+
+
+@register_strategy(NextLocationMechanic.RANDOM)
+def random_strategy(neighbors, is_unsolved, previous_score, goal_counter):
+    """Go to a random unsolved location."""
+    return _random(neighbors, is_unsolved)
+
+
+@register_strategy(NextLocationMechanic.NEAREST)
+def nearest_strategy(neighbors, is_unsolved, previous_score, goal_counter):
+    """Go to the nearest unsolved location, whatever the score."""
+    return _nearest(neighbors, is_unsolved)
+
+
+@register_strategy(NextLocationMechanic.FURTHEST)
+def furthest_strategy(neighbors, is_unsolved, previous_score, goal_counter):
+    """Go to the furthest unsolved location, whatever the score."""
+    return _furthest(neighbors, is_unsolved)
+
+
+@register_strategy(NextLocationMechanic.NEAREST_WHEN_CORRECT)
+def nearest_when_correct_strategy(neighbors, is_unsolved, previous_score, goal_counter):
+    """Go to the nearest location after a correct answer, the furthest after a wrong one."""
+    if previous_score > 0:
+        return _nearest(neighbors, is_unsolved)
+    elif previous_score < 0:
+        return _furthest(neighbors, is_unsolved)
+
+    return _random(neighbors, is_unsolved)
+
+
+@register_strategy(NextLocationMechanic.FURTHEST_WHEN_CORRECT)
+def furthest_when_correct_strategy(neighbors, is_unsolved, previous_score, goal_counter):
+    """Go to the furthest location after a correct answer, the nearest after a wrong one."""
+    if previous_score > 0:
+        return _furthest(neighbors, is_unsolved)
+    elif previous_score < 0:
+        return _nearest(neighbors, is_unsolved)
+
+    return _random(neighbors, is_unsolved)
+
+
+@register_strategy(NextLocationMechanic.LEAST_CROWDED)
+def least_crowded_strategy(neighbors, is_unsolved, previous_score, goal_counter):
+    """Go to the unsolved location with the fewest teams heading to it."""
+    if goal_counter is None:
+        return _nearest(neighbors, is_unsolved)
+
+    return goal_counter.least_crowded(is_unsolved)
 
 
 def determine_next_location(
     team_state: TeamState,
     game: Game,
     previous_score: int,
-    current_location: tuple[float, float],
+    current_location: str | tuple[float, float],
+    mechanic: NextLocationMechanic = NextLocationMechanic.NEAREST_WHEN_CORRECT,
+    goal_counter: GoalCounter | None = None,
 ) -> str:
     """
     Determine the next location for a team based on their current state, game information, and previous score.
@@ -23,32 +127,52 @@ def determine_next_location(
         The current game information, including available locations.
     previous_score : int
         The score from the previous round. A positive score indicates success, and a negative score indicates failure.
-    current_location : tuple of float
-        The current latitude and longitude of the team in decimal degrees.
+    current_location : str or tuple of float
+        The name of the location the team is at, or its latitude and longitude in decimal
+        degrees. For a location name the presorted neighbors of the game are used, otherwise
+        the locations are sorted by their calculated distance.
+    mechanic : NextLocationMechanic, optional
+        The mechanic selecting the next location, see `NEXT_LOCATION_STRATEGIES`. Defaults to
+        `NEAREST_WHEN_CORRECT`.
+    goal_counter : GoalCounter, optional
+        The live goal counters of the state. The new goal of the team is recorded in it,
+        together with choosing it, so concurrent sessions see consistent counters.
 
     Returns
     -------
     Location
-        The next location for the team, selected from the unsolved locations, based on the previous score and distance.
-        If the previous score is positive, the closest location is returned. If the score is negative, the farthest location
-        is returned. If the score is neutral (zero), a random unsolved location is chosen.
+        The next location for the team, selected from the unsolved locations by the mechanic. With the default
+        mechanic, the closest location is returned if the previous score is positive, the farthest location if
+        the score is negative and a random unsolved location if the score is neutral (zero).
+
+    Raises
+    ------
+    IndexError
+        If all locations are solved.
     """
-    unsolved_locations = [
-        location for location in game.locations if location.name not in team_state.solved
-    ]
+    if isinstance(current_location, str):
+        names = game.index.names
+        neighbors: Sequence[int] = game.distances.neighbors[game.index.ordinal(current_location)]
+    else:
+        names = tuple(location.name for location in game.locations)
+        neighbors = sorted(
+            range(len(game.locations)),
+            key=lambda ordinal: geodesic(
+                (game.locations[ordinal].latitude, game.locations[ordinal].longitude),
+                current_location,
+            ).meters,
+        )
 
-    sorted_by_distance = sorted(
-        unsolved_locations,
-        key=lambda location: geodesic(
-            (location.latitude, location.longitude), current_location
-        ).meters,
-    )
+    def is_unsolved(ordinal: int) -> bool:
+        return names[ordinal] not in team_state.solved
 
-    if previous_score > 0:
-        next_location = sorted_by_distance[0]
-    elif previous_score < 0:
-        next_location = sorted_by_distance[-1]
-    else:
-        next_location = choice(sorted_by_distance)  # nosec
+    strategy = NEXT_LOCATION_STRATEGIES[NextLocationMechanic(mechanic)]
+    if goal_counter is None:
+        return names[strategy(neighbors, is_unsolved, previous_score, None)]
 
-    return next_location.name
+    return names[
+        goal_counter.assign(
+            team_state.name,
+            lambda: strategy(neighbors, is_unsolved, previous_score, goal_counter),
+        )
+    ]
@@ -2,7 +2,8 @@
 
 from pathlib import Path
 import streamlit as st
-from models import QuestionType, Location, TeamState, Game, AnswerOption
+from models import QuestionType, Location, TeamState, Game, AnswerOption, NextLocationMechanic
+from models.goal_counter import GoalCounter
 from .determine_next_location import determine_next_location
 
 
@@ -35,6 +36,8 @@ def handle_answer_submission(
     team_state: TeamState,
     goal_location: Location,
     game: Game,
+    mechanic: NextLocationMechanic = NextLocationMechanic.NEAREST_WHEN_CORRECT,
+    goal_counter: GoalCounter | None = None,
 ):
     """
     Handle answer submission for open questions.
@@ -49,6 +52,12 @@ def handle_answer_submission(
         The state of the team submitting the answer.
     goal_location : Location
         The current goal location being processed.
+    game : Game
+        The game instance containing game-wide data.
+    mechanic : NextLocationMechanic, optional
+        The mechanic selecting the next location.
+    goal_counter : GoalCounter, optional
+        The live goal counters of the state, see `State.goal_counter`.
     """
     lowered_answer = answer.lower()
 
@@ -58,9 +67,9 @@ def handle_answer_submission(
             (option.score for option in options if option.option in ["", "wrong"]), options[0].score
         ),  # Default to the first option's score
     )
-    team_state.solved[goal_location.name] = score
+    team_state.record_answer(goal_location.name, score, option=answer)
 
-    update_team_state(team_state, score, goal_location, game)
+    update_team_state(team_state, score, goal_location, game, mechanic, goal_counter)
 
 
 def handle_button_click(
@@ -68,6 +77,8 @@ def handle_button_click(
     team_state: TeamState,
     goal_location: Location,
     game: Game,
+    mechanic: NextLocationMechanic = NextLocationMechanic.NEAREST_WHEN_CORRECT,
+    goal_counter: GoalCounter | None = None,
 ):
     """
     Handle button click for multiple-choice or 'don't know' answers.
@@ -82,11 +93,13 @@ def handle_button_click(
         The current goal location being processed.
     game : Game
         The game instance containing game-wide data.
-    state : State
-        The state object used to update team progress.
+    mechanic : NextLocationMechanic, optional
+        The mechanic selecting the next location.
+    goal_counter : GoalCounter, optional
+        The live goal counters of the state, see `State.goal_counter`.
     """
-    team_state.solved[goal_location.name] = option.score
-    update_team_state(team_state, option.score, goal_location, game)
+    team_state.record_answer(goal_location.name, option.score, option=option.option)
+    update_team_state(team_state, option.score, goal_location, game, mechanic, goal_counter)
 
 
 def update_team_state(
@@ -94,6 +107,8 @@ def update_team_state(
     score: int,
     goal_location: Location,
     game: Game,
+    mechanic: NextLocationMechanic = NextLocationMechanic.NEAREST_WHEN_CORRECT,
+    goal_counter: GoalCounter | None = None,
 ):
     """
     Update the team state and determine the next goal location.
@@ -108,22 +123,34 @@ def update_team_state(
         The location where the question is being answered.
     game : Game
         The game instance that holds location data.
-    state : State
-        The state object used to persist updates.
+    mechanic : NextLocationMechanic, optional
+        The mechanic selecting the next location.
+    goal_counter : GoalCounter, optional
+        The live goal counters of the state, see `State.goal_counter`.
     """
     if len(game.locations) - len(team_state.solved) > 0:
         next_goal_location_name = determine_next_location(
             team_state=team_state,
             game=game,
             previous_score=score,
-            current_location=goal_location.coordinates,
+            current_location=goal_location.name,
+            mechanic=mechanic,
+            goal_counter=goal_counter,
         )
         team_state.goal_location_name = next_goal_location_name
+    elif goal_counter is not None:
+        goal_counter.set_goal(team_state.name, None)
 
     team_state.save()
 
 
-def handle_question(goal_location: Location, team_state: TeamState, game: Game):
+def handle_question(
+    goal_location: Location,
+    team_state: TeamState,
+    game: Game,
+    mechanic: NextLocationMechanic = NextLocationMechanic.NEAREST_WHEN_CORRECT,
+    goal_counter: GoalCounter | None = None,
+):
     """
     Handle the display and interaction of the question.
 
@@ -135,8 +162,10 @@ def handle_question(goal_location: Location, team_state: TeamState, game: Game):
         The current state of the team interacting with the question.
     game : Game
         The game instance containing all locations.
-    state : State
-        The state object used to persist updates.
+    mechanic : NextLocationMechanic, optional
+        The mechanic selecting the next location, usually `State.next_location_mechanic`.
+    goal_counter : GoalCounter, optional
+        The live goal counters of the state, see `State.goal_counter`.
     """
     base_question_path = Path(game.file_path).parent
     display_question(goal_location, base_question_path)
@@ -152,6 +181,8 @@ def handle_question(goal_location: Location, team_state: TeamState, game: Game):
                     team_state=team_state,
                     goal_location=goal_location,
                     game=game,
+                    mechanic=mechanic,
+                    goal_counter=goal_counter,
                 ),
             )
     elif goal_location.question_type == QuestionType.OpenQuestion:
@@ -164,6 +195,8 @@ def handle_question(goal_location: Location, team_state: TeamState, game: Game):
                 team_state=team_state,
                 goal_location=goal_location,
                 game=game,
+                mechanic=mechanic,
+                goal_counter=goal_counter,
             ),
         )
 
@@ -175,5 +208,7 @@ def handle_question(goal_location: Location, team_state: TeamState, game: Game):
                 team_state=team_state,
                 goal_location=goal_location,
                 game=game,
+                mechanic=mechanic,
+                goal_counter=goal_counter,
             ),
         )
@@ -1,15 +1,21 @@
 """Log function to log to NDJSON file."""
 
 import json
-import time
-import random
 
+from .append_handle import get_append_handle
+from .segmented_log import SegmentedLog
 
-def log_ndjson(file_path, retry: int = 10, **data) -> None:
+
+def log_ndjson(
+    file_path, retry: int = 10, segmented_log: SegmentedLog | None = None, **data
+) -> None:
     """
     Log data to NDJSON file.
 
-    Append all provided data as a single line to the file.
+    Append all provided data as a single line to the file, with a single write to the
+    process-wide `AppendHandle` of the file. A failing write is retried at once on a
+    reopened file; when all attempts fail, the calls within a growing backoff fail without
+    touching the file instead of sleeping.
 
     Parameters
     ----------
@@ -18,24 +24,18 @@ def log_ndjson(file_path, retry: int = 10, **data) -> None:
     data : dict
         Data to log.
     retry : int, optional
-        Number of retries if the logging operation fails (default is 10).
+        Number of attempts to write the data (default is 10).
+    segmented_log : SegmentedLog, optional
+        Rotates the file into segments when it is due after the write.
 
     Raises
     ------
     IOError
         If the data could not be logged to the file after the number of retries due to file-related issues.
     """
-    attempt = 0
-    while attempt < retry:
-        try:
-            with open(file_path, "a") as file:
-                file.write(json.dumps(data) + "\n")
-            break
-
-        except (OSError, IOError) as e:
-            attempt += 1
-
-            if attempt >= retry:
-                raise IOError(f"Failed to log data after {retry} attempts due to: {str(e)}") from e
+    handle = get_append_handle(file_path)
+    line = (json.dumps(data) + "\n").encode("utf-8")
+    size = handle.append(line, retry, tell=segmented_log is not None)
 
-            time.sleep(random.uniform(0, 1))  # nosec
+    if segmented_log is not None:
+        handle.rotate(segmented_log, size)
@@ -0,0 +1,293 @@
+"""Incremental reading of the NDJSON location log and its segments."""
+
+import gzip
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .segmented_log import SegmentedLog
+
+
+def _parse_lines(content: bytes) -> list[dict[str, Any]]:
+    """Parse NDJSON lines, skipping malformed ones."""
+    records = []
+    for line in content.splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict):
+            records.append(record)
+
+    return records
+
+
+def _read_segment(path: Path, offset: int = 0) -> bytes:
+    """Read a plain or gzipped segment from an offset in its uncompressed content."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as file:
+        file.seek(offset)
+        return file.read()
+
+
+class _Columns:
+    """
+    The records of a log in preallocated columns, growing by doubling their capacity.
+
+    Appending costs time in proportion to the appended records, and a frame of the records
+    so far is a view on the columns, without copying them.
+    """
+
+    def __init__(self):
+        """Initialize empty columns."""
+        self.size = 0
+        self._capacity = 0
+        self._columns: dict[str, np.ndarray] = {}
+
+    def extend(self, frame: pd.DataFrame) -> None:
+        """Append the rows of a frame, promoting the columns to fit its values."""
+        if frame.empty:
+            return
+
+        size = self.size + len(frame)
+        if size > self._capacity:
+            self._capacity = max(size, 2 * self._capacity, 1024)
+            for name, column in self._columns.items():
+                self._columns[name] = self._grow(column, column.dtype)
+
+        for name in frame.columns:
+            values = frame[name].to_numpy()
+            if name not in self._columns:
+                self._columns[name] = self._new_column(values.dtype)
+            column = self._columns[name]
+            dtype = _common_dtype(column.dtype, values.dtype)
+            if dtype != column.dtype:
+                column = self._columns[name] = self._grow(column, dtype)
+            column[self.size : size] = values
+
+        for name, column in self._columns.items():
+            if name not in frame.columns:
+                # missing values, as `pd.concat` fills them in
+                dtype = _common_dtype(column.dtype, np.dtype(np.float64))
+                if dtype != column.dtype:
+                    column = self._columns[name] = self._grow(column, dtype)
+                column[self.size : size] = np.nan
+
+        self.size = size
+
+    def frame(self) -> pd.DataFrame:
+        """Return the records so far as a read-only view on the columns."""
+        views = {}
+        for name, column in self._columns.items():
+            view = column[: self.size]
+            view.flags.writeable = False
+            views[name] = view
+
+        return pd.DataFrame(views, copy=False)
+
+    def _new_column(self, dtype: np.dtype) -> np.ndarray:
+        """Create a column of the capacity, missing values for the rows so far."""
+        if self.size == 0:
+            return np.empty(self._capacity, dtype=dtype)
+
+        column = np.empty(self._capacity, dtype=_common_dtype(dtype, np.dtype(np.float64)))
+        column[: self.size] = np.nan
+        return column
+
+    def _grow(self, column: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        """Copy the rows of a column into a new one of the capacity and dtype."""
+        grown = np.empty(self._capacity, dtype=dtype)
+        grown[: self.size] = column[: self.size]
+        return grown
+
+
+def _common_dtype(dtype_1: np.dtype, dtype_2: np.dtype) -> np.dtype:
+    """Return the dtype holding the values of both dtypes, as `pd.concat` promotes them."""
+    if dtype_1 == dtype_2:
+        return dtype_1
+    if dtype_1.kind in "iuf" and dtype_2.kind in "iuf":
+        return np.result_type(dtype_1, dtype_2)
+
+    return np.dtype(object)
+
+
+class LogTail:
+    """
+    Reads a location log into a DataFrame, parsing every line only once.
+
+    The reader keeps the parsed records across reads. Sealed segments of the log never
+    change, so each one is parsed once. Of the active file only the lines appended since the
+    previous read are parsed; a partially written last line is left for the next read.
+    When the active file shrinks it was truncated and is parsed again from the start. When
+    it is replaced it was rotated: the records parsed so far are kept for the segment it
+    became, and only the rest of that segment is parsed. The manifest of the segments is
+    only read again when it changed on disk or the active file was replaced.
+
+    The records are kept in preallocated columns, so a read costs time in proportion to the
+    appended records instead of all records. Only a rotation, a truncation or the deletion of
+    segments builds the columns again from the parsed segments.
+
+    Parameters
+    ----------
+    file_path : str
+        The active NDJSON file of the log.
+
+    Attributes
+    ----------
+    n_parsed : int
+        The number of lines parsed so far, over all reads.
+    """
+
+    def __init__(self, file_path: str):
+        """Initialize the reader without reading anything yet."""
+        self.segmented_log = SegmentedLog(file_path)
+        self.file_path = self.segmented_log.file_path
+        self.n_parsed = 0
+        self._lock = threading.Lock()
+        self._sealed: list[Path] = []
+        self._manifest: tuple[int, int, int] | None = None
+        self._segments: dict[str, pd.DataFrame] = {}
+        self._active: list[dict[str, Any]] = []
+        self._inode: int | None = None
+        self._offset = 0
+        self._columns: _Columns | None = None
+
+    def read(self) -> pd.DataFrame:
+        """
+        Read the records appended since the previous read.
+
+        The frame is a read-only view on the records of the reader, without copying them.
+        Assigning a column to it is fine, but changing its values in place raises an error;
+        copy the frame to change it.
+
+        Returns
+        -------
+        pd.DataFrame
+            All records of the log, oldest first.
+        """
+        with self._lock:
+            try:
+                stat: os.stat_result | None = self.file_path.stat()
+            except FileNotFoundError:
+                stat = None
+
+            replaced = stat is None or stat.st_ino != self._inode
+            manifest = _signature(self.segmented_log.manifest_path)
+            if self._columns is None or replaced or manifest != self._manifest:
+                self._sealed = [
+                    path for path in self.segmented_log.segments() if path != self.file_path
+                ]
+                self._manifest = manifest
+            new_segments = [path for path in self._sealed if path.name not in self._segments]
+
+            rebuild = self._columns is None
+            if self._inode is not None:
+                # a new segment means a rotation, even when the new active file got the inode
+                # of the old one
+                if new_segments or replaced:
+                    # rotated: the active records are the start of the first new segment
+                    if new_segments and self._active:
+                        path = new_segments.pop(0)
+                        records = self._active + self._parse(_read_segment(path, self._offset))
+                        self._segments[path.name] = pd.DataFrame(records)
+                    self._reset_active()
+                    rebuild = True
+                elif stat is not None and stat.st_size < self._offset:
+                    # truncated
+                    self._reset_active()
+                    rebuild = True
+
+            for path in new_segments:
+                self._segments[path.name] = pd.DataFrame(self._parse(_read_segment(path)))
+                rebuild = True
+
+            names = {path.name for path in self._sealed}
+            for name in set(self._segments) - names:
+                # deleted by retention
+                del self._segments[name]
+                rebuild = True
+
+            appended: list[dict[str, Any]] = []
+            if stat is not None:
+                appended = self._read_active(stat)
+
+            if rebuild:
+                self._columns = _Columns()
+                for path in self._sealed:
+                    self._columns.extend(self._segments[path.name])
+                self._columns.extend(pd.DataFrame(self._active))
+            elif appended:
+                assert self._columns is not None
+                self._columns.extend(pd.DataFrame(appended))
+
+            assert self._columns is not None
+            return self._columns.frame()
+
+    def _read_active(self, stat: os.stat_result) -> list[dict[str, Any]]:
+        """Parse the complete lines appended to the active file since the previous read."""
+        self._inode = stat.st_ino
+        if stat.st_size == self._offset:
+            return []
+
+        with open(self.file_path, "rb") as file:
+            file.seek(self._offset)
+            content = file.read(stat.st_size - self._offset)
+
+        complete = content[: content.rfind(b"\n") + 1]
+        self._offset += len(complete)
+        records = self._parse(complete)
+        self._active.extend(records)
+        return records
+
+    def _parse(self, content: bytes) -> list[dict[str, Any]]:
+        """Parse lines and count them."""
+        records = _parse_lines(content)
+        self.n_parsed += len(records)
+        return records
+
+    def _reset_active(self) -> None:
+        """Forget the active file, to read it from the start."""
+        self._active = []
+        self._inode = None
+        self._offset = 0
+
+
+def _signature(path: Path) -> tuple[int, int, int] | None:
+    """Return the inode, modification time and size of a file, or None if it is missing."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+_TAILS: dict[str, LogTail] = {}
+_TAILS_LOCK = threading.Lock()
+
+
+def get_log_tail(file_path: str) -> LogTail:
+    """
+    Get the process-wide reader of a location log, creating it on first use.
+
+    Parameters
+    ----------
+    file_path : str
+        The active NDJSON file of the log.
+
+    Returns
+    -------
+    LogTail
+        The reader of the log, shared by all sessions.
+    """
+    with _TAILS_LOCK:
+        tail = _TAILS.get(file_path)
+        if tail is None:
+            tail = _TAILS[file_path] = LogTail(file_path)
+
+        return tail
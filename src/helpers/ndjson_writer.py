@@ -0,0 +1,271 @@
+"""Background writer that appends records to an NDJSON file in batches."""
+
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable
+from enum import Enum
+
+from .append_handle import close_all_handles, get_append_handle
+from .segmented_log import SegmentedLog
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(str, Enum):
+    """What to do with a record when the queue of the writer is full."""
+
+    DROP = "drop"
+    BLOCK = "block"
+
+
+_STOP = object()
+
+
+class NdjsonWriter:
+    """
+    Appends records to an NDJSON file from a dedicated thread.
+
+    Records are serialized by the caller and put in a bounded queue. The writer thread
+    writes everything that arrived within `flush_interval` seconds of the first waiting
+    record as a single write to the process-wide `AppendHandle` of the file, which keeps it
+    open with `O_APPEND` and reopens it after a rotation, or when another process deleted
+    or replaced it. A failing write is retried with a growing backoff on the writer thread,
+    never on the thread of the caller.
+
+    Parameters
+    ----------
+    file_path : str
+        The NDJSON file to append to.
+    flush_interval : float, optional (default=1.0)
+        The maximum number of seconds a record waits before it is written.
+    max_queue : int, optional (default=10_000)
+        The maximum number of records waiting to be written.
+    overflow : OverflowPolicy, optional (default=OverflowPolicy.DROP)
+        With `DROP` a record is dropped when the queue is full, with `BLOCK` the caller
+        waits for room in the queue.
+    batch_size : int, optional (default=1000)
+        The maximum number of records in a single write.
+    retry : int, optional (default=10)
+        The number of attempts to write a batch before it is dropped.
+    segmented_log : SegmentedLog, optional
+        Rotates the file into segments, checked after every batch on the writer thread.
+
+    Attributes
+    ----------
+    n_written : int
+        The number of records written.
+    n_dropped : int
+        The number of records dropped, because the queue was full or the writes failed.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        flush_interval: float = 1.0,
+        max_queue: int = 10_000,
+        overflow: OverflowPolicy = OverflowPolicy.DROP,
+        batch_size: int = 1000,
+        retry: int = 10,
+        segmented_log: SegmentedLog | None = None,
+    ):
+        """Initialize the writer and start its thread."""
+        self.file_path = file_path
+        self.flush_interval = flush_interval
+        self.overflow = OverflowPolicy(overflow)
+        self.batch_size = batch_size
+        self.retry = retry
+        self.segmented_log = segmented_log
+        self.n_written = 0
+        self.n_dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._handle = get_append_handle(file_path)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="ndjson-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, **data) -> bool:
+        """
+        Queue a record to be appended as a single line.
+
+        Parameters
+        ----------
+        data : dict
+            The record to write, serializable to JSON.
+
+        Returns
+        -------
+        bool
+            Whether the record was queued; False when it was dropped.
+
+        Raises
+        ------
+        RuntimeError
+            If the writer is closed.
+        """
+        if self._closed:
+            raise RuntimeError("The writer is closed.")
+
+        line = json.dumps(data) + "\n"
+        try:
+            self._queue.put(line, block=self.overflow == OverflowPolicy.BLOCK)
+        except queue.Full:
+            self.n_dropped += 1
+            return False
+
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until all records queued so far are written.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The maximum number of seconds to wait. Waits indefinitely when not given.
+
+        Returns
+        -------
+        bool
+            Whether the records were written within the timeout.
+        """
+        if self._closed:
+            return True
+
+        flushed = threading.Event()
+        self._queue.put(flushed)
+        return flushed.wait(timeout)
+
+    def close(self) -> None:
+        """Write all queued records, stop the thread and close the file."""
+        if self._closed:
+            return
+
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Collect records into batches and write them until the writer is closed."""
+        while True:
+            batch: list[str] = []
+            events: list[threading.Event] = []
+            stop = False
+
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    events.append(item)
+                else:
+                    batch.append(item)
+
+                if stop or events or len(batch) >= self.batch_size:
+                    break
+
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+
+            if batch:
+                size = self._write_batch(batch)
+                if size is not None:
+                    self._rotate(size)
+            for event in events:
+                event.set()
+
+            if stop:
+                self._handle.close()
+                return
+
+    def _write_batch(self, batch: list[str]) -> int | None:
+        """Append a batch to the file, backing off when a write fails."""
+        content = "".join(batch).encode("utf-8")
+        for attempt in range(1, self.retry + 1):
+            try:
+                size = self._handle.write(content, tell=self.segmented_log is not None)
+                self.n_written += len(batch)
+                return size
+            except OSError:
+                logger.exception("Failed to write to '%s' (attempt %d).", self.file_path, attempt)
+                if attempt < self.retry:
+                    time.sleep(min(0.05 * 2 ** (attempt - 1), 5.0))
+
+        self.n_dropped += len(batch)
+        return None
+
+    def _rotate(self, size: int) -> None:
+        """Seal the file into a segment when it is due, the next batch opens a new file."""
+        if self.segmented_log is None:
+            return
+
+        try:
+            self._handle.rotate(self.segmented_log, size)
+        except OSError:
+            logger.exception("Failed to rotate '%s'.", self.file_path)
+
+
+_WRITERS: dict[str, NdjsonWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+def get_ndjson_writer(
+    file_path: str,
+    flush_interval: float = 1.0,
+    max_queue: int = 10_000,
+    overflow: OverflowPolicy = OverflowPolicy.DROP,
+    make_segmented_log: Callable[[], SegmentedLog] | None = None,
+) -> NdjsonWriter:
+    """
+    Get the process-wide writer of an NDJSON file, creating it on first use.
+
+    Parameters
+    ----------
+    file_path : str
+        The NDJSON file to append to.
+    flush_interval : float, optional (default=1.0)
+        See `NdjsonWriter`.
+    max_queue : int, optional (default=10_000)
+        See `NdjsonWriter`, only used when the writer is created.
+    overflow : OverflowPolicy, optional (default=OverflowPolicy.DROP)
+        See `NdjsonWriter`.
+    make_segmented_log : Callable[[], SegmentedLog], optional
+        Creates the `segmented_log` of `NdjsonWriter`, only called when the writer is
+        created, so callers on a hot path do not build a log they throw away.
+
+    Returns
+    -------
+    NdjsonWriter
+        The writer of the file.
+    """
+    with _WRITERS_LOCK:
+        writer = _WRITERS.get(file_path)
+        if writer is None or writer._closed:
+            segmented_log = make_segmented_log() if make_segmented_log is not None else None
+            writer = NdjsonWriter(
+                file_path, flush_interval, max_queue, overflow, segmented_log=segmented_log
+            )
+            _WRITERS[file_path] = writer
+        else:
+            writer.flush_interval = flush_interval
+            writer.overflow = OverflowPolicy(overflow)
+
+        return writer
+
+
+@atexit.register
+def close_all_writers() -> None:
+    """Write all queued records of every writer and close the files, called on shutdown."""
+    with _WRITERS_LOCK:
+        writers = list(_WRITERS.values())
+        _WRITERS.clear()
+
+    for writer in writers:
+        writer.close()
+    close_all_handles()
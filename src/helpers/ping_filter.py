@@ -0,0 +1,144 @@
+"""Suppression of location pings of teams that did not move."""
+
+import threading
+import time
+from typing import NamedTuple
+
+from models.proximity import planar_distance_and_bearing
+
+
+class _LastPing(NamedTuple):
+    """The last logged ping of a team."""
+
+    latitude: float
+    longitude: float
+    time: float
+    progress: tuple
+
+
+class PingFilter:
+    """
+    Decides whether a location ping is worth logging.
+
+    A ping of a team is logged when the team moved at least `min_distance` meters since its
+    last logged ping, when `min_interval` seconds passed, or when its progress changed, for
+    example because it solved a location and got a new goal. All other pings, like the ones
+    of a team standing still and pressing reload, are suppressed and counted.
+
+    Parameters
+    ----------
+    min_distance : float, optional (default=10.0)
+        The distance in meters a team has to move before its next ping is logged.
+    min_interval : float, optional (default=60.0)
+        The number of seconds after which a ping is logged even when the team did not move.
+        0 logs every ping.
+
+    Attributes
+    ----------
+    n_logged : int
+        The number of pings that were let through.
+    n_suppressed : int
+        The number of suppressed pings.
+    """
+
+    def __init__(self, min_distance: float = 10.0, min_interval: float = 60.0):
+        """Initialize the filter without any teams."""
+        self.min_distance = min_distance
+        self.min_interval = min_interval
+        self.n_logged = 0
+        self.n_suppressed = 0
+        self._last: dict[str, _LastPing] = {}
+        self._lock = threading.Lock()
+
+    def should_log(
+        self,
+        team_name: str,
+        latitude: float,
+        longitude: float,
+        *progress,
+        now: float | None = None,
+    ) -> bool:
+        """
+        Check whether a ping is worth logging, and remember it when it is.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+        latitude : float
+            The latitude of the team in decimal degrees.
+        longitude : float
+            The longitude of the team in decimal degrees.
+        *progress
+            Values that log the ping whenever they change, like the goal of the team.
+        now : float, optional
+            The time of the ping in seconds, defaults to the monotonic clock.
+
+        Returns
+        -------
+        bool
+            Whether the ping should be logged.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            last = self._last.get(team_name)
+            if (
+                last is None
+                or last.progress != progress
+                or (self.min_interval <= 0 or now - last.time >= self.min_interval)
+                or planar_distance_and_bearing(last.latitude, last.longitude, latitude, longitude)[
+                    0
+                ]
+                >= self.min_distance
+            ):
+                self._last[team_name] = _LastPing(latitude, longitude, now, progress)
+                self.n_logged += 1
+                return True
+
+            self.n_suppressed += 1
+            return False
+
+    def forget(self, team_name: str) -> None:
+        """
+        Forget the last ping of a team, so its next ping is logged.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+        """
+        with self._lock:
+            self._last.pop(team_name, None)
+
+
+_FILTERS: dict[str, PingFilter] = {}
+_FILTERS_LOCK = threading.Lock()
+
+
+def get_ping_filter(key: str, min_distance: float = 10.0, min_interval: float = 60.0) -> PingFilter:
+    """
+    Get the process-wide ping filter of a location log, creating it on first use.
+
+    Parameters
+    ----------
+    key : str
+        Identifies the location log, for example its file path.
+    min_distance : float, optional (default=10.0)
+        See `PingFilter`.
+    min_interval : float, optional (default=60.0)
+        See `PingFilter`.
+
+    Returns
+    -------
+    PingFilter
+        The ping filter of the log.
+    """
+    with _FILTERS_LOCK:
+        ping_filter = _FILTERS.get(key)
+        if ping_filter is None:
+            ping_filter = _FILTERS[key] = PingFilter(min_distance, min_interval)
+        else:
+            ping_filter.min_distance = min_distance
+            ping_filter.min_interval = min_interval
+
+        return ping_filter
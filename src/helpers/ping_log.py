@@ -0,0 +1,395 @@
+"""Columnar binary log of location pings, read through a memory map."""
+
+import json
+import os
+import threading
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .segmented_log import TIMESTAMP_FORMAT, SegmentedLog
+
+MAGIC = b"SCAVPNG1"
+HEADER_SIZE = 16
+
+PING_DTYPE = np.dtype(
+    [
+        ("team", "<u4"),
+        ("timestamp", "<M8[s]"),
+        ("latitude", "<f8"),
+        ("longitude", "<f8"),
+        ("solved", "<u2"),
+        ("goal", "<u4"),
+        ("beam_to_location", "u1"),
+    ]
+)
+
+
+class PingLog:
+    """
+    An append-only file of fixed-width location pings.
+
+    Every ping is a record of `PING_DTYPE`. Team and goal names are dictionary encoded: the
+    records hold their codes and the names are appended to a small NDJSON file next to the
+    log, `location_log.pings.names` for example, so the log itself is read through
+    `np.memmap` without any parsing. A name is written before the first record using it,
+    and readers ignore a partially written last record, so readers never see an unknown
+    code.
+
+    Only one process should append to a log. When the log or its names file is deleted,
+    shrunk or replaced, for example by the admin app deleting all team data, the cached
+    names are dropped and read again from the names file, so new pings never use the codes
+    of names that are no longer in it.
+
+    Parameters
+    ----------
+    file_path : str
+        The binary log file, `location_log.pings` for example.
+    """
+
+    def __init__(self, file_path: str):
+        """Initialize the log, reading the names written so far."""
+        self.file_path = Path(file_path)
+        self.names_path = self.file_path.with_name(f"{self.file_path.name}.names")
+        self._lock = threading.Lock()
+        self._names: dict[str, list[str]] = {"team": [], "goal": []}
+        self._codes: dict[str, dict[str, int]] = {"team": {}, "goal": {}}
+        self._names_size = 0
+        self._names_inode: int | None = None
+        self._pings_seen: tuple[int, int] | None = None
+        self._read_names()
+
+    @property
+    def teams(self) -> tuple[str, ...]:
+        """Return the team names, by code."""
+        self._read_names()
+        return tuple(self._names["team"])
+
+    @property
+    def goals(self) -> tuple[str, ...]:
+        """Return the goal location names, by code."""
+        self._read_names()
+        return tuple(self._names["goal"])
+
+    def __len__(self) -> int:
+        """Return the number of complete pings in the log."""
+        try:
+            size = self.file_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+        return max(size - HEADER_SIZE, 0) // PING_DTYPE.itemsize
+
+    def append(
+        self,
+        team_name: str,
+        timestamp: str | datetime,
+        latitude: float,
+        longitude: float,
+        solved: int,
+        current_goal: str,
+        beam_to_location: bool,
+    ) -> None:
+        """
+        Append a single ping.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+        timestamp : str or datetime
+            The time of the ping, a string in `TIMESTAMP_FORMAT` or a datetime.
+        latitude : float
+            The latitude in decimal degrees.
+        longitude : float
+            The longitude in decimal degrees.
+        solved : int
+            The number of solved locations.
+        current_goal : str
+            The name of the goal location.
+        beam_to_location : bool
+            Whether the position was beamed to the goal location.
+        """
+        self.append_many(
+            [
+                {
+                    "team_name": team_name,
+                    "timestamp": timestamp,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "solved": solved,
+                    "current_goal": current_goal,
+                    "beam_to_location": beam_to_location,
+                }
+            ]
+        )
+
+    def append_many(self, pings: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Append pings with the fields of the NDJSON location log in a single write.
+
+        Parameters
+        ----------
+        pings : Iterable[Mapping[str, Any]]
+            The pings, with the keys of the arguments of `append`.
+
+        Returns
+        -------
+        int
+            The number of appended pings.
+        """
+        pings = list(pings)
+        records = np.zeros(len(pings), dtype=PING_DTYPE)
+        with self._lock:
+            self._check_pings()
+            self._read_names()
+            new_names: list[list[str]] = []
+            try:
+                for index, ping in enumerate(pings):
+                    records[index] = (
+                        self._code("team", str(ping["team_name"]), new_names),
+                        np.datetime64(_parse_timestamp(ping["timestamp"]), "s"),
+                        ping["latitude"],
+                        ping["longitude"],
+                        ping.get("solved", 0),
+                        self._code("goal", str(ping.get("current_goal", "")), new_names),
+                        bool(ping.get("beam_to_location", False)),
+                    )
+
+                if new_names:
+                    with open(self.names_path, "a", encoding="utf-8") as file:
+                        # drop a partially written name, so the new names start on a new line
+                        if file.tell() > self._names_size:
+                            file.truncate(self._names_size)
+                        file.write("".join(json.dumps(entry) + "\n" for entry in new_names))
+                    stat = self.names_path.stat()
+                    self._names_size, self._names_inode = stat.st_size, stat.st_ino
+            except BaseException:
+                # names that did not reach the names file must not keep their codes
+                self._forget(new_names)
+                raise
+
+            flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+            file_descriptor = os.open(self.file_path, flags, 0o644)
+            try:
+                content = records.tobytes()
+                size = os.fstat(file_descriptor).st_size
+                if size == 0:
+                    content = _header() + content
+                elif (size - HEADER_SIZE) % PING_DTYPE.itemsize:
+                    # drop a partially written ping, so the next pings stay aligned
+                    os.ftruncate(file_descriptor, size - (size - HEADER_SIZE) % PING_DTYPE.itemsize)
+                os.write(file_descriptor, content)
+                stat = os.fstat(file_descriptor)
+                self._pings_seen = (stat.st_ino, stat.st_size)
+            finally:
+                os.close(file_descriptor)
+
+        return len(pings)
+
+    def pings(self) -> np.ndarray:
+        """
+        Map the complete pings into memory, without reading or parsing them.
+
+        Returns
+        -------
+        np.ndarray
+            A read-only structured array of `PING_DTYPE`, backed by the file.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a ping log of this version.
+        """
+        n_pings = len(self)
+        if n_pings == 0:
+            return np.zeros(0, dtype=PING_DTYPE)
+
+        with open(self.file_path, "rb") as file:
+            if file.read(HEADER_SIZE) != _header():
+                raise ValueError(f"'{self.file_path}' is not a ping log of this version.")
+
+        return np.memmap(
+            self.file_path, dtype=PING_DTYPE, mode="r", offset=HEADER_SIZE, shape=(n_pings,)
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Get the pings with the columns of the NDJSON location log.
+
+        The team and goal names are categorical columns built from the codes, so no name
+        is decoded per ping.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per ping.
+        """
+        with self._lock:
+            self._check_pings()
+        pings = self.pings()
+        return pd.DataFrame(
+            {
+                "team_name": _categorical(pings["team"], self.teams),
+                "timestamp": pings["timestamp"],
+                "latitude": pings["latitude"],
+                "longitude": pings["longitude"],
+                "solved": pings["solved"],
+                "current_goal": _categorical(pings["goal"], self.goals),
+                "beam_to_location": pings["beam_to_location"].astype(bool),
+            }
+        )
+
+    def _code(self, kind: str, name: str, new_names: list[list[str]]) -> int:
+        """Get the code of a name, assigning the next code to a new name."""
+        code = self._codes[kind].get(name)
+        if code is None:
+            code = self._codes[kind][name] = len(self._names[kind])
+            self._names[kind].append(name)
+            new_names.append([kind, name])
+
+        return code
+
+    def _forget(self, new_names: list[list[str]]) -> None:
+        """Remove names assigned by `_code` from the cached names, newest first."""
+        for kind, name in reversed(new_names):
+            del self._codes[kind][name]
+            self._names[kind].pop()
+
+    def _check_pings(self) -> None:
+        """Drop the cached names when the log was deleted, shrunk or replaced."""
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            stat = None
+
+        if self._pings_seen is not None and (
+            stat is None or stat.st_ino != self._pings_seen[0] or stat.st_size < self._pings_seen[1]
+        ):
+            self._reset_names()
+        self._pings_seen = None if stat is None else (stat.st_ino, stat.st_size)
+
+    def _reset_names(self) -> None:
+        """Forget the names read so far, to read the names file again from the start."""
+        self._names = {"team": [], "goal": []}
+        self._codes = {"team": {}, "goal": {}}
+        self._names_size = 0
+        self._names_inode = None
+
+    def _read_names(self) -> None:
+        """Read the names appended since the last read."""
+        try:
+            stat = self.names_path.stat()
+        except FileNotFoundError:
+            self._reset_names()
+            return
+
+        if stat.st_ino != self._names_inode or stat.st_size < self._names_size:
+            self._reset_names()
+            self._names_inode = stat.st_ino
+
+        size = stat.st_size
+        if size == self._names_size:
+            return
+
+        with open(self.names_path, "rb") as file:
+            file.seek(self._names_size)
+            content = file.read(size - self._names_size)
+
+        # only complete lines, a partially written name is read the next time
+        complete = content[: content.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            kind, name = json.loads(line)
+            if name not in self._codes[kind]:
+                self._codes[kind][name] = len(self._names[kind])
+                self._names[kind].append(name)
+        self._names_size += len(complete)
+
+
+_PING_LOGS: dict[str, PingLog] = {}
+_PING_LOGS_LOCK = threading.Lock()
+
+
+def get_ping_log(file_path: str) -> PingLog:
+    """
+    Get the process-wide ping log of a file, creating it on first use.
+
+    Parameters
+    ----------
+    file_path : str
+        The binary log file.
+
+    Returns
+    -------
+    PingLog
+        The ping log of the file.
+    """
+    with _PING_LOGS_LOCK:
+        ping_log = _PING_LOGS.get(file_path)
+        if ping_log is None:
+            ping_log = _PING_LOGS[file_path] = PingLog(file_path)
+
+        return ping_log
+
+
+def _categorical(codes: np.ndarray, categories: tuple[str, ...]) -> pd.Categorical:
+    """Decode name codes, codes without a name, written during a reset, become missing."""
+    codes = codes.astype(np.int64)
+    codes[codes >= len(categories)] = -1
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _header() -> bytes:
+    """Return the header identifying the version and record size of a ping log."""
+    return MAGIC + PING_DTYPE.itemsize.to_bytes(4, "little") + bytes(HEADER_SIZE - len(MAGIC) - 4)
+
+
+def _parse_timestamp(timestamp: str | datetime) -> datetime:
+    """Parse a timestamp of the location log."""
+    if isinstance(timestamp, datetime):
+        return timestamp
+
+    return datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+
+
+def convert_ndjson_to_pings(ndjson_path: str, ping_path: str, batch_size: int = 100_000) -> int:
+    """
+    Convert an NDJSON location log, including its rotated segments, to a ping log.
+
+    Records without a team name, timestamp or coordinates are skipped.
+
+    Parameters
+    ----------
+    ndjson_path : str
+        The NDJSON location log.
+    ping_path : str
+        The ping log to append to.
+    batch_size : int, optional (default=100_000)
+        The number of pings written at once.
+
+    Returns
+    -------
+    int
+        The number of converted pings.
+    """
+    ping_log = PingLog(ping_path)
+    required = ("team_name", "timestamp", "latitude", "longitude")
+    n_pings = 0
+    batch: list[dict[str, Any]] = []
+    for record in SegmentedLog(ndjson_path).read():
+        if any(record.get(key) is None for key in required):
+            continue
+
+        batch.append(record)
+        if len(batch) >= batch_size:
+            n_pings += ping_log.append_many(batch)
+            batch = []
+
+    if batch:
+        n_pings += ping_log.append_many(batch)
+
+    return n_pings
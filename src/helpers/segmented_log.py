@@ -0,0 +1,330 @@
+"""Rotation of an NDJSON log into sealed, optionally compressed segments."""
+
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from models.codecs import dump_file, load_file
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# the number of rotations of every log in this process, by absolute path of the active file
+_ROTATIONS: dict[str, int] = {}
+
+
+def rotation_count(file_path: str) -> int:
+    """
+    Get the number of times a log was rotated in this process.
+
+    Writers that keep the active file open compare it with the count at opening, to reopen
+    the file after a rotation without checking the file system.
+
+    Parameters
+    ----------
+    file_path : str
+        The active file of the log.
+
+    Returns
+    -------
+    int
+        The number of rotations.
+    """
+    return _ROTATIONS.get(os.path.abspath(file_path), 0)
+
+
+class SegmentedLog:
+    """
+    An NDJSON log that is rotated into sealed segments by size or age.
+
+    Records are appended to the active file, `location_log.ndjson` for example. Rotating
+    renames it to the next segment, `location_log.000001.ndjson`, which is gzipped to
+    `location_log.000001.ndjson.gz` when `compress` is set. A manifest next to the log,
+    `location_log.ndjson.manifest.json`, records the time range, teams and size of every
+    segment, so readers skip the segments outside their query window without opening them.
+    Segments that are missing from the manifest, for example after a crash during a
+    rotation, are scanned and added.
+
+    Records are expected to have a `timestamp` in `TIMESTAMP_FORMAT` and a `team_name`.
+
+    Parameters
+    ----------
+    file_path : str
+        The active NDJSON file.
+    max_bytes : int, optional (default=64 MiB)
+        Rotate once the active file reaches this size. 0 disables rotation by size.
+    max_age : float, optional (default=0)
+        Rotate once the active file was started this many seconds ago. 0 disables rotation
+        by age.
+    compress : bool, optional (default=True)
+        Gzip the sealed segments.
+    max_segments : int, optional (default=0)
+        Delete the oldest segments beyond this number. 0 keeps all segments.
+    max_total_bytes : int, optional (default=0)
+        Delete the oldest segments while the segments take more disk space. 0 keeps all
+        segments.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        max_bytes: int = 64 * 2**20,
+        max_age: float = 0,
+        compress: bool = True,
+        max_segments: int = 0,
+        max_total_bytes: int = 0,
+    ):
+        """Initialize the log, the manifest is read when it is needed."""
+        self.file_path = Path(file_path)
+        self.manifest_path = self.file_path.with_name(f"{self.file_path.name}.manifest.json")
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+        self.max_segments = max_segments
+        self.max_total_bytes = max_total_bytes
+        self._lock = threading.RLock()
+        self._segment_pattern = re.compile(
+            rf"^{re.escape(self.file_path.stem)}\.(\d{{6}}){re.escape(self.file_path.suffix)}"
+            r"(\.gz)?$"
+        )
+        self._active_since: float | None = None
+
+    def should_rotate(self, size: int | None = None) -> bool:
+        """
+        Check whether the active file is due for rotation.
+
+        Parameters
+        ----------
+        size : int, optional
+            The size of the active file in bytes, when the caller knows it.
+
+        Returns
+        -------
+        bool
+            Whether the active file is large or old enough to rotate.
+        """
+        if size is None:
+            try:
+                size = self.file_path.stat().st_size
+            except FileNotFoundError:
+                return False
+
+        if size == 0:
+            return False
+        if self.max_bytes and size >= self.max_bytes:
+            return True
+        if self.max_age:
+            with self._lock:
+                if self._active_since is None:
+                    self._active_since = self._load_manifest().get("active_since", time.time())
+            return time.time() - self._active_since >= self.max_age
+
+        return False
+
+    def rotate(self) -> dict[str, Any] | None:
+        """
+        Seal the active file into a segment and apply the retention settings.
+
+        Writers must close the active file first; the next write creates a new one.
+
+        Returns
+        -------
+        dict or None
+            The manifest entry of the sealed segment, or None when the active file is empty.
+        """
+        with self._lock:
+            if not self.file_path.exists() or self.file_path.stat().st_size == 0:
+                return None
+
+            manifest = self._load_manifest()
+            sequence = max(
+                [manifest.get("next_sequence", 1)]
+                + [entry["sequence"] + 1 for entry in manifest["segments"]]
+            )
+            segment_path = self.file_path.with_name(
+                f"{self.file_path.stem}.{sequence:06d}{self.file_path.suffix}"
+            )
+            os.replace(self.file_path, segment_path)
+            key = os.path.abspath(self.file_path)
+            _ROTATIONS[key] = _ROTATIONS.get(key, 0) + 1
+            manifest["next_sequence"] = sequence + 1
+            manifest["active_since"] = self._active_since = time.time()
+
+            if self.compress:
+                compressed_path = segment_path.with_name(f"{segment_path.name}.gz")
+                temporary_path = compressed_path.with_name(f".{compressed_path.name}.tmp")
+                with open(segment_path, "rb") as source, gzip.open(temporary_path, "wb") as target:
+                    shutil.copyfileobj(source, target)
+                os.replace(temporary_path, compressed_path)
+                segment_path.unlink()
+                segment_path = compressed_path
+
+            entry = self._scan_segment(segment_path, sequence)
+            manifest["segments"].append(entry)
+            self._apply_retention(manifest)
+            dump_file(manifest, self.manifest_path)
+            return entry
+
+    def segments(
+        self, start: str | datetime | None = None, end: str | datetime | None = None
+    ) -> list[Path]:
+        """
+        Get the files holding the records of a time window, oldest first.
+
+        Parameters
+        ----------
+        start : str or datetime, optional
+            The start of the window, inclusive. Unbounded when not given.
+        end : str or datetime, optional
+            The end of the window, inclusive. Unbounded when not given.
+
+        Returns
+        -------
+        list[Path]
+            The sealed segments overlapping the window, followed by the active file when it
+            exists.
+        """
+        start, end = _format(start), _format(end)
+        with self._lock:
+            manifest = self._load_manifest()
+            paths = [
+                self.file_path.with_name(entry["file"])
+                for entry in manifest["segments"]
+                if entry["records"]
+                and (start is None or entry["end"] >= start)
+                and (end is None or entry["start"] <= end)
+            ]
+
+        if self.file_path.exists():
+            paths.append(self.file_path)
+
+        return paths
+
+    def read(
+        self, start: str | datetime | None = None, end: str | datetime | None = None
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Read the records of a time window, skipping the segments outside it.
+
+        Parameters
+        ----------
+        start : str or datetime, optional
+            The start of the window, inclusive. Unbounded when not given.
+        end : str or datetime, optional
+            The end of the window, inclusive. Unbounded when not given.
+
+        Yields
+        ------
+        dict
+            The records in the window in the order they were written.
+        """
+        start, end = _format(start), _format(end)
+        for path in self.segments(start, end):
+            try:
+                for record in _read_records(path):
+                    timestamp = record.get("timestamp")
+                    if start is not None and (timestamp is None or timestamp < start):
+                        continue
+                    if end is not None and (timestamp is None or timestamp > end):
+                        continue
+                    yield record
+            except FileNotFoundError:
+                # rotated or deleted by retention while reading
+                continue
+
+    def _load_manifest(self) -> dict[str, Any]:
+        """Read the manifest and reconcile it with the segments on disk."""
+        manifest: dict[str, Any] = {"segments": []}
+        if self.manifest_path.exists():
+            try:
+                manifest = load_file(self.manifest_path)
+            except (OSError, ValueError):
+                logger.exception("Failed to read the log manifest '%s'.", self.manifest_path)
+
+        on_disk = {}
+        for path in self.file_path.parent.glob(f"{self.file_path.stem}.*"):
+            match = self._segment_pattern.match(path.name)
+            if match is not None:
+                sequence = int(match.group(1))
+                # prefer the compressed file when a crash left both
+                if sequence not in on_disk or path.suffix == ".gz":
+                    on_disk[sequence] = path
+
+        segments = {
+            entry["sequence"]: entry
+            for entry in manifest["segments"]
+            if self.file_path.with_name(entry["file"]).exists()
+        }
+        for sequence, path in on_disk.items():
+            if sequence not in segments or segments[sequence]["file"] != path.name:
+                segments[sequence] = self._scan_segment(path, sequence)
+
+        manifest["segments"] = [segments[sequence] for sequence in sorted(segments)]
+        return manifest
+
+    def _scan_segment(self, path: Path, sequence: int) -> dict[str, Any]:
+        """Collect the time range, teams and size of a sealed segment."""
+        timestamps = []
+        teams = set()
+        records = 0
+        for record in _read_records(path):
+            records += 1
+            if "timestamp" in record:
+                timestamps.append(record["timestamp"])
+            if "team_name" in record:
+                teams.add(record["team_name"])
+
+        return {
+            "sequence": sequence,
+            "file": path.name,
+            "start": min(timestamps, default=""),
+            "end": max(timestamps, default=""),
+            "teams": sorted(teams),
+            "records": records,
+            "bytes": path.stat().st_size,
+        }
+
+    def _apply_retention(self, manifest: dict[str, Any]) -> None:
+        """Delete the oldest segments beyond the retention settings."""
+        segments = manifest["segments"]
+        while segments and (
+            (self.max_segments and len(segments) > self.max_segments)
+            or (
+                self.max_total_bytes
+                and sum(entry["bytes"] for entry in segments) > self.max_total_bytes
+            )
+        ):
+            oldest = segments.pop(0)
+            self.file_path.with_name(oldest["file"]).unlink(missing_ok=True)
+            logger.info("Deleted log segment '%s' by retention.", oldest["file"])
+
+
+def _format(timestamp: str | datetime | None) -> str | None:
+    """Format a window bound like the timestamps in the log."""
+    if isinstance(timestamp, datetime):
+        return timestamp.strftime(TIMESTAMP_FORMAT)
+
+    return timestamp
+
+
+def _read_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Read the records of a plain or gzipped NDJSON file, skipping malformed lines."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                yield record
@@ -0,0 +1,215 @@
+"""Douglas-Peucker simplification of the tracks of the teams, for the admin map."""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from models.proximity import ECCENTRICITY_SQUARED, SEMI_MAJOR_AXIS
+
+
+def simplify_track(latitudes: np.ndarray, longitudes: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Simplify a track with the Douglas-Peucker algorithm.
+
+    The track is projected onto a local east-north plane at its mean latitude, and a
+    position is dropped when it lies within `tolerance` meters of the segment between the
+    kept positions around it. The first and last positions are always kept.
+
+    Parameters
+    ----------
+    latitudes : np.ndarray
+        The latitudes of the track in decimal degrees.
+    longitudes : np.ndarray
+        The longitudes of the track in decimal degrees.
+    tolerance : float
+        The maximum distance in meters between a dropped position and the simplified track.
+
+    Returns
+    -------
+    np.ndarray
+        The positions in the track of the kept points, in increasing order.
+    """
+    n_points = len(latitudes)
+    if n_points <= 2:
+        return np.arange(n_points)
+
+    east, north = _project(np.asarray(latitudes, float), np.asarray(longitudes, float))
+    keep = np.zeros(n_points, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n_points - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        segment_east, segment_north = east[last] - east[first], north[last] - north[first]
+        point_east = east[first + 1 : last] - east[first]
+        point_north = north[first + 1 : last] - north[first]
+        length_squared = segment_east**2 + segment_north**2
+        if length_squared > 0:
+            fraction = (point_east * segment_east + point_north * segment_north) / length_squared
+            fraction = np.clip(fraction, 0, 1)
+            point_east = point_east - fraction * segment_east
+            point_north = point_north - fraction * segment_north
+
+        distances = np.hypot(point_east, point_north)
+        furthest = int(np.argmax(distances))
+        if distances[furthest] > tolerance:
+            split = first + 1 + furthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+    return np.flatnonzero(keep)
+
+
+def _project(latitudes: np.ndarray, longitudes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Project positions onto a local east-north plane in meters, at their mean latitude."""
+    mean_latitude = np.radians(latitudes.mean())
+    denominator = np.sqrt(1 - ECCENTRICITY_SQUARED * np.sin(mean_latitude) ** 2)
+    prime_vertical_radius = SEMI_MAJOR_AXIS / denominator
+    meridional_radius = SEMI_MAJOR_AXIS * (1 - ECCENTRICITY_SQUARED) / denominator**3
+
+    delta_longitude = (longitudes - longitudes[0] + 180) % 360 - 180
+    east = np.radians(delta_longitude) * prime_vertical_radius * np.cos(mean_latitude)
+    north = np.radians(latitudes - latitudes[0]) * meridional_radius
+    return east, north
+
+
+class _Track:
+    """The simplified track of a team, see `TrackSimplifier`."""
+
+    def __init__(self):
+        """Initialize an empty track."""
+        self.n_points = 0
+        self.frozen = np.zeros(0, dtype=np.intp)
+        self.kept = np.zeros(0, dtype=np.intp)
+
+
+class TrackSimplifier:
+    """
+    Simplifies the tracks of the teams incrementally, to draw a bounded number of vertices.
+
+    Every team has a cached simplified track. When pings arrive, only the tail of the track
+    since its last frozen vertex is simplified again; once that tail holds `chunk_size`
+    pings its kept vertices are frozen. When the tracks together still have more than
+    `max_vertices` vertices, they are simplified again with a doubling tolerance.
+
+    The tracks are expected to only grow; the track of a team with fewer pings than before
+    is simplified again from the start.
+
+    Parameters
+    ----------
+    tolerance : float, optional (default=5.0)
+        The maximum distance in meters between a dropped ping and the simplified track.
+    max_vertices : int, optional (default=5000)
+        The maximum number of vertices of all tracks together. 0 does not bound them.
+    chunk_size : int, optional (default=500)
+        The number of pings after which the simplified vertices are frozen.
+    """
+
+    def __init__(self, tolerance: float = 5.0, max_vertices: int = 5000, chunk_size: int = 500):
+        """Initialize the simplifier without any tracks."""
+        self.tolerance = tolerance
+        self.max_vertices = max_vertices
+        self.chunk_size = chunk_size
+        self._tracks: dict[str, _Track] = {}
+        self._lock = threading.Lock()
+
+    def simplify(self, logs: pd.DataFrame) -> pd.DataFrame:
+        """
+        Get the pings of the simplified tracks.
+
+        Parameters
+        ----------
+        logs : pd.DataFrame
+            The location log with the columns `team_name`, `latitude` and `longitude`,
+            sorted by time.
+
+        Returns
+        -------
+        pd.DataFrame
+            The rows of `logs` that are vertices of the simplified tracks, in their order.
+        """
+        if logs.empty:
+            return logs
+
+        latitudes = logs["latitude"].to_numpy(dtype=float)
+        longitudes = logs["longitude"].to_numpy(dtype=float)
+        groups = logs.groupby("team_name", sort=False, observed=True).indices
+        with self._lock:
+            for team_name in set(self._tracks) - set(groups):
+                del self._tracks[team_name]
+
+            rows = {}
+            for team_name, positions in groups.items():
+                track = self._tracks.get(team_name)
+                if track is None or len(positions) < track.n_points:
+                    track = self._tracks[team_name] = _Track()
+                self._update(track, latitudes[positions], longitudes[positions])
+                rows[team_name] = positions[track.kept]
+
+            tolerance = self.tolerance
+            while (
+                self.max_vertices
+                and sum(map(len, rows.values())) > self.max_vertices
+                # the first and last ping of every team are always drawn
+                and any(len(team_rows) > 2 for team_rows in rows.values())
+            ):
+                tolerance *= 2
+                rows = {
+                    team_name: team_rows[
+                        simplify_track(latitudes[team_rows], longitudes[team_rows], tolerance)
+                    ]
+                    for team_name, team_rows in rows.items()
+                }
+
+        return logs.iloc[np.sort(np.concatenate(list(rows.values())))]
+
+    def _update(self, track: _Track, latitudes: np.ndarray, longitudes: np.ndarray) -> None:
+        """Simplify the pings of a team that arrived since the previous update."""
+        n_points = len(latitudes)
+        if n_points == track.n_points:
+            return
+
+        start = int(track.frozen[-1]) if len(track.frozen) else 0
+        tail = start + simplify_track(latitudes[start:], longitudes[start:], self.tolerance)
+        track.kept = np.concatenate([track.frozen[:-1], tail])
+        track.n_points = n_points
+        if n_points - start >= self.chunk_size:
+            track.frozen = track.kept
+
+
+_SIMPLIFIERS: dict[str, TrackSimplifier] = {}
+_SIMPLIFIERS_LOCK = threading.Lock()
+
+
+def get_track_simplifier(
+    key: str, tolerance: float = 5.0, max_vertices: int = 5000
+) -> TrackSimplifier:
+    """
+    Get the process-wide track simplifier of a location log, creating it on first use.
+
+    Parameters
+    ----------
+    key : str
+        Identifies the location log, for example its file path.
+    tolerance : float, optional (default=5.0)
+        See `TrackSimplifier`.
+    max_vertices : int, optional (default=5000)
+        See `TrackSimplifier`.
+
+    Returns
+    -------
+    TrackSimplifier
+        The track simplifier of the log.
+    """
+    with _SIMPLIFIERS_LOCK:
+        simplifier = _SIMPLIFIERS.get(key)
+        if simplifier is None or simplifier.tolerance != tolerance:
+            simplifier = _SIMPLIFIERS[key] = TrackSimplifier(tolerance, max_vertices)
+        else:
+            simplifier.max_vertices = max_vertices
+
+        return simplifier
@@ -0,0 +1,339 @@
+"""Monte Carlo simulation of the routes that teams walk through a game."""
+
+import math
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from models import Game, NextLocationMechanic
+
+# teams choosing the least crowded location at the same step are handled in this many
+# batches, the counters are updated between batches
+LEAST_CROWDED_BATCHES = 256
+
+# below this number of teams per process, starting processes costs more than it saves
+MIN_TEAMS_PER_PROCESS = 5_000
+
+VectorizedStrategy = Callable[
+    [np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.random.Generator], np.ndarray
+]
+
+
+def _nearest(distances: np.ndarray, unsolved: np.ndarray) -> np.ndarray:
+    """Return the nearest unsolved ordinal per team, the first one on equal distances."""
+    return np.where(unsolved, distances, np.inf).argmin(axis=1)
+
+
+def _furthest(distances: np.ndarray, unsolved: np.ndarray) -> np.ndarray:
+    """Return the furthest unsolved ordinal per team, the last one on equal distances."""
+    reversed_distances = np.where(unsolved, distances, -np.inf)[:, ::-1]
+    return distances.shape[1] - 1 - reversed_distances.argmax(axis=1)
+
+
+def _random(unsolved: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Return a random unsolved ordinal per team."""
+    return np.where(unsolved, rng.random(unsolved.shape), np.inf).argmin(axis=1)
+
+
+def _by_score(
+    on_correct: np.ndarray, on_wrong: np.ndarray, on_neutral: np.ndarray, scores: np.ndarray
+) -> np.ndarray:
+    """Pick per team the ordinal for a positive, negative or neutral previous score."""
+    return np.select([scores > 0, scores < 0], [on_correct, on_wrong], on_neutral)
+
+
+def _least_crowded(goals: np.ndarray, unsolved: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Move the teams one by one batch to the unsolved location with the fewest teams."""
+    n_teams, n_locations = unsolved.shape
+    counts = np.bincount(goals, minlength=n_locations).astype(float)
+    next_goals = np.empty_like(goals)
+    batch_size = max(1, math.ceil(n_teams / LEAST_CROWDED_BATCHES))
+    for start in range(0, n_teams, batch_size):
+        batch = slice(start, start + batch_size)
+        counts -= np.bincount(goals[batch], minlength=n_locations)
+
+        # the random fraction breaks ties without changing the order of different counts
+        crowding = counts + rng.random((len(goals[batch]), n_locations))
+        next_goals[batch] = np.where(unsolved[batch], crowding, np.inf).argmin(axis=1)
+        counts += np.bincount(next_goals[batch], minlength=n_locations)
+
+    return next_goals
+
+
+# the strategies of `determine_next_location` for many teams at once: a strategy receives
+# the distances from the goal of every team to all locations, which locations each team has
+# not solved, the previous scores, the goals and a random generator, and returns the
+# ordinal of the next location per team
+VECTORIZED_STRATEGIES: dict[NextLocationMechanic, VectorizedStrategy] = {
+    NextLocationMechanic.RANDOM: lambda distances, unsolved, scores, goals, rng: _random(
+        unsolved, rng
+    ),
+    NextLocationMechanic.NEAREST: lambda distances, unsolved, scores, goals, rng: _nearest(
+        distances, unsolved
+    ),
+    NextLocationMechanic.FURTHEST: lambda distances, unsolved, scores, goals, rng: _furthest(
+        distances, unsolved
+    ),
+    NextLocationMechanic.NEAREST_WHEN_CORRECT: lambda distances, unsolved, scores, goals, rng: (
+        _by_score(
+            _nearest(distances, unsolved),
+            _furthest(distances, unsolved),
+            _random(unsolved, rng),
+            scores,
+        )
+    ),
+    NextLocationMechanic.FURTHEST_WHEN_CORRECT: lambda distances, unsolved, scores, goals, rng: (
+        _by_score(
+            _furthest(distances, unsolved),
+            _nearest(distances, unsolved),
+            _random(unsolved, rng),
+            scores,
+        )
+    ),
+    NextLocationMechanic.LEAST_CROWDED: lambda distances, unsolved, scores, goals, rng: (
+        _least_crowded(goals, unsolved, rng)
+    ),
+}
+
+
+class SimulationResult(NamedTuple):
+    """
+    The routes of the simulated teams.
+
+    Attributes
+    ----------
+    mechanic : NextLocationMechanic
+        The mechanic selecting the next location.
+    radius : float
+        The radius around the locations in meters.
+    distances : np.ndarray
+        The distance in meters each team walked from its first to its last location.
+    durations : np.ndarray
+        The time in seconds each team needed from its start to its last answer.
+    arrivals : np.ndarray
+        The arrival time in seconds since the first start at `arrivals[team, ordinal]`.
+    congestion : np.ndarray
+        The largest number of teams arriving at each location within the congestion window.
+    """
+
+    mechanic: NextLocationMechanic
+    radius: float
+    distances: np.ndarray
+    durations: np.ndarray
+    arrivals: np.ndarray
+    congestion: np.ndarray
+
+    def summary(self, percentiles: Sequence[float] = (5, 50, 95)) -> dict[str, float]:
+        """
+        Summarize the distances, durations and congestion.
+
+        Parameters
+        ----------
+        percentiles : Sequence[float], optional (default=(5, 50, 95))
+            The percentiles of the distances and durations to report.
+
+        Returns
+        -------
+        dict[str, float]
+            The distance percentiles in kilometers, the duration percentiles in minutes and
+            the largest congestion of any location.
+        """
+        summary = {}
+        for percentile, distance, duration in zip(
+            percentiles,
+            np.percentile(self.distances, percentiles) / 1000,
+            np.percentile(self.durations, percentiles) / 60,
+            strict=True,
+        ):
+            summary[f"distance_p{percentile:g}_km"] = float(distance)
+            summary[f"duration_p{percentile:g}_min"] = float(duration)
+
+        summary["max_congestion"] = float(self.congestion.max(initial=0))
+        return summary
+
+
+def _simulate_teams(
+    distances: np.ndarray,
+    mechanic: NextLocationMechanic,
+    n_teams: int,
+    radius: float,
+    p_correct: np.ndarray,
+    p_not_wrong: np.ndarray,
+    walking_speed: float,
+    answer_time: float,
+    start_spread: float,
+    seed: np.random.SeedSequence,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Simulate the routes of a batch of teams, see `simulate_game`."""
+    rng = np.random.default_rng(seed)
+    n_locations = len(distances)
+    strategy = VECTORIZED_STRATEGIES[mechanic]
+    legs = np.maximum(distances.astype(float) - radius, 0.0)
+    teams = np.arange(n_teams)
+
+    unsolved = np.ones((n_teams, n_locations), dtype=bool)
+    arrivals = np.empty((n_teams, n_locations))
+    walked = np.zeros(n_teams)
+    starts = rng.uniform(0.0, start_spread, n_teams)
+    clock = starts.copy()
+
+    if mechanic == NextLocationMechanic.LEAST_CROWDED:
+        goals = rng.permutation(teams % n_locations)
+    else:
+        goals = rng.integers(n_locations, size=n_teams)
+
+    for step in range(n_locations):
+        arrivals[teams, goals] = clock
+        clock += rng.exponential(answer_time, n_teams)
+        unsolved[teams, goals] = False
+        if step == n_locations - 1:
+            break
+
+        draws = rng.random(n_teams)
+        scores = np.where(draws < p_correct[goals], 1, np.where(draws < p_not_wrong[goals], 0, -1))
+        next_goals = strategy(distances[goals], unsolved, scores, goals, rng)
+
+        leg = legs[goals, next_goals]
+        walked += leg
+        clock += leg / walking_speed
+        goals = next_goals
+
+    return walked, clock - starts, arrivals
+
+
+def _congestion(arrivals: np.ndarray, window: float) -> np.ndarray:
+    """Count the largest number of teams arriving at each location within a window."""
+    congestion = np.zeros(arrivals.shape[1], dtype=int)
+    for ordinal in range(arrivals.shape[1]):
+        times = np.sort(arrivals[:, ordinal])
+        in_window = np.searchsorted(times, times + window, side="right") - np.arange(len(times))
+        congestion[ordinal] = in_window.max(initial=0)
+
+    return congestion
+
+
+def _probabilities(probability: float | Sequence[float], n_locations: int) -> np.ndarray:
+    """Broadcast a probability, or one per location, to an array over the ordinals."""
+    probabilities = np.broadcast_to(np.asarray(probability, dtype=float), (n_locations,))
+    if ((probabilities < 0) | (probabilities > 1)).any():
+        raise ValueError("Probabilities must be between 0 and 1.")
+
+    return probabilities
+
+
+def simulate_game(
+    game: Game,
+    mechanic: NextLocationMechanic = NextLocationMechanic.NEAREST_WHEN_CORRECT,
+    n_teams: int = 10_000,
+    radius: float | None = None,
+    p_correct: float | Sequence[float] = 0.6,
+    p_dont_know: float | Sequence[float] = 0.1,
+    walking_speed: float = 1.2,
+    answer_time: float = 180.0,
+    start_spread: float = 600.0,
+    congestion_window: float = 300.0,
+    processes: int | None = None,
+    seed: int | None = None,
+) -> SimulationResult:
+    """
+    Simulate synthetic teams playing a game, to compare mechanics and radii offline.
+
+    Every team starts at a random location, or at the least crowded one for
+    `LEAST_CROWDED`, and answers all locations. An answer is correct, "don't know" or wrong
+    at random, which gives the positive, zero or negative score the mechanic uses to pick
+    the next location from the precomputed distances of the game. The mechanics are
+    vectorized over all teams, see `VECTORIZED_STRATEGIES`, and give the same locations as
+    `determine_next_location`.
+
+    Teams answer as soon as they enter the radius, so every walk between two locations is
+    shortened by the radius. Distances are straight lines, so the walking distances are a
+    lower bound. The least crowded location is chosen for all teams at the same step of
+    their route, regardless of their time, and per process.
+
+    Parameters
+    ----------
+    game : Game
+        The game to simulate.
+    mechanic : NextLocationMechanic, optional
+        The mechanic selecting the next location. Defaults to `NEAREST_WHEN_CORRECT`.
+    n_teams : int, optional (default=10_000)
+        The number of teams.
+    radius : float, optional
+        The radius around the locations in meters. Defaults to the radius of the game.
+    p_correct : float or Sequence[float], optional (default=0.6)
+        The probability of a correct answer, or one per location.
+    p_dont_know : float or Sequence[float], optional (default=0.1)
+        The probability of answering "don't know", or one per location.
+    walking_speed : float, optional (default=1.2)
+        The walking speed in meters per second.
+    answer_time : float, optional (default=180.0)
+        The mean time in seconds to answer a question, drawn from an exponential
+        distribution.
+    start_spread : float, optional (default=600.0)
+        The teams start uniformly within this many seconds.
+    congestion_window : float, optional (default=300.0)
+        The window in seconds in which arrivals at a location are counted as congestion.
+    processes : int, optional
+        The number of processes. Defaults to the number of CPUs, limited so every process
+        simulates at least `MIN_TEAMS_PER_PROCESS` teams.
+    seed : int, optional
+        Seeds the random generators, for reproducible results.
+
+    Returns
+    -------
+    SimulationResult
+        The walking distances, durations, arrival times and congestion.
+
+    Raises
+    ------
+    ValueError
+        If the probabilities are not between 0 and 1 or add up to more than 1.
+    """
+    n_locations = len(game.locations)
+    correct = _probabilities(p_correct, n_locations)
+    not_wrong = correct + _probabilities(p_dont_know, n_locations)
+    if (not_wrong > 1 + 1e-9).any():
+        raise ValueError("The probabilities of correct and don't know answers exceed 1.")
+
+    radius = game.radius if radius is None else radius
+    mechanic = NextLocationMechanic(mechanic)
+    distances = game.distances.distances
+
+    if processes is None:
+        processes = min(os.cpu_count() or 1, max(1, n_teams // MIN_TEAMS_PER_PROCESS))
+    batches = [len(batch) for batch in np.array_split(np.arange(n_teams), processes)]
+    seeds = np.random.SeedSequence(seed).spawn(processes)
+    arguments = [
+        (
+            distances,
+            mechanic,
+            n_batch,
+            radius,
+            correct,
+            not_wrong,
+            walking_speed,
+            answer_time,
+            start_spread,
+            batch_seed,
+        )
+        for n_batch, batch_seed in zip(batches, seeds, strict=True)
+    ]
+
+    if processes == 1:
+        results = [_simulate_teams(*arguments[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(_simulate_teams, *zip(*arguments, strict=True)))
+
+    walked, durations, arrivals = (np.concatenate(parts) for parts in zip(*results, strict=True))
+    return SimulationResult(
+        mechanic=mechanic,
+        radius=radius,
+        distances=walked,
+        durations=durations,
+        arrivals=arrivals,
+        congestion=_congestion(arrivals, congestion_window),
+    )
@@ -5,7 +5,8 @@ from .question_type import QuestionType
 from .location import Location
 from .game import Game
 from .team_state import TeamState
-from .state import State, NextLocationMechanic
+from .state import State, NextLocationMechanic, StorageMode
+from .codecs import StateCodec
 
 
 __all__ = [
@@ -16,4 +17,6 @@ __all__ = [
     "State",
     "TeamState",
     "NextLocationMechanic",
+    "StorageMode",
+    "StateCodec",
 ]
@@ -0,0 +1,439 @@
+"""Event-sourced storage backend for the team states."""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .codecs import SUFFIXES, dump_file, load_file
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+
+SNAPSHOT_INTERVAL = 1000
+
+
+class AnswerLogStore:
+    """
+    Stores the team states as an append-only log of events, one JSON object per line.
+
+    Every save of a team appends a single event holding the new goal and the newly answered
+    locations (location, chosen option, score). Deleting a team appends a delete event. The
+    team states are a projection over the log that is kept in memory and brought up to date
+    by reading only the lines appended since the previous read, also by other processes.
+
+    Every `snapshot_interval` events the projection is written to a snapshot file next to
+    the log, so a new process only replays the events after the snapshot. Appends hold an
+    advisory lock on the log, which makes the version check and the append atomic.
+
+    Event lines use short keys to keep the log compact::
+
+        {"e":"s","t":"TeamA","g":"Hotel","a":[["Park",10,"A"]],"v":3,"ts":1718000000.123}
+        {"e":"d","t":"TeamA","ts":1718000100.0}
+
+    Parameters
+    ----------
+    log_path : str
+        The path to the log file. The file is created if it does not exist.
+    snapshot_interval : int, optional (default=1000)
+        The number of events between two snapshots.
+    """
+
+    def __init__(self, log_path: str, snapshot_interval: int = SNAPSHOT_INTERVAL):
+        """Initialize the store, loading the snapshot and replaying the tail of the log."""
+        self._log_path = Path(log_path)
+        self.snapshot_path = self._log_path.with_suffix(".snapshot.json")
+        self.snapshot_interval = snapshot_interval
+        self._lock = threading.RLock()
+        self._file_descriptor: int | None = None
+        self._inode: int | None = None
+        self._offset = 0
+        self._teams: dict[str, dict] = {}
+        self._migrated = False
+        self._events_since_snapshot = 0
+        self._refresh()
+
+    @property
+    def path(self) -> str:
+        """Return the path of the log file."""
+        return str(self._log_path)
+
+    def team_exists(self, team_name: str) -> bool:
+        """
+        Check if a team exists in the log.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+
+        Returns
+        -------
+        bool
+            True if the team exists, False otherwise.
+        """
+        with self._lock:
+            self._refresh()
+            return team_name in self._teams
+
+    def count_teams(self) -> int:
+        """
+        Count the registered teams.
+
+        Returns
+        -------
+        int
+            The number of teams in the log.
+        """
+        with self._lock:
+            self._refresh()
+            return len(self._teams)
+
+    def load_team(self, team_name: str) -> dict | None:
+        """
+        Load the data of a single team.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+
+        Returns
+        -------
+        dict or None
+            The team data as accepted by `TeamState`, or None if the team does not exist.
+        """
+        with self._lock:
+            self._refresh()
+            team = self._teams.get(team_name)
+            return None if team is None else self._team_data(team_name, team)
+
+    def load_teams(self) -> dict[str, dict]:
+        """
+        Load the data of all teams.
+
+        Returns
+        -------
+        dict[str, dict]
+            A dictionary where keys are team names and values are team data.
+        """
+        with self._lock:
+            self._refresh()
+            return {
+                team_name: self._team_data(team_name, team)
+                for team_name, team in sorted(self._teams.items())
+            }
+
+    def history(self, team_name: str) -> list[dict]:
+        """
+        Get the answers of a team in the order they were given, from memory.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+
+        Returns
+        -------
+        list[dict]
+            One dictionary per answer with the keys `location_name`, `option`, `score` and
+            `timestamp`. Empty if the team does not exist.
+        """
+        with self._lock:
+            self._refresh()
+            team = self._teams.get(team_name)
+            if team is None:
+                return []
+
+            return [
+                {"location_name": location, "option": option, "score": score, "timestamp": ts}
+                for location, score, option, ts in team["answers"]
+            ]
+
+    def save_team(
+        self,
+        name: str,
+        goal_location_name: str,
+        solved: dict[str, int],
+        version: int = 0,
+        options: dict[str, str] | None = None,
+    ) -> dict | None:
+        """
+        Append a save event for a team if its stored version still equals `version`.
+
+        Only locations that are not answered in the log yet are written to the event, so the
+        first answer of a location wins. On success the stored version becomes
+        `version + 1`.
+
+        Parameters
+        ----------
+        name : str
+            The name of the team.
+        goal_location_name : str
+            The current goal of the team.
+        solved : dict[str, int]
+            The solved locations and their scores.
+        version : int, optional
+            The version the caller expects to be stored (default is 0). A team that does
+            not exist yet is always written.
+        options : dict[str, str], optional
+            The chosen answer option per solved location.
+
+        Returns
+        -------
+        dict or None
+            None if the event was appended, otherwise the currently stored team data.
+        """
+        options = options or {}
+        with self._lock, self._locked_log():
+            team = self._teams.get(name)
+            if team is not None and team["version"] != version:
+                return self._team_data(name, team)
+
+            answered = team["solved"] if team is not None else {}
+            answers = [
+                [location, score, options.get(location)]
+                for location, score in solved.items()
+                if location not in answered
+            ]
+            self._append(
+                {"e": "s", "t": name, "g": goal_location_name, "a": answers, "v": version + 1}
+            )
+
+        return None
+
+    def delete_team(self, team_name: str) -> None:
+        """
+        Delete a team by appending a delete event.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+        """
+        with self._lock, self._locked_log():
+            if team_name in self._teams:
+                self._append({"e": "d", "t": team_name})
+
+    def migrate_from_yaml(self, team_state_path: Path) -> int:
+        """
+        Import the team states from a `team_states/` folder, once.
+
+        The migration is recorded as an event in the log, so later calls only check the
+        projection.
+
+        Parameters
+        ----------
+        team_state_path : Path
+            The folder holding one state file per team, in any codec.
+
+        Returns
+        -------
+        int
+            The number of migrated teams.
+        """
+        with self._lock, self._locked_log():
+            if self._migrated:
+                return 0
+
+            n_teams = 0
+            for team_state_file in sorted(Path(team_state_path).iterdir()):
+                if team_state_file.suffix not in SUFFIXES:
+                    continue
+
+                team_data = load_file(team_state_file)
+                solved = team_data.get("solved") or {}
+                self._append(
+                    {
+                        "e": "s",
+                        "t": team_data["name"],
+                        "g": team_data["goal_location_name"],
+                        "a": [[location, score, None] for location, score in solved.items()],
+                        "v": team_data.get("version", 0),
+                    }
+                )
+                n_teams += 1
+
+            self._append({"e": "m", "n": n_teams})
+
+        return n_teams
+
+    @contextmanager
+    def _locked_log(self) -> Iterator[None]:
+        """
+        Hold the advisory lock on the log while the projection is up to date.
+
+        When the log was replaced while waiting for the lock, the new log is locked instead.
+        On platforms without `fcntl` no lock is taken.
+        """
+        self._refresh()
+        if fcntl is None:  # pragma: no cover
+            yield
+            return
+
+        while True:
+            inode = self._inode
+            fcntl.flock(self._descriptor(), fcntl.LOCK_EX)
+            self._refresh()
+            if self._inode == inode:
+                break
+
+        try:
+            yield
+        finally:
+            fcntl.flock(self._descriptor(), fcntl.LOCK_UN)
+
+    def _descriptor(self) -> int:
+        """Return the file descriptor of the open log."""
+        assert self._file_descriptor is not None
+        return self._file_descriptor
+
+    def _append(self, event: dict) -> None:
+        """Append an event with a single write and apply it, the log must be locked."""
+        event["ts"] = round(time.time(), 3)
+        line = json.dumps(event, separators=(",", ":")) + "\n"
+
+        os.write(self._descriptor(), line.encode("utf-8"))
+        self._refresh()
+
+        if self._events_since_snapshot >= self.snapshot_interval:
+            self._write_snapshot()
+
+    def _refresh(self) -> None:
+        """Apply the events appended since the previous read, the lock must be held."""
+        try:
+            stat_result = os.stat(self._log_path)
+        except FileNotFoundError:
+            stat_result = None
+
+        if stat_result is None or stat_result.st_ino != self._inode:
+            self._open()
+            stat_result = os.fstat(self._descriptor())
+
+        if stat_result.st_size < self._offset:
+            self._reset()
+
+        if stat_result.st_size > self._offset:
+            self._read_tail()
+
+    def _open(self) -> None:
+        """(Re)open the log, for example after it was deleted, and load the snapshot."""
+        if self._file_descriptor is not None:
+            os.close(self._file_descriptor)
+
+        self._log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file_descriptor = os.open(self._log_path, os.O_RDWR | os.O_APPEND | os.O_CREAT)
+        self._inode = os.fstat(self._file_descriptor).st_ino
+        self._reset()
+
+    def _reset(self) -> None:
+        """Start the projection from the snapshot of the current log, or from scratch."""
+        self._teams = {}
+        self._offset = 0
+        self._migrated = False
+        self._events_since_snapshot = 0
+
+        if not self.snapshot_path.exists():
+            return
+
+        # the snapshot only belongs to this log if the log starts with the same event
+        snapshot = load_file(self.snapshot_path)
+        head = snapshot["head"].encode("utf-8")
+        if os.pread(self._descriptor(), len(head), 0) == head:
+            self._teams = snapshot["teams"]
+            self._offset = snapshot["offset"]
+            self._migrated = snapshot["migrated"]
+
+    def _read_tail(self) -> None:
+        """Apply the complete lines after the current offset."""
+        size = os.fstat(self._descriptor()).st_size
+        content = os.pread(self._descriptor(), size - self._offset, self._offset)
+        if b"\n" not in content:
+            return
+
+        complete = content[: content.rindex(b"\n") + 1]
+        for line in complete.splitlines():
+            if line:
+                self._apply(json.loads(line))
+
+        self._offset += len(complete)
+
+    def _apply(self, event: dict) -> None:
+        """Apply a single event to the projection."""
+        self._events_since_snapshot += 1
+
+        if event["e"] == "s":
+            team = self._teams.setdefault(
+                event["t"], {"goal_location_name": event["g"], "solved": {}, "answers": []}
+            )
+            team["goal_location_name"] = event["g"]
+            team["version"] = event["v"]
+            for location, score, option in event["a"]:
+                if location not in team["solved"]:
+                    team["solved"][location] = score
+                    team["answers"].append([location, score, option, event["ts"]])
+        elif event["e"] == "d":
+            self._teams.pop(event["t"], None)
+        elif event["e"] == "m":
+            self._migrated = True
+
+    def _write_snapshot(self) -> None:
+        """Write the projection and the log offset it covers to the snapshot file."""
+        first_line = os.pread(self._descriptor(), 4096, 0).split(b"\n", 1)[0]
+        dump_file(
+            {
+                "head": first_line.decode("utf-8"),
+                "offset": self._offset,
+                "migrated": self._migrated,
+                "teams": self._teams,
+            },
+            self.snapshot_path,
+        )
+        self._events_since_snapshot = 0
+
+    @staticmethod
+    def _team_data(team_name: str, team: dict) -> dict:
+        """Return a copy of a projected team as accepted by `TeamState`."""
+        return {
+            "name": team_name,
+            "goal_location_name": team["goal_location_name"],
+            "version": team["version"],
+            "solved": dict(team["solved"]),
+        }
+
+
+_STORES: dict[str, AnswerLogStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_answer_log_store(log_path: str) -> AnswerLogStore:
+    """
+    Get the process-wide store of an answer log, creating it on first use.
+
+    Sharing the store keeps a single projection per process, so the log is only replayed
+    once.
+
+    Parameters
+    ----------
+    log_path : str
+        The path to the log file.
+
+    Returns
+    -------
+    AnswerLogStore
+        The store of the log.
+    """
+    key = str(Path(log_path).resolve())
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = AnswerLogStore(log_path)
+            _STORES[key] = store
+
+        return store
@@ -0,0 +1,182 @@
+"""Serialization codecs for the state files."""
+
+import json
+import marshal
+import os
+import tempfile
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper, SafeLoader  # type: ignore[assignment]
+
+# `os.umask` can only be read by setting it, which is not thread-safe, so it is read once
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class StateCodec(str, Enum):
+    """Formats for writing the state files."""
+
+    YAML = "yaml"
+    JSON = "json"
+    BINARY = "binary"
+
+
+class Codec:
+    """
+    Converts state data to bytes and back.
+
+    Attributes
+    ----------
+    suffix : str
+        The file suffix written by the codec. The suffix is used to detect the codec of an
+        existing file.
+    """
+
+    suffix: str
+
+    def dumps(self, data: Any) -> bytes:
+        """Serialize the data to bytes."""
+        raise NotImplementedError
+
+    def loads(self, content: bytes) -> Any:
+        """Deserialize bytes to data."""
+        raise NotImplementedError
+
+
+class YamlCodec(Codec):
+    """YAML codec using the libyaml C loader and dumper when available."""
+
+    suffix = ".yaml"
+
+    def dumps(self, data: Any) -> bytes:
+        """Serialize the data to YAML."""
+        return yaml.dump(data, Dumper=SafeDumper, default_flow_style=False).encode("utf-8")
+
+    def loads(self, content: bytes) -> Any:
+        """Deserialize YAML."""
+        return yaml.load(content, Loader=SafeLoader)  # nosec
+
+
+class JsonCodec(Codec):
+    """Compact JSON codec."""
+
+    suffix = ".json"
+
+    def dumps(self, data: Any) -> bytes:
+        """Serialize the data to compact JSON."""
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, content: bytes) -> Any:
+        """Deserialize JSON."""
+        return json.loads(content)
+
+
+class BinaryCodec(Codec):
+    """
+    Binary codec based on `marshal`.
+
+    Only plain dictionaries, lists, strings and numbers are stored, which is all the state
+    files contain. Files start with a magic header, so they are never mistaken for YAML.
+    """
+
+    suffix = ".bin"
+    magic = b"SCVB\x01"
+
+    def dumps(self, data: Any) -> bytes:
+        """Serialize the data to the binary format."""
+        return self.magic + marshal.dumps(data)
+
+    def loads(self, content: bytes) -> Any:
+        """Deserialize the binary format."""
+        if not content.startswith(self.magic):
+            raise ValueError("Content is not in the binary state format.")
+
+        return marshal.loads(content[len(self.magic) :])  # nosec
+
+
+CODECS: dict[StateCodec, Codec] = {
+    StateCodec.YAML: YamlCodec(),
+    StateCodec.JSON: JsonCodec(),
+    StateCodec.BINARY: BinaryCodec(),
+}
+
+SUFFIXES: dict[str, Codec] = {codec.suffix: codec for codec in CODECS.values()}
+SUFFIXES[".yml"] = CODECS[StateCodec.YAML]
+
+
+def codec_for_path(file_path: str | Path) -> Codec:
+    """
+    Detect the codec of a state file from its suffix.
+
+    Parameters
+    ----------
+    file_path : str or Path
+        The path to the state file.
+
+    Returns
+    -------
+    Codec
+        The codec for the file. Unknown suffixes are treated as YAML.
+    """
+    return SUFFIXES.get(Path(file_path).suffix, CODECS[StateCodec.YAML])
+
+
+def load_file(file_path: str | Path) -> Any:
+    """
+    Load a state file with the codec matching its suffix.
+
+    Parameters
+    ----------
+    file_path : str or Path
+        The path to the state file.
+
+    Returns
+    -------
+    Any
+        The deserialized data.
+    """
+    with open(file_path, "rb") as file:
+        return codec_for_path(file_path).loads(file.read())
+
+
+def dump_file(data: Any, file_path: str | Path) -> None:
+    """
+    Write a state file with the codec matching its suffix.
+
+    The data is written to a temporary file in the same folder which then replaces the
+    state file, so readers never see a partially written file. The file is synced to disk
+    before it replaces the state file, so a crash never leaves an empty state file, and it
+    gets the permissions of a file created by `open`.
+
+    Parameters
+    ----------
+    data : Any
+        The data to serialize.
+    file_path : str or Path
+        The path to the state file.
+    """
+    content = codec_for_path(file_path).dumps(data)
+    file_path = Path(file_path)
+
+    file_descriptor, temporary_path = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            # `mkstemp` creates the file readable by its owner only
+            os.fchmod(file.fileno(), 0o666 & ~_UMASK)
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
@@ -0,0 +1,268 @@
+"""Precomputed distances between all locations of a game."""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from geopy.distance import geodesic
+
+# WGS84 ellipsoid, the same as used by `geopy.distance.geodesic`
+SEMI_MAJOR_AXIS = 6_378_137.0
+FLATTENING = 1 / 298.257223563
+SEMI_MINOR_AXIS = (1 - FLATTENING) * SEMI_MAJOR_AXIS
+
+# Vincenty's iteration converges to well below a millimeter within a few iterations, except
+# for nearly antipodal locations, whose distances are calculated by `geodesic` instead
+VINCENTY_TOLERANCE = 1e-12
+VINCENTY_MAX_ITERATIONS = 100
+
+
+def _vincenty_distances(
+    latitude_1: np.ndarray, longitude_1: np.ndarray, latitude_2: np.ndarray, longitude_2: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate geodesic distances on the WGS84 ellipsoid with Vincenty's inverse formula.
+
+    All pairs are iterated at once, until every pair converged or the maximum number of
+    iterations is reached.
+
+    Parameters
+    ----------
+    latitude_1 : np.ndarray
+        The latitudes of the first locations in decimal degrees.
+    longitude_1 : np.ndarray
+        The longitudes of the first locations in decimal degrees.
+    latitude_2 : np.ndarray
+        The latitudes of the second locations in decimal degrees.
+    longitude_2 : np.ndarray
+        The longitudes of the second locations in decimal degrees.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        The distances in meters, and whether the iteration converged for each pair.
+    """
+    reduced_1 = np.arctan((1 - FLATTENING) * np.tan(np.radians(latitude_1)))
+    reduced_2 = np.arctan((1 - FLATTENING) * np.tan(np.radians(latitude_2)))
+    sin_1, cos_1 = np.sin(reduced_1), np.cos(reduced_1)
+    sin_2, cos_2 = np.sin(reduced_2), np.cos(reduced_2)
+    delta_longitude = np.radians((np.subtract(longitude_2, longitude_1) + 180) % 360 - 180)
+
+    lambda_ = delta_longitude
+    converged = np.zeros(np.shape(delta_longitude), dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(VINCENTY_MAX_ITERATIONS):
+            sin_lambda, cos_lambda = np.sin(lambda_), np.cos(lambda_)
+            sin_sigma = np.hypot(cos_2 * sin_lambda, cos_1 * sin_2 - sin_1 * cos_2 * cos_lambda)
+            cos_sigma = sin_1 * sin_2 + cos_1 * cos_2 * cos_lambda
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            # coincident locations have no azimuth
+            sin_alpha = np.where(sin_sigma == 0, 0.0, cos_1 * cos_2 * sin_lambda / sin_sigma)
+            cos_squared_alpha = 1 - sin_alpha**2
+            # geodesics along the equator have no midpoint latitude
+            cos_2_sigma_m = np.where(
+                cos_squared_alpha == 0, 0.0, cos_sigma - 2 * sin_1 * sin_2 / cos_squared_alpha
+            )
+            c = FLATTENING / 16 * cos_squared_alpha * (4 + FLATTENING * (4 - 3 * cos_squared_alpha))
+            previous = lambda_
+            lambda_ = delta_longitude + (1 - c) * FLATTENING * sin_alpha * (
+                sigma
+                + c * sin_sigma * (cos_2_sigma_m + c * cos_sigma * (-1 + 2 * cos_2_sigma_m**2))
+            )
+            converged = np.abs(lambda_ - previous) < VINCENTY_TOLERANCE
+            if converged.all():
+                break
+
+    u_squared = cos_squared_alpha * (SEMI_MAJOR_AXIS**2 - SEMI_MINOR_AXIS**2) / SEMI_MINOR_AXIS**2
+    a = 1 + u_squared / 16384 * (4096 + u_squared * (-768 + u_squared * (320 - 175 * u_squared)))
+    b = u_squared / 1024 * (256 + u_squared * (-128 + u_squared * (74 - 47 * u_squared)))
+    delta_sigma = (
+        b
+        * sin_sigma
+        * (
+            cos_2_sigma_m
+            + b
+            / 4
+            * (
+                cos_sigma * (-1 + 2 * cos_2_sigma_m**2)
+                - b / 6 * cos_2_sigma_m * (-3 + 4 * sin_sigma**2) * (-3 + 4 * cos_2_sigma_m**2)
+            )
+        )
+    )
+    distances = SEMI_MINOR_AXIS * a * (sigma - delta_sigma)
+
+    return distances, converged & np.isfinite(distances)
+
+
+class DistanceMatrix:
+    """
+    Geodesic distances in meters between every pair of locations, by ordinal.
+
+    Besides the distances, every row is kept sorted by distance as `neighbors`, so the
+    nearest or furthest location that matches a mask is found without any distance
+    calculation or sort. Distances are stored as 32-bit floats to halve the memory of large
+    games, which is still precise to well below a meter for the distances in a game.
+
+    Parameters
+    ----------
+    distances : np.ndarray
+        A symmetric array of shape (n_locations, n_locations).
+    neighbors : np.ndarray, optional
+        The ordinals of each row sorted by distance. Computed when not given.
+
+    Attributes
+    ----------
+    distances : np.ndarray
+        The distance in meters between location `i` and `j` at `distances[i, j]`.
+    neighbors : np.ndarray
+        `neighbors[i]` holds all ordinals sorted from nearest to furthest from location `i`.
+        Locations at the same distance keep their order in the game.
+    """
+
+    def __init__(self, distances: np.ndarray, neighbors: np.ndarray | None = None):
+        """Initialize the matrix, sorting the neighbors if needed."""
+        self.distances = np.asarray(distances, dtype=np.float32)
+        if neighbors is None:
+            neighbors = np.argsort(self.distances, axis=1, kind="stable")
+        self.neighbors = np.asarray(neighbors, dtype=np.int32)
+
+    def __len__(self) -> int:
+        """Return the number of locations."""
+        return len(self.distances)
+
+    @classmethod
+    def compute(cls, latitudes: np.ndarray, longitudes: np.ndarray) -> "DistanceMatrix":
+        """
+        Compute the geodesic distance between every pair of locations.
+
+        All pairs are calculated at once with Vincenty's formula, which agrees with
+        `geopy.distance.geodesic` to well below a millimeter. Only the pairs for which it
+        does not converge, nearly antipodal locations, are calculated by `geodesic`.
+
+        Parameters
+        ----------
+        latitudes : np.ndarray
+            The latitudes of the locations in decimal degrees.
+        longitudes : np.ndarray
+            The longitudes of the locations in decimal degrees.
+
+        Returns
+        -------
+        DistanceMatrix
+            The distances between the locations.
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        rows, columns = np.triu_indices(len(latitudes), k=1)
+        pair_distances, converged = _vincenty_distances(
+            latitudes[rows], longitudes[rows], latitudes[columns], longitudes[columns]
+        )
+        for pair in np.flatnonzero(~converged).tolist():
+            i, j = rows[pair], columns[pair]
+            pair_distances[pair] = geodesic(
+                (latitudes[i], longitudes[i]), (latitudes[j], longitudes[j])
+            ).meters
+
+        distances = np.zeros((len(latitudes), len(latitudes)), dtype=np.float32)
+        distances[rows, columns] = distances[columns, rows] = pair_distances
+
+        return cls(distances)
+
+    @classmethod
+    def load_or_compute(
+        cls,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        cache_path: Path | None = None,
+    ) -> "DistanceMatrix":
+        """
+        Load the matrix from a cache file, or compute it and write the cache file.
+
+        The cache file stores a hash of the coordinates, so a cache of a changed game is
+        recomputed. Failing to write the cache, for example in a read-only folder, only
+        costs the computation at the next start.
+
+        Parameters
+        ----------
+        latitudes : np.ndarray
+            The latitudes of the locations in decimal degrees.
+        longitudes : np.ndarray
+            The longitudes of the locations in decimal degrees.
+        cache_path : Path, optional
+            The `.npz` file caching the matrix. Without a path nothing is cached.
+
+        Returns
+        -------
+        DistanceMatrix
+            The distances between the locations.
+        """
+        key = cls.key(latitudes, longitudes)
+
+        if cache_path is not None and cache_path.exists():
+            try:
+                with np.load(cache_path, allow_pickle=False) as cache:
+                    if str(cache["key"]) == key:
+                        return cls(cache["distances"], cache["neighbors"])
+            except (OSError, ValueError, KeyError):
+                pass
+
+        matrix = cls.compute(latitudes, longitudes)
+        if cache_path is not None:
+            try:
+                matrix.save(cache_path, key)
+            except OSError:
+                pass
+
+        return matrix
+
+    @staticmethod
+    def key(latitudes: np.ndarray, longitudes: np.ndarray) -> str:
+        """Return a hash identifying the coordinates the matrix was computed for."""
+        coordinates = np.column_stack((latitudes, longitudes)).astype(np.float64)
+        return hashlib.sha256(coordinates.tobytes()).hexdigest()
+
+    def save(self, cache_path: Path, key: str) -> None:
+        """
+        Write the matrix atomically to a `.npz` file.
+
+        Parameters
+        ----------
+        cache_path : Path
+            The file to write.
+        key : str
+            The hash of the coordinates, see `key`.
+        """
+        file_descriptor, temporary_path = tempfile.mkstemp(
+            dir=cache_path.parent, prefix=f".{cache_path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                np.savez(file, key=key, distances=self.distances, neighbors=self.neighbors)
+            os.replace(temporary_path, cache_path)
+        except BaseException:
+            Path(temporary_path).unlink(missing_ok=True)
+            raise
+
+    def sorted_neighbors(self, ordinal: int, mask: np.ndarray | None = None) -> np.ndarray:
+        """
+        Get the ordinals sorted from nearest to furthest from a location.
+
+        Parameters
+        ----------
+        ordinal : int
+            The ordinal of the location to measure from.
+        mask : np.ndarray, optional
+            A boolean array over the ordinals; only the locations where it is True are kept.
+
+        Returns
+        -------
+        np.ndarray
+            The ordinals of the (masked) locations, nearest first.
+        """
+        neighbors = self.neighbors[ordinal]
+        if mask is None:
+            return neighbors
+
+        return neighbors[mask[neighbors]]
@@ -1,10 +1,16 @@
 """Game model for the API."""
 
+from collections.abc import Iterable
+from pathlib import Path
+
 import yaml
 
-from pydantic import BaseModel, PrivateAttr
+from pydantic import BaseModel, PrivateAttr, field_validator
 
+from .distance_matrix import DistanceMatrix
 from .location import Location
+from .location_index import LocationIndex
+from .proximity import DistanceCheck
 
 
 class Game(BaseModel):
@@ -17,27 +23,51 @@ class Game(BaseModel):
         A list of locations included in the game.
     radius : int
         The radius around each location for the game logic.
+
+    Raises
+    ------
+    pydantic.ValidationError
+        If two locations have the same name.
     """
 
     locations: list[Location]
     radius: int
 
     _file_path: str = PrivateAttr(init=True)
+    _index: LocationIndex = PrivateAttr()
+    _cache_distances: bool = PrivateAttr(default=False)
 
     def __init__(self, file_path: str, **data):
         """Initialize the game object."""
         super().__init__(**data)
         self._file_path = file_path
 
+    @field_validator("locations")
+    @classmethod
+    def validate_unique_names(cls, locations: list[Location]) -> list[Location]:
+        """Reject games in which two locations have the same name."""
+        LocationIndex(locations)
+        return locations
+
+    def model_post_init(self, __context) -> None:
+        """Build the location index once the locations are validated."""
+        self._index = LocationIndex(self.locations)
+
     @classmethod
-    def from_yaml_file(cls, file_path: str) -> "Game":
+    def from_yaml_file(cls, file_path: str, cache_distances: bool = False) -> "Game":
         """
         Load game data from a YAML file.
 
+        The distances between the locations are computed, and the spatial index and the
+        bounding boxes of the locations are built as well.
+
         Parameters
         ----------
         file_path : str
             The path to the YAML file containing the game data.
+        cache_distances : bool, optional (default=False)
+            Load the distances from the `.distances.npz` file next to the game file, and
+            write them to it when it is missing or outdated.
 
         Returns
         -------
@@ -48,6 +78,11 @@ class Game(BaseModel):
             game_data = yaml.safe_load(file)
             game = cls(file_path=file_path, **game_data)
 
+        game._cache_distances = cache_distances
+        game.index.distances(game._distance_cache_path())
+        game.index.spatial()
+        game.index.proximity(game.radius)
+
         return game
 
     def get_location_by_name(self, location_name: str) -> Location:
@@ -64,11 +99,116 @@ class Game(BaseModel):
         Location
             The location object.
         """
-        for location in self.locations:
-            if location.name == location_name:
-                return location
+        return self._index.location(location_name)
+
+    @property
+    def index(self) -> LocationIndex:
+        """Return the index of the locations by name and ordinal."""
+        return self._index
+
+    def check_distance(
+        self, location_name: str, latitude: float, longitude: float
+    ) -> DistanceCheck:
+        """
+        Check whether a position is within the radius of a location.
+
+        The distance is estimated in a local planar projection and the exact geodesic
+        distance is only calculated when the estimate is too close to the radius to decide.
+        See `ProximityIndex`.
+
+        Parameters
+        ----------
+        location_name : str
+            The name of the location.
+        latitude : float
+            The latitude of the position in decimal degrees.
+        longitude : float
+            The longitude of the position in decimal degrees.
+
+        Returns
+        -------
+        DistanceCheck
+            The distance and bearing to the location, and whether the position is within
+            the radius.
+        """
+        ordinal = self._index.ordinal(location_name)
+        return self._index.proximity(self.radius).check(ordinal, latitude, longitude)
+
+    def locations_within(
+        self, latitude: float, longitude: float, radius: float
+    ) -> list[tuple[Location, float]]:
+        """
+        Get the locations within a radius of a point, using the spatial index.
+
+        Parameters
+        ----------
+        latitude : float
+            The latitude of the point in decimal degrees.
+        longitude : float
+            The longitude of the point in decimal degrees.
+        radius : float
+            The radius in meters.
+
+        Returns
+        -------
+        list[tuple[Location, float]]
+            The locations and their great-circle distances in meters, nearest first.
+        """
+        ordinals, distances = self._index.spatial().within(latitude, longitude, radius)
+        return [
+            (self._index[ordinal], distance)
+            for ordinal, distance in zip(ordinals.tolist(), distances.tolist(), strict=True)
+        ]
+
+    def nearest_locations(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 1,
+        exclude: Iterable[str] = (),
+    ) -> list[tuple[Location, float]]:
+        """
+        Get the `k` nearest locations to a point, using the spatial index.
+
+        Parameters
+        ----------
+        latitude : float
+            The latitude of the point in decimal degrees.
+        longitude : float
+            The longitude of the point in decimal degrees.
+        k : int, optional (default=1)
+            The number of locations to get.
+        exclude : Iterable[str], optional
+            Names of locations to skip, for example the solved locations of a team.
+
+        Returns
+        -------
+        list[tuple[Location, float]]
+            At most `k` locations and their great-circle distances in meters, nearest first.
+        """
+        mask = ~self._index.mask(exclude)
+        ordinals, distances = self._index.spatial().nearest(latitude, longitude, k, mask)
+        return [
+            (self._index[ordinal], distance)
+            for ordinal, distance in zip(ordinals.tolist(), distances.tolist(), strict=True)
+        ]
+
+    @property
+    def distances(self) -> DistanceMatrix:
+        """
+        Return the distances between all locations, by ordinal.
+
+        The matrix is cached next to the game file when the game was loaded with
+        `cache_distances`.
+        """
+        return self._index.distances(self._distance_cache_path())
+
+    def _distance_cache_path(self) -> Path | None:
+        """Return the file caching the distances, or None if they are not cached."""
+        if not self._cache_distances or not Path(self._file_path).is_file():
+            return None
 
-        raise ValueError(f"Location '{location_name}' not found in the game.")
+        return Path(self._file_path).with_suffix(".distances.npz")
 
     @property
     def file_path(self) -> str:
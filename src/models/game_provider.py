@@ -0,0 +1,117 @@
+"""Process-wide provider of the game and the application state."""
+
+import os
+import threading
+from pathlib import Path
+
+from .game import Game
+from .state import State
+
+
+def _signature(file_path: str) -> tuple[int, int, int] | None:
+    """Return the inode, modification time and size of a file, or None if it is missing."""
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+
+    return (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+
+class GameProvider:
+    """
+    Loads the game and the application state once and shares them between callers.
+
+    Streamlit re-executes the apps on every rerun of every session. Getting the game and the
+    state from the provider only costs two `stat` calls; the files are parsed again only when
+    one of them changed on disk. A changed game file also reloads the state, which refers to
+    the game. The provider does not depend on Streamlit, so tests and tools can use it too.
+
+    Parameters
+    ----------
+    game_file : str
+        The path to the game data file.
+    state_file : str
+        The path to the application state file. It is created if it does not exist.
+
+    Attributes
+    ----------
+    n_loads : int
+        The number of times the files were loaded.
+    """
+
+    def __init__(self, game_file: str, state_file: str):
+        """Initialize the provider without loading anything yet."""
+        self.game_file = game_file
+        self.state_file = state_file
+        self.n_loads = 0
+        self._game: Game | None = None
+        self._state: State | None = None
+        self._signatures: tuple | None = None
+        self._lock = threading.Lock()
+
+    def get(self) -> tuple[Game, State]:
+        """
+        Get the game and the application state, reloading them if their files changed.
+
+        Returns
+        -------
+        tuple[Game, State]
+            The shared game and state objects.
+        """
+        with self._lock:
+            signatures = (_signature(self.game_file), _signature(self.state_file))
+            if self._state is None or self._signatures is None:
+                self._load(reload_game=True)
+            elif signatures != self._signatures:
+                self._load(reload_game=signatures[0] != self._signatures[0])
+
+            assert self._game is not None and self._state is not None
+            return self._game, self._state
+
+    def invalidate(self) -> None:
+        """Reload the game and the state on the next `get`."""
+        with self._lock:
+            self._game = None
+            self._state = None
+            self._signatures = None
+
+    def _load(self, reload_game: bool) -> None:
+        """Load the files, the lock must be held."""
+        if reload_game or self._game is None:
+            self._game = Game.from_yaml_file(file_path=self.game_file, cache_distances=True)
+
+        self._state = State.from_yaml_file(file_path=self.state_file, game=self._game)
+        # the state file is created when missing, so the signatures are taken afterwards
+        self._signatures = (_signature(self.game_file), _signature(self.state_file))
+        self.n_loads += 1
+
+
+_PROVIDERS: dict[tuple[str, str], GameProvider] = {}
+_PROVIDERS_LOCK = threading.Lock()
+
+
+def get_game_provider(game_file: str, state_file: str) -> GameProvider:
+    """
+    Get the process-wide provider of a game and state file, creating it on first use.
+
+    Parameters
+    ----------
+    game_file : str
+        The path to the game data file.
+    state_file : str
+        The path to the application state file.
+
+    Returns
+    -------
+    GameProvider
+        The provider of the files.
+    """
+    key = (str(Path(game_file).resolve()), str(Path(state_file).resolve()))
+    with _PROVIDERS_LOCK:
+        provider = _PROVIDERS.get(key)
+        if provider is None:
+            provider = GameProvider(game_file, state_file)
+            _PROVIDERS[key] = provider
+
+        return provider
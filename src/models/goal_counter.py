@@ -0,0 +1,209 @@
+"""Live counters of the teams heading to each location."""
+
+import heapq
+import random
+import threading
+from collections.abc import Callable
+
+
+class GoalCounter:
+    """
+    Counts how many teams have each location as their goal, to spread teams out.
+
+    The counters are kept in a heap of `(count, tie_break, ordinal)` entries. Entries are
+    not removed when a count changes; a newer entry is pushed instead and outdated entries
+    are skipped when they reach the top. Finding the least crowded location therefore costs
+    O(log n), plus O(log n) for every location that is skipped because it is not eligible,
+    for example because the team solved it. Ties are broken randomly, so teams arriving at
+    the same time are spread over equally crowded locations.
+
+    All methods hold a reentrant lock, and `assign` chooses and records a goal under a
+    single hold of the lock, so concurrent sessions never see inconsistent counters.
+
+    Parameters
+    ----------
+    n_locations : int
+        The number of locations in the game.
+    """
+
+    def __init__(self, n_locations: int):
+        """Initialize counters without teams."""
+        self.n_locations = n_locations
+        self._counts = [0] * n_locations
+        self._goals: dict[str, int] = {}
+        self._heap: list[tuple[int, float, int]] = []
+        self._lock = threading.RLock()
+        self._rebuild_heap()
+
+    def count(self, ordinal: int) -> int:
+        """
+        Get the number of teams heading to a location.
+
+        Parameters
+        ----------
+        ordinal : int
+            The ordinal of the location.
+
+        Returns
+        -------
+        int
+            The number of teams with the location as their goal.
+        """
+        with self._lock:
+            return self._counts[ordinal]
+
+    def counts(self) -> list[int]:
+        """Return the number of teams heading to each location, by ordinal."""
+        with self._lock:
+            return list(self._counts)
+
+    def set_goal(self, team_name: str, ordinal: int | None) -> None:
+        """
+        Record the goal of a team, moving it from its previous goal.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+        ordinal : int or None
+            The ordinal of the new goal, or None when the team has no goal anymore, for
+            example because it finished or was deleted.
+        """
+        with self._lock:
+            previous = self._goals.pop(team_name, None)
+            if previous == ordinal:
+                if ordinal is not None:
+                    self._goals[team_name] = ordinal
+                return
+
+            if previous is not None:
+                self._change(previous, -1)
+            if ordinal is not None:
+                self._goals[team_name] = ordinal
+                self._change(ordinal, 1)
+
+    def assign(self, team_name: str, choose: Callable[[], int]) -> int:
+        """
+        Choose a goal for a team and record it, atomically.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+        choose : Callable[[], int]
+            Returns the ordinal of the new goal. It is called while the counters are locked,
+            so it can use `least_crowded` without another session interfering.
+
+        Returns
+        -------
+        int
+            The ordinal of the new goal.
+        """
+        with self._lock:
+            ordinal = choose()
+            self.set_goal(team_name, ordinal)
+            return ordinal
+
+    def least_crowded(self, is_eligible: Callable[[int], bool]) -> int:
+        """
+        Find the eligible location with the fewest teams heading to it.
+
+        Parameters
+        ----------
+        is_eligible : Callable[[int], bool]
+            Tells whether a location, by ordinal, can be chosen.
+
+        Returns
+        -------
+        int
+            The ordinal of the least crowded eligible location.
+
+        Raises
+        ------
+        IndexError
+            If no location is eligible.
+        """
+        with self._lock:
+            skipped = []
+            try:
+                while self._heap:
+                    entry = heapq.heappop(self._heap)
+                    count, _, ordinal = entry
+                    if count != self._counts[ordinal]:
+                        continue
+
+                    skipped.append(entry)
+                    if is_eligible(ordinal):
+                        return ordinal
+            finally:
+                for entry in skipped:
+                    heapq.heappush(self._heap, entry)
+
+            raise IndexError("No eligible location.")
+
+    def rebuild(self, goals: dict[str, int]) -> None:
+        """
+        Replace all counters by the goals of the given teams.
+
+        Parameters
+        ----------
+        goals : dict[str, int]
+            The ordinal of the goal per team name.
+        """
+        with self._lock:
+            self._goals = dict(goals)
+            self._counts = [0] * self.n_locations
+            for ordinal in self._goals.values():
+                self._counts[ordinal] += 1
+            self._rebuild_heap()
+
+    def _change(self, ordinal: int, delta: int) -> None:
+        """Change a counter and push its new entry, the lock must be held."""
+        self._counts[ordinal] += delta
+        heapq.heappush(self._heap, (self._counts[ordinal], random.random(), ordinal))  # nosec
+
+        # drop the outdated entries once they dominate the heap
+        if len(self._heap) > 4 * self.n_locations + 64:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        """Build the heap from the current counters, the lock must be held."""
+        self._heap = [
+            (count, random.random(), ordinal)  # nosec
+            for ordinal, count in enumerate(self._counts)
+        ]
+        heapq.heapify(self._heap)
+
+
+_COUNTERS: dict[str, GoalCounter] = {}
+_COUNTERS_LOCK = threading.Lock()
+
+
+def get_goal_counter(
+    key: str, n_locations: int, load_goals: Callable[[], dict[str, int]]
+) -> GoalCounter:
+    """
+    Get the process-wide goal counter of a team state location, creating it on first use.
+
+    Parameters
+    ----------
+    key : str
+        Identifies where the team states are stored, for example the team state folder.
+    n_locations : int
+        The number of locations in the game.
+    load_goals : Callable[[], dict[str, int]]
+        Returns the current goal per team, used to fill a new counter.
+
+    Returns
+    -------
+    GoalCounter
+        The goal counter of the location.
+    """
+    with _COUNTERS_LOCK:
+        goal_counter = _COUNTERS.get(key)
+        if goal_counter is None or goal_counter.n_locations != n_locations:
+            goal_counter = GoalCounter(n_locations)
+            goal_counter.rebuild(load_goals())
+            _COUNTERS[key] = goal_counter
+
+        return goal_counter
@@ -0,0 +1,197 @@
+"""Index of the locations of a game by name and ordinal."""
+
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from .distance_matrix import DistanceMatrix
+from .location import Location
+from .proximity import ProximityIndex
+from .spatial_index import SpatialIndex
+
+
+class LocationIndex:
+    """
+    Maps location names to their ordinal in the game and back, in constant time.
+
+    The ordinal of a location is its position in `Game.locations`. The coordinates of all
+    locations are kept as arrays in the same order, for vectorized distance calculations.
+
+    Parameters
+    ----------
+    locations : Iterable[Location]
+        The locations of the game. Their names must be unique.
+
+    Attributes
+    ----------
+    names : tuple[str, ...]
+        The names of the locations, by ordinal.
+    latitudes : np.ndarray
+        The latitudes of the locations in decimal degrees, by ordinal.
+    longitudes : np.ndarray
+        The longitudes of the locations in decimal degrees, by ordinal.
+
+    Raises
+    ------
+    ValueError
+        If two locations have the same name.
+    """
+
+    def __init__(self, locations: Iterable[Location]):
+        """Build the index."""
+        self._locations = tuple(locations)
+        self.names = tuple(location.name for location in self._locations)
+        self._ordinals = {name: ordinal for ordinal, name in enumerate(self.names)}
+
+        if len(self._ordinals) != len(self.names):
+            duplicates = sorted({name for name in self.names if self.names.count(name) > 1})
+            raise ValueError(f"Duplicate location names in the game: {', '.join(duplicates)}.")
+
+        self.latitudes = np.array([location.latitude for location in self._locations], dtype=float)
+        self.longitudes = np.array(
+            [location.longitude for location in self._locations], dtype=float
+        )
+        self.latitudes.flags.writeable = False
+        self.longitudes.flags.writeable = False
+        self._distances: DistanceMatrix | None = None
+        self._spatial: SpatialIndex | None = None
+        self._proximity: ProximityIndex | None = None
+
+    def __len__(self) -> int:
+        """Return the number of locations."""
+        return len(self.names)
+
+    def __contains__(self, location_name: object) -> bool:
+        """Check if a location name is in the game."""
+        return location_name in self._ordinals
+
+    def __getitem__(self, ordinal: int) -> Location:
+        """Return the location with the given ordinal."""
+        return self._locations[ordinal]
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the indexed locations, since arrays do not compare to a single bool."""
+        if not isinstance(other, LocationIndex):
+            return NotImplemented
+
+        return self._locations == other._locations
+
+    def ordinal(self, location_name: str) -> int:
+        """
+        Get the ordinal of a location.
+
+        Parameters
+        ----------
+        location_name : str
+            The name of the location.
+
+        Returns
+        -------
+        int
+            The position of the location in the game.
+
+        Raises
+        ------
+        ValueError
+            If the location is not in the game.
+        """
+        try:
+            return self._ordinals[location_name]
+        except KeyError:
+            raise ValueError(f"Location '{location_name}' not found in the game.") from None
+
+    def location(self, location_name: str) -> Location:
+        """
+        Get a location by name.
+
+        Parameters
+        ----------
+        location_name : str
+            The name of the location.
+
+        Returns
+        -------
+        Location
+            The location object.
+
+        Raises
+        ------
+        ValueError
+            If the location is not in the game.
+        """
+        return self._locations[self.ordinal(location_name)]
+
+    def mask(self, location_names: Iterable[str]) -> np.ndarray:
+        """
+        Get a boolean mask over the ordinals that is True for the given locations.
+
+        Names that are not in the game are ignored.
+
+        Parameters
+        ----------
+        location_names : Iterable[str]
+            The names of the locations, for example the solved locations of a team.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean array with one element per location.
+        """
+        mask = np.zeros(len(self.names), dtype=bool)
+        ordinals = [self._ordinals[name] for name in location_names if name in self._ordinals]
+        mask[ordinals] = True
+        return mask
+
+    def distances(self, cache_path: Path | None = None) -> DistanceMatrix:
+        """
+        Get the distances between all locations, computing them on first use.
+
+        Parameters
+        ----------
+        cache_path : Path, optional
+            The file caching the matrix between processes, see
+            `DistanceMatrix.load_or_compute`.
+
+        Returns
+        -------
+        DistanceMatrix
+            The distances between the locations, by ordinal.
+        """
+        if self._distances is None:
+            self._distances = DistanceMatrix.load_or_compute(
+                self.latitudes, self.longitudes, cache_path
+            )
+
+        return self._distances
+
+    def spatial(self) -> SpatialIndex:
+        """Return the spatial index of the locations, building it on first use."""
+        if self._spatial is None:
+            self._spatial = SpatialIndex(self.latitudes, self.longitudes)
+
+        return self._spatial
+
+    def proximity(self, radius: float) -> ProximityIndex:
+        """
+        Get the bounding boxes of the locations for a radius, computing them on first use.
+
+        Parameters
+        ----------
+        radius : float
+            The radius around the locations in meters.
+
+        Returns
+        -------
+        ProximityIndex
+            The tiered distance checks for the radius.
+        """
+        if self._proximity is None or self._proximity.radius != radius:
+            self._proximity = ProximityIndex(self.latitudes, self.longitudes, radius)
+
+        return self._proximity
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        """Return the latitudes and longitudes as an array of shape (n_locations, 2)."""
+        return np.column_stack((self.latitudes, self.longitudes))
@@ -0,0 +1,182 @@
+"""Tiered distance checks of a position against the radius around the locations."""
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+from geopy.distance import geodesic
+
+# WGS84 ellipsoid, the same as used by `geopy.distance.geodesic`
+SEMI_MAJOR_AXIS = 6_378_137.0
+ECCENTRICITY_SQUARED = 6.694379990141316e-3
+
+# the smallest meridional radius of curvature, at the equator
+MIN_MERIDIONAL_RADIUS = SEMI_MAJOR_AXIS * (1 - ECCENTRICITY_SQUARED)
+
+# error bound of the planar estimate within `MAX_PLANAR_DISTANCE` of a location that is at
+# most `MAX_PLANAR_LATITUDE` from the equator; close to the poles the geodesic is always used
+PLANAR_RELATIVE_ERROR = 0.005
+PLANAR_ABSOLUTE_ERROR = 0.5
+MAX_PLANAR_DISTANCE = 50_000.0
+MAX_PLANAR_LATITUDE = 85.0
+
+
+class DistanceCheck(NamedTuple):
+    """
+    The result of checking a position against the radius around a location.
+
+    Attributes
+    ----------
+    distance : float
+        The distance in meters, exact when `exact` is True and otherwise a planar estimate.
+    bearing : float
+        The bearing from the position to the location in degrees, clockwise from north.
+    within_radius : bool
+        Whether the position is within the radius. Always decided correctly.
+    exact : bool
+        Whether the geodesic distance was calculated.
+    """
+
+    distance: float
+    bearing: float
+    within_radius: bool
+    exact: bool
+
+
+def planar_distance_and_bearing(
+    latitude_1: float, longitude_1: float, latitude_2: float, longitude_2: float
+) -> tuple[float, float]:
+    """
+    Estimate the distance and bearing between two positions in a local planar projection.
+
+    The positions are projected onto a local east-north plane at their mean latitude, using
+    the radii of curvature of the WGS84 ellipsoid. Within `MAX_PLANAR_DISTANCE` and up to
+    `MAX_PLANAR_LATITUDE` the distance differs at most `PLANAR_RELATIVE_ERROR` times the
+    distance plus `PLANAR_ABSOLUTE_ERROR` meters from the geodesic distance.
+
+    Parameters
+    ----------
+    latitude_1 : float
+        The latitude of the first position in decimal degrees.
+    longitude_1 : float
+        The longitude of the first position in decimal degrees.
+    latitude_2 : float
+        The latitude of the second position in decimal degrees.
+    longitude_2 : float
+        The longitude of the second position in decimal degrees.
+
+    Returns
+    -------
+    tuple[float, float]
+        The distance in meters and the bearing from the first to the second position in
+        degrees, clockwise from north.
+    """
+    mean_latitude = math.radians((latitude_1 + latitude_2) / 2)
+    sin_squared = math.sin(mean_latitude) ** 2
+    denominator = math.sqrt(1 - ECCENTRICITY_SQUARED * sin_squared)
+    prime_vertical_radius = SEMI_MAJOR_AXIS / denominator
+    meridional_radius = SEMI_MAJOR_AXIS * (1 - ECCENTRICITY_SQUARED) / denominator**3
+
+    delta_longitude = (longitude_2 - longitude_1 + 180) % 360 - 180
+    east = math.radians(delta_longitude) * prime_vertical_radius * math.cos(mean_latitude)
+    north = math.radians(latitude_2 - latitude_1) * meridional_radius
+
+    return math.hypot(east, north), math.degrees(math.atan2(east, north)) % 360
+
+
+class ProximityIndex:
+    """
+    Decides whether positions are within a radius of the locations of a game, cheaply.
+
+    A check has three tiers:
+
+    1. A bounding box per location, precomputed for the radius. A position outside the box
+       is guaranteed to be further away than the radius.
+    2. A planar estimate of the distance with a guaranteed error bound. When the radius is
+       outside the error bound around the estimate, the estimate decides.
+    3. Only when the estimate is too close to the radius, the exact geodesic distance.
+
+    Parameters
+    ----------
+    latitudes : np.ndarray
+        The latitudes of the locations in decimal degrees, by ordinal.
+    longitudes : np.ndarray
+        The longitudes of the locations in decimal degrees, by ordinal.
+    radius : float
+        The radius around the locations in meters.
+
+    Attributes
+    ----------
+    n_exact : int
+        The number of checks that needed the geodesic distance.
+    """
+
+    def __init__(self, latitudes: np.ndarray, longitudes: np.ndarray, radius: float):
+        """Precompute the bounding boxes."""
+        self.radius = radius
+        self.n_exact = 0
+        self._latitudes = np.asarray(latitudes, dtype=float)
+        self._longitudes = np.asarray(longitudes, dtype=float)
+
+        # the meridian arc between two latitudes is never shorter than the smallest
+        # meridional radius times their difference
+        self._delta_latitudes = np.full_like(
+            self._latitudes, math.degrees(radius / MIN_MERIDIONAL_RADIUS)
+        )
+
+        # the distance between two positions is never shorter than their chord, which is at
+        # least the chord between the circles of latitude of the box edge furthest from the
+        # equator
+        max_latitudes = np.minimum(np.abs(self._latitudes) + self._delta_latitudes, 90.0)
+        min_parallel_radii = SEMI_MAJOR_AXIS * np.cos(np.radians(max_latitudes))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = radius / (2 * min_parallel_radii)
+        self._delta_longitudes = np.where(
+            ratio < 1, np.degrees(2 * np.arcsin(np.minimum(ratio, 1.0))), 360.0
+        )
+
+    def check(self, ordinal: int, latitude: float, longitude: float) -> DistanceCheck:
+        """
+        Check a position against the radius around a location.
+
+        Parameters
+        ----------
+        ordinal : int
+            The ordinal of the location.
+        latitude : float
+            The latitude of the position in decimal degrees.
+        longitude : float
+            The longitude of the position in decimal degrees.
+
+        Returns
+        -------
+        DistanceCheck
+            The distance, bearing and whether the position is within the radius.
+        """
+        location_latitude = float(self._latitudes[ordinal])
+        location_longitude = float(self._longitudes[ordinal])
+        distance, bearing = planar_distance_and_bearing(
+            latitude, longitude, location_latitude, location_longitude
+        )
+
+        if not self._in_box(ordinal, latitude, longitude):
+            return DistanceCheck(distance, bearing, within_radius=False, exact=False)
+
+        error = PLANAR_RELATIVE_ERROR * distance + PLANAR_ABSOLUTE_ERROR
+        if distance <= MAX_PLANAR_DISTANCE and abs(location_latitude) <= MAX_PLANAR_LATITUDE:
+            if distance + error < self.radius:
+                return DistanceCheck(distance, bearing, within_radius=True, exact=False)
+            if distance - error > self.radius:
+                return DistanceCheck(distance, bearing, within_radius=False, exact=False)
+
+        self.n_exact += 1
+        distance = geodesic((latitude, longitude), (location_latitude, location_longitude)).meters
+        return DistanceCheck(distance, bearing, within_radius=distance <= self.radius, exact=True)
+
+    def _in_box(self, ordinal: int, latitude: float, longitude: float) -> bool:
+        """Check if a position is inside the bounding box of a location."""
+        if abs(latitude - self._latitudes[ordinal]) > self._delta_latitudes[ordinal]:
+            return False
+
+        delta_longitude = abs((longitude - self._longitudes[ordinal] + 180) % 360 - 180)
+        return bool(delta_longitude <= self._delta_longitudes[ordinal])
@@ -0,0 +1,215 @@
+"""Spatial index over the locations of a game."""
+
+import heapq
+
+import numpy as np
+
+EARTH_RADIUS_METERS = 6_371_008.8
+
+
+def _unit_vectors(latitudes, longitudes) -> np.ndarray:
+    """Convert coordinates in decimal degrees to points on the unit sphere."""
+    latitudes = np.radians(np.asarray(latitudes, dtype=float))
+    longitudes = np.radians(np.asarray(longitudes, dtype=float))
+    cos_latitudes = np.cos(latitudes)
+    return np.stack(
+        (cos_latitudes * np.cos(longitudes), cos_latitudes * np.sin(longitudes), np.sin(latitudes)),
+        axis=-1,
+    )
+
+
+def _chord_to_meters(chord):
+    """Convert the straight-line distance between unit vectors to a great-circle distance."""
+    return 2 * EARTH_RADIUS_METERS * np.arcsin(np.clip(np.asarray(chord) / 2, 0.0, 1.0))
+
+
+def _meters_to_chord(meters: float) -> float:
+    """Convert a great-circle distance to the straight-line distance between unit vectors."""
+    angle = min(meters / EARTH_RADIUS_METERS, np.pi)
+    return float(2 * np.sin(angle / 2))
+
+
+class SpatialIndex:
+    """
+    A k-d tree over the locations of a game, mapped onto the unit sphere.
+
+    Coordinates are converted to 3D unit vectors, where the straight-line distance grows
+    with the great-circle distance, so the tree has no problems at the poles or at the
+    antimeridian. Every node keeps the bounding box of its points, which lets radius and
+    nearest-neighbor queries skip whole subtrees instead of visiting every location.
+
+    Distances are great-circle distances on a sphere with the mean Earth radius, within
+    0.5% of the geodesic distance.
+
+    Parameters
+    ----------
+    latitudes : np.ndarray
+        The latitudes of the locations in decimal degrees, by ordinal.
+    longitudes : np.ndarray
+        The longitudes of the locations in decimal degrees, by ordinal.
+    leaf_size : int, optional (default=16)
+        The maximum number of locations in a leaf of the tree.
+    """
+
+    def __init__(self, latitudes: np.ndarray, longitudes: np.ndarray, leaf_size: int = 16):
+        """Build the tree."""
+        self.leaf_size = leaf_size
+        self._points = _unit_vectors(latitudes, longitudes).reshape(-1, 3)
+        self._ordinals = np.arange(len(self._points))
+
+        # node arrays: point range, children (-1 for leaves) and bounding box
+        self._starts: list[int] = []
+        self._ends: list[int] = []
+        self._children: list[tuple[int, int]] = []
+        self._lower: list[np.ndarray] = []
+        self._upper: list[np.ndarray] = []
+        if len(self._points):
+            self._build(0, len(self._points))
+
+    def __len__(self) -> int:
+        """Return the number of indexed locations."""
+        return len(self._points)
+
+    def _build(self, start: int, end: int) -> int:
+        """Build the subtree of the points between `start` and `end`, return its node."""
+        points = self._points[self._ordinals[start:end]]
+        node = len(self._starts)
+        self._starts.append(start)
+        self._ends.append(end)
+        self._children.append((-1, -1))
+        self._lower.append(points.min(axis=0))
+        self._upper.append(points.max(axis=0))
+
+        if end - start <= self.leaf_size:
+            return node
+
+        dimension = int(np.argmax(self._upper[node] - self._lower[node]))
+        middle = (start + end) // 2
+        order = np.argpartition(points[:, dimension], middle - start)
+        self._ordinals[start:end] = self._ordinals[start:end][order]
+
+        left = self._build(start, middle)
+        right = self._build(middle, end)
+        self._children[node] = (left, right)
+        return node
+
+    def _box_distance(self, node: int, point: np.ndarray) -> float:
+        """Return the straight-line distance from a point to the bounding box of a node."""
+        excess = np.maximum(self._lower[node] - point, 0) + np.maximum(point - self._upper[node], 0)
+        return float(np.sqrt(excess @ excess))
+
+    def within(
+        self, latitude: float, longitude: float, radius: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find all locations within a radius of a point.
+
+        Parameters
+        ----------
+        latitude : float
+            The latitude of the point in decimal degrees.
+        longitude : float
+            The longitude of the point in decimal degrees.
+        radius : float
+            The radius in meters.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The ordinals of the locations and their distances in meters, nearest first.
+        """
+        point = _unit_vectors(latitude, longitude)
+        max_chord = _meters_to_chord(radius)
+
+        ordinals: list[np.ndarray] = []
+        chords: list[np.ndarray] = []
+        stack = [0] if len(self) else []
+        while stack:
+            node = stack.pop()
+            if self._box_distance(node, point) > max_chord:
+                continue
+
+            left, right = self._children[node]
+            if left >= 0:
+                stack.extend((left, right))
+                continue
+
+            leaf_ordinals = self._ordinals[self._starts[node] : self._ends[node]]
+            leaf_chords = np.linalg.norm(self._points[leaf_ordinals] - point, axis=1)
+            inside = leaf_chords <= max_chord
+            ordinals.append(leaf_ordinals[inside])
+            chords.append(leaf_chords[inside])
+
+        return self._sorted(ordinals, chords)
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 1,
+        mask: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the `k` nearest locations to a point.
+
+        Parameters
+        ----------
+        latitude : float
+            The latitude of the point in decimal degrees.
+        longitude : float
+            The longitude of the point in decimal degrees.
+        k : int, optional (default=1)
+            The number of locations to find.
+        mask : np.ndarray, optional
+            A boolean array over the ordinals; only the locations where it is True are
+            considered, for example the unsolved locations of a team.
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            The ordinals of at most `k` locations and their distances in meters, nearest
+            first.
+        """
+        point = _unit_vectors(latitude, longitude)
+
+        # max-heap of the best candidates as (-chord, ordinal) and min-heap of nodes to visit
+        best: list[tuple[float, int]] = []
+        nodes = [(0.0, 0)] if len(self) and k > 0 else []
+        while nodes:
+            box_distance, node = heapq.heappop(nodes)
+            if len(best) == k and box_distance > -best[0][0]:
+                break
+
+            left, right = self._children[node]
+            if left >= 0:
+                for child in (left, right):
+                    heapq.heappush(nodes, (self._box_distance(child, point), child))
+                continue
+
+            leaf_ordinals = self._ordinals[self._starts[node] : self._ends[node]]
+            if mask is not None:
+                leaf_ordinals = leaf_ordinals[mask[leaf_ordinals]]
+            leaf_chords = np.linalg.norm(self._points[leaf_ordinals] - point, axis=1)
+            for chord, ordinal in zip(leaf_chords.tolist(), leaf_ordinals.tolist(), strict=True):
+                if len(best) < k:
+                    heapq.heappush(best, (-chord, ordinal))
+                elif chord < -best[0][0]:
+                    heapq.heapreplace(best, (-chord, ordinal))
+
+        return self._sorted(
+            [np.array([ordinal for _, ordinal in best], dtype=int)],
+            [np.array([-chord for chord, _ in best], dtype=float)],
+        )
+
+    @staticmethod
+    def _sorted(
+        ordinals: list[np.ndarray], chords: list[np.ndarray]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Concatenate the results of the leaves and sort them by distance."""
+        if not ordinals:
+            return np.array([], dtype=int), np.array([], dtype=float)
+
+        all_ordinals = np.concatenate(ordinals)
+        all_chords = np.concatenate(chords)
+        order = np.lexsort((all_ordinals, all_chords))
+        return all_ordinals[order], _chord_to_meters(all_chords[order])
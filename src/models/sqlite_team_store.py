@@ -0,0 +1,311 @@
+"""SQLite storage backend for the team states."""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+from .codecs import SUFFIXES, load_file
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS teams (
+    name TEXT PRIMARY KEY,
+    goal_location_name TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS solved (
+    team_name TEXT NOT NULL REFERENCES teams (name) ON DELETE CASCADE,
+    location_name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (team_name, location_name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+YAML_MIGRATION_KEY = "yaml_migration"
+
+
+class SQLiteTeamStore:
+    """
+    Stores all team states in a single SQLite database in WAL mode.
+
+    Every team is a row in the `teams` table and every solved location is a row in the
+    `solved` table, both indexed by their primary key. Each thread gets its own connection,
+    so the store can be shared between Streamlit sessions.
+
+    Parameters
+    ----------
+    db_path : str
+        The path to the SQLite database file. The file is created if it does not exist.
+    """
+
+    def __init__(self, db_path: str):
+        """Initialize the store and create the schema if needed."""
+        self._db_path = db_path
+        self._local = threading.local()
+
+        self._connection().executescript(SCHEMA)
+
+    @property
+    def path(self) -> str:
+        """Return the path of the database file."""
+        return self._db_path
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection of the current thread, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+
+        return connection
+
+    def team_exists(self, team_name: str) -> bool:
+        """
+        Check if a team exists in the database.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+
+        Returns
+        -------
+        bool
+            True if the team exists, False otherwise.
+        """
+        row = (
+            self._connection()
+            .execute("SELECT 1 FROM teams WHERE name = ?", (team_name,))
+            .fetchone()
+        )
+        return row is not None
+
+    def count_teams(self) -> int:
+        """
+        Count the registered teams.
+
+        Returns
+        -------
+        int
+            The number of teams in the database.
+        """
+        (count,) = self._connection().execute("SELECT COUNT(*) FROM teams").fetchone()
+        return count
+
+    def load_team(self, team_name: str) -> dict | None:
+        """
+        Load the data of a single team.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+
+        Returns
+        -------
+        dict or None
+            The team data as accepted by `TeamState`, or None if the team does not exist.
+        """
+        rows = (
+            self._connection()
+            .execute(
+                """
+                SELECT teams.goal_location_name, teams.version, solved.location_name, solved.score
+                FROM teams
+                LEFT JOIN solved ON solved.team_name = teams.name
+                WHERE teams.name = ?
+                """,
+                (team_name,),
+            )
+            .fetchall()
+        )
+        if not rows:
+            return None
+
+        return {
+            "name": team_name,
+            "goal_location_name": rows[0][0],
+            "version": rows[0][1],
+            "solved": {location: score for _, _, location, score in rows if location is not None},
+        }
+
+    def load_teams(self) -> dict[str, dict]:
+        """
+        Load the data of all teams.
+
+        Returns
+        -------
+        dict[str, dict]
+            A dictionary where keys are team names and values are team data.
+        """
+        rows = self._connection().execute(
+            """
+            SELECT
+                teams.name, teams.goal_location_name, teams.version,
+                solved.location_name, solved.score
+            FROM teams
+            LEFT JOIN solved ON solved.team_name = teams.name
+            ORDER BY teams.name
+            """
+        )
+
+        teams: dict[str, dict] = {}
+        for team_name, goal_location_name, version, location, score in rows:
+            team = teams.setdefault(
+                team_name,
+                {
+                    "name": team_name,
+                    "goal_location_name": goal_location_name,
+                    "version": version,
+                    "solved": {},
+                },
+            )
+            if location is not None:
+                team["solved"][location] = score
+
+        return teams
+
+    def save_team(
+        self,
+        name: str,
+        goal_location_name: str,
+        solved: dict[str, int],
+        version: int = 0,
+        options: dict[str, str] | None = None,
+    ) -> dict | None:
+        """
+        Insert or update a team if its stored version still equals `version`.
+
+        The comparison and the write happen in a single transaction. On success the stored
+        version becomes `version + 1`.
+
+        Parameters
+        ----------
+        name : str
+            The name of the team.
+        goal_location_name : str
+            The current goal of the team.
+        solved : dict[str, int]
+            The solved locations and their scores.
+        version : int, optional
+            The version the caller expects to be stored (default is 0). A team that does
+            not exist yet is always written.
+        options : dict[str, str], optional
+            The chosen answer option per solved location. Not stored in the database.
+
+        Returns
+        -------
+        dict or None
+            None if the team was written, otherwise the currently stored team data.
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT version FROM teams WHERE name = ?", (name,)).fetchone()
+            if row is not None and row[0] != version:
+                connection.execute("COMMIT")
+                return self.load_team(name)
+
+            self._write_team(connection, name, goal_location_name, solved, version + 1)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        return None
+
+    def delete_team(self, team_name: str) -> None:
+        """
+        Delete a team and its solved locations.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+        """
+        self._connection().execute("DELETE FROM teams WHERE name = ?", (team_name,))
+
+    @staticmethod
+    def _write_team(
+        connection: sqlite3.Connection,
+        name: str,
+        goal_location_name: str,
+        solved: dict[str, int],
+        version: int,
+    ) -> None:
+        """Write a team inside an already opened transaction."""
+        connection.execute(
+            """
+            INSERT INTO teams (name, goal_location_name, version) VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET
+                goal_location_name = excluded.goal_location_name,
+                version = excluded.version
+            """,
+            (name, goal_location_name, version),
+        )
+        connection.execute("DELETE FROM solved WHERE team_name = ?", (name,))
+        connection.executemany(
+            "INSERT INTO solved (team_name, location_name, score) VALUES (?, ?, ?)",
+            [(name, location, score) for location, score in solved.items()],
+        )
+
+    def migrate_from_yaml(self, team_state_path: Path) -> int:
+        """
+        Import the team states from a `team_states/` folder, once.
+
+        The migration is recorded in the database, so later calls are a single lookup.
+
+        Parameters
+        ----------
+        team_state_path : Path
+            The folder holding one state file per team, in any codec.
+
+        Returns
+        -------
+        int
+            The number of migrated teams.
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            migrated = connection.execute(
+                "SELECT 1 FROM metadata WHERE key = ?", (YAML_MIGRATION_KEY,)
+            ).fetchone()
+            if migrated is not None:
+                connection.execute("COMMIT")
+                return 0
+
+            n_teams = 0
+            for team_state_file in sorted(Path(team_state_path).iterdir()):
+                if team_state_file.suffix not in SUFFIXES:
+                    continue
+
+                team_data = load_file(team_state_file)
+                self._write_team(
+                    connection,
+                    name=team_data["name"],
+                    goal_location_name=team_data["goal_location_name"],
+                    solved=team_data.get("solved") or {},
+                    version=team_data.get("version", 0),
+                )
+                n_teams += 1
+
+            connection.execute(
+                "INSERT INTO metadata (key, value) VALUES (?, ?)",
+                (YAML_MIGRATION_KEY, str(n_teams)),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        return n_teams
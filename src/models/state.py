@@ -4,11 +4,19 @@ from enum import Enum
 from pathlib import Path
 from random import choice
 
+from collections.abc import Iterator
+
 from pydantic import BaseModel, PrivateAttr, field_serializer
-import yaml
 
-from .team_state import TeamState
+from .codecs import CODECS, SUFFIXES, StateCodec, dump_file, load_file
+from .goal_counter import GoalCounter, get_goal_counter
+from .team_state import TeamState, TeamStore
+from .team_state_cache import TEAM_STATE_CACHE
 from .game import Game
+from .answer_log import get_answer_log_store
+from .sqlite_team_store import SQLiteTeamStore
+from .team_index import TeamIndex, get_team_index
+from .write_behind import WriteBehindFlusher, get_flusher
 
 
 class NextLocationMechanic(str, Enum):
@@ -19,6 +27,15 @@ class NextLocationMechanic(str, Enum):
     FURTHEST = "furthest"
     NEAREST_WHEN_CORRECT = "nearest_when_correct"
     FURTHEST_WHEN_CORRECT = "furthest_when_correct"
+    LEAST_CROWDED = "least_crowded"
+
+
+class StorageMode(str, Enum):
+    """Backends for storing the team states."""
+
+    YAML = "yaml"
+    SQLITE = "sqlite"
+    EVENT_LOG = "event_log"
 
 
 class State(BaseModel):
@@ -29,6 +46,25 @@ class State(BaseModel):
     ----------
     button_beam_to_location_visible : bool, optional (default=False)
         Adds a button to beam to goal location. Defaults to False.
+    next_location_mechanic : NextLocationMechanic, optional
+        How the next goal of a team is selected (default is `NEAREST_WHEN_CORRECT`). With
+        `LEAST_CROWDED`, the first and every next goal is the unsolved location that the
+        fewest teams are heading to, counted live by a `GoalCounter`.
+    storage_mode : StorageMode, optional (default=StorageMode.YAML)
+        Where the team states are stored. `YAML` keeps one file per team in `team_states/`,
+        `SQLITE` keeps all teams in a single database next to the state file and `EVENT_LOG`
+        appends every answer to a log next to the state file, see `AnswerLogStore`. Existing
+        YAML team states are migrated into the database or the log once.
+    team_state_codec : StateCodec, optional (default=StateCodec.YAML)
+        The format of new team state files when the storage mode is `YAML`. Existing files
+        keep their format, which is detected from the file suffix when reading.
+    write_behind_window : float, optional (default=0.0)
+        The durability window in seconds for write-behind saving. When positive, team state
+        saves are kept in memory, coalesced per team and written by a background thread at
+        least every `write_behind_window` seconds and on shutdown. A crash loses at most
+        this window of progress. When 0, every save is written immediately.
+    write_behind_max_pending : int, optional (default=50)
+        The number of teams waiting to be written that triggers an early flush.
 
     Properties
     ----------
@@ -38,9 +74,17 @@ class State(BaseModel):
 
     button_beam_to_location_visible: bool = False
     next_location_mechanic: NextLocationMechanic = NextLocationMechanic.NEAREST_WHEN_CORRECT
+    storage_mode: StorageMode = StorageMode.YAML
+    team_state_codec: StateCodec = StateCodec.YAML
+    write_behind_window: float = 0.0
+    write_behind_max_pending: int = 50
 
     _file_path: str = PrivateAttr(init=True)
     _game: Game = PrivateAttr(init=True)
+    _store: TeamStore | None = PrivateAttr(default=None)
+    _flusher: WriteBehindFlusher | None = PrivateAttr(default=None)
+    _team_index: TeamIndex | None = PrivateAttr(default=None)
+    _goal_counter: GoalCounter | None = PrivateAttr(default=None)
 
     def __init__(
         self,
@@ -54,7 +98,7 @@ class State(BaseModel):
         Parameters
         ----------
         file_path : str
-            The path to the YAML file storing the game state.
+            The path to the file storing the game state. The suffix selects the codec.
         game : Game
             The game object holding the game data.
         """
@@ -66,26 +110,86 @@ class State(BaseModel):
         if not self._team_state_path.exists():
             self._team_state_path.mkdir()
 
+        if self.storage_mode == StorageMode.SQLITE:
+            self._store = SQLiteTeamStore(str(Path(file_path).with_suffix(".sqlite3")))
+            self._store.migrate_from_yaml(self._team_state_path)
+        elif self.storage_mode == StorageMode.EVENT_LOG:
+            self._store = get_answer_log_store(str(Path(file_path).with_suffix(".answers.ndjson")))
+            self._store.migrate_from_yaml(self._team_state_path)
+        else:
+            self._team_index = get_team_index(self._team_state_path)
+
+        if self.write_behind_window > 0:
+            self._flusher = get_flusher(
+                key=self._store.path if self._store else str(self._team_state_path.resolve()),
+                durability_window=self.write_behind_window,
+                max_pending=self.write_behind_max_pending,
+            )
+
+        if self.next_location_mechanic == NextLocationMechanic.LEAST_CROWDED:
+            self._goal_counter = get_goal_counter(
+                key=self._store.path if self._store else str(self._team_state_path.resolve()),
+                n_locations=len(game.locations),
+                load_goals=self._load_goals,
+            )
+
         if not Path(self._file_path).exists():
             self.save()
 
-    @field_serializer("next_location_mechanic")
-    def serialize_enum(self, next_location_mechanic: NextLocationMechanic, _) -> str:
+    @field_serializer("next_location_mechanic", "storage_mode", "team_state_codec")
+    def serialize_enum(self, value: Enum, _) -> str:
         """Serialize the mapping to a dict and use the Enum keys instead of values."""
-        return next_location_mechanic.value
+        return value.value
 
     @property
     def n_active_teams(self):
         """
         Returns the number of registered teams.
 
+        The teams are counted from the team index, without scanning the `team_states/` folder.
+
         Returns
         -------
         int
             The number of teams currently active in the game.
         """
-        team_states = self._team_state_path.glob("*.yaml")
-        return len(list(team_states))
+        pending_names = self._flusher.pending_names() if self._flusher else set()
+
+        if self._store is not None:
+            return self._store.count_teams() + sum(
+                1 for team_name in pending_names if not self._store.team_exists(team_name)
+            )
+
+        assert self._team_index is not None
+        if not pending_names:
+            return len(self._team_index)
+
+        return len(self._team_index.files().keys() | pending_names)
+
+    @property
+    def goal_counter(self) -> GoalCounter | None:
+        """Return the live counters of the goals, only kept for `LEAST_CROWDED`."""
+        return self._goal_counter
+
+    def _load_goals(self) -> dict[str, int]:
+        """Get the goal of every team that has not finished, by location ordinal."""
+        return {
+            team_name: self._game.index.ordinal(team_state.goal_location_name)
+            for team_name, team_state in self.get_teams_as_dict().items()
+            if team_state.goal_location_name in self._game.index
+            and team_state.goal_location_name not in team_state.solved
+        }
+
+    def _first_goal(self, team_name: str) -> str:
+        """Choose the first goal of a new team, the least crowded one with a goal counter."""
+        if self._goal_counter is None:
+            return choice(self._game.locations).name  # nosec
+
+        goal_counter = self._goal_counter
+        ordinal = goal_counter.assign(
+            team_name, lambda: goal_counter.least_crowded(lambda ordinal: True)
+        )
+        return self._game.index.names[ordinal]
 
     def team_exists(self, team_name: str) -> bool:
         """
@@ -101,13 +205,22 @@ class State(BaseModel):
         bool
             True if the team exists, False otherwise.
         """
-        team_state_file = self._team_state_path / f"{team_name}.yaml"
-        return team_state_file.exists()
+        if self._flusher is not None and team_name in self._flusher.pending_names():
+            return True
+
+        if self._store is not None:
+            return self._store.team_exists(team_name)
+
+        return self._find_team_state_file(team_name) is not None
 
     def get_or_create_team_state(self, team_name: str) -> TeamState:
         """
         Get the state of a team by name, creating it if it does not exist.
 
+        Team states stored as YAML are served from a process-wide cache that only re-reads
+        the file when it changed on disk. With write-behind saving, a pending save of the team
+        is returned before anything is read from disk.
+
         Parameters
         ----------
         team_name : str
@@ -118,32 +231,141 @@ class State(BaseModel):
         TeamState
             The state of the team.
         """
-        team_state_file = self._team_state_path / f"{team_name}.yaml"
+        if self._flusher is not None:
+            team_state = self._flusher.pending(team_name)
+            if team_state is not None:
+                return self._attach_flusher(team_state)
+
+        if self._store is not None:
+            return self._get_or_create_stored_team_state(team_name)
+
+        assert self._team_index is not None
+        team_state_file = self._find_team_state_file(team_name)
+        if team_state_file is not None:
+            team_state = TEAM_STATE_CACHE.load(team_state_file)
+            if team_state is not None:
+                return self._attach_flusher(team_state)
+
+        team_state_file = next(self._team_state_candidates(team_name))
+        # the team is registered by the write creating its file, with write-behind saving
+        # that is only when the flusher writes it
+        return TeamState(
+            file_path=str(team_state_file),
+            flusher=self._flusher,
+            team_index=self._team_index,
+            name=team_name,
+            goal_location_name=self._first_goal(team_name),
+        )
 
-        if team_state_file.exists():
-            with open(team_state_file, "r") as file:
-                team_data = yaml.safe_load(file)
-                return TeamState(
-                    file_path=str(team_state_file),
-                    **team_data,
-                )
+    def _get_or_create_stored_team_state(self, team_name: str) -> TeamState:
+        """Get or create the state of a team in the SQLite store or the answer log."""
+        assert self._store is not None
+
+        team_data = self._store.load_team(team_name)
+        if team_data is not None:
+            return TeamState(
+                file_path=self._store.path,
+                store=self._store,
+                flusher=self._flusher,
+                **team_data,
+            )
 
-        goal_location = choice(self._game.locations)  # nosec
-        return TeamState(
-            file_path=str(self._team_state_path / f"{team_name}.yaml"),
+        team_state = TeamState(
+            file_path=self._store.path,
+            store=self._store,
+            flusher=self._flusher,
             name=team_name,
-            goal_location_name=goal_location.name,
+            goal_location_name=self._first_goal(team_name),
         )
+        team_state.save()
+        return team_state
+
+    def _attach_flusher(self, team_state: TeamState) -> TeamState:
+        """Let a loaded team state save through the flusher and into the team index of this state."""
+        team_state._flusher = self._flusher
+        team_state._team_index = self._team_index
+        return team_state
+
+    def _team_state_candidates(self, team_name: str) -> Iterator[Path]:
+        """Yield the possible files of a team, starting with the configured codec."""
+        suffix = CODECS[self.team_state_codec].suffix
+        yield self._team_state_path / f"{team_name}{suffix}"
+
+        for other_suffix in SUFFIXES:
+            if other_suffix != suffix:
+                yield self._team_state_path / f"{team_name}{other_suffix}"
+
+    def _find_team_state_file(self, team_name: str) -> Path | None:
+        """
+        Find the state file of a team, in the index or else on disk.
+
+        A file that exists on disk but is missing from the index, for example because it was
+        written by an older version, is added to the index.
+        """
+        assert self._team_index is not None
+        team_state_file = self._team_index.get(team_name)
+        if team_state_file is not None:
+            return team_state_file
+
+        for team_state_file in self._team_state_candidates(team_name):
+            if team_state_file.exists():
+                self._team_index.add(team_state_file)
+                return team_state_file
+
+        return None
+
+    def delete_team(self, team_name: str) -> None:
+        """
+        Delete a team from the state and the team index.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+        """
+        if self._flusher is not None:
+            self._flusher.discard(team_name)
+
+        if self._goal_counter is not None:
+            self._goal_counter.set_goal(team_name, None)
+
+        if self._store is not None:
+            self._store.delete_team(team_name)
+            return
+
+        assert self._team_index is not None
+        for team_state_file in self._team_state_candidates(team_name):
+            team_state_file.unlink(missing_ok=True)
+            (team_state_file.parent / f".{team_state_file.name}.lock").unlink(missing_ok=True)
+            TEAM_STATE_CACHE.invalidate(team_state_file)
+
+        self._team_index.remove(team_name)
+
+    def delete_all_teams(self) -> None:
+        """Delete all teams from the state and the team index."""
+        if self._store is not None:
+            for team_name in self._store.load_teams():
+                self.delete_team(team_name)
+            return
+
+        assert self._team_index is not None
+        for team_name in self._team_index.files():
+            self.delete_team(team_name)
+
+        self._team_index.rebuild()
 
     @classmethod
     def from_yaml_file(cls, file_path: str, game: Game) -> "State":
         """
         Create or load a `State` object from a YAML file.
 
+        Despite the name, any codec from `models.codecs` is accepted and detected from the
+        suffix of the file.
+
         Parameters
         ----------
         file_path : str
-            The path to the YAML file containing the state data.
+            The path to the file containing the state data.
         game : Game
             The game object holding the game data.
 
@@ -155,37 +377,53 @@ class State(BaseModel):
         if not Path(file_path).exists():
             state = cls(file_path=file_path, game=game)
         else:
-            with open(file_path, "r") as f:
-                state_data = yaml.safe_load(f)
-                state = cls(file_path=file_path, game=game, **state_data)
+            state_data = load_file(file_path)
+            state = cls(file_path=file_path, game=game, **state_data)
 
         return state
 
     def save(self) -> None:
-        """Save the game state to a YAML file."""
-        with open(self._file_path, "w") as f:
-            yaml.dump(
-                data=self.model_dump(),
-                stream=f,
-            )
+        """Save the game state to its file."""
+        dump_file(self.model_dump(), self._file_path)
 
     def get_teams_as_dict(self) -> dict:
         """
         Get all team states as a dictionary.
 
+        Team state files are loaded through the process-wide team state cache, so a file is
+        only parsed again when its stat changed since the previous call. Teams whose file
+        was deleted are dropped from the team index. The returned team states are shared
+        with the cache and must be treated as read-only; use `get_or_create_team_state` to
+        change a team.
+
         Returns
         -------
         dict
             A dictionary where keys are team names and values are team states.
         """
-        teams = {}
-        for team_state_file in self._team_state_path.glob("*.yaml"):
-            with open(team_state_file, "r") as file:
-                team_data = yaml.safe_load(file)
-                team_name = team_state_file.stem
-                teams[team_name] = TeamState(
-                    file_path=str(team_state_file),
-                    **team_data,
-                )
+        if self._store is not None:
+            teams = {
+                team_name: TeamState(file_path=self._store.path, store=self._store, **team_data)
+                for team_name, team_data in self._store.load_teams().items()
+            }
+        else:
+            assert self._team_index is not None
+            team_state_files = self._team_index.files()
+            TEAM_STATE_CACHE.maxsize = max(TEAM_STATE_CACHE.maxsize, len(team_state_files))
+
+            teams = {}
+            for team_name, team_state_file in team_state_files.items():
+                team_state = TEAM_STATE_CACHE.load(team_state_file, copy=False)
+                if team_state is None:
+                    self._team_index.remove(team_name)
+                    continue
+
+                teams[team_name] = team_state
+
+        if self._flusher is not None:
+            for team_name in self._flusher.pending_names():
+                team_state = self._flusher.pending(team_name)
+                if team_state is not None:
+                    teams[team_name] = team_state
 
         return teams
@@ -0,0 +1,206 @@
+"""Index of the registered teams, backed by an append-only manifest file."""
+
+import os
+import threading
+from pathlib import Path
+
+from .codecs import SUFFIXES
+
+
+class TeamIndex:
+    """
+    Keeps the team state files of a `team_states/` folder in memory.
+
+    Every process appends a line to a manifest file when it registers (`+TeamA.yaml`) or
+    removes (`-TeamA.yaml`) a team. Other processes pick up those lines incrementally, so
+    counting and listing teams never scans the folder. The manifest is rebuilt from the
+    folder when it is missing, or when it is stale because the hidden marker file written
+    into the folder at the last rebuild is gone, for example when the folder was deleted
+    and recreated.
+
+    Parameters
+    ----------
+    team_state_path : Path
+        The folder holding one state file per team.
+    """
+
+    def __init__(self, team_state_path: Path):
+        """Initialize the index, loading or rebuilding the manifest."""
+        self.team_state_path = Path(team_state_path)
+        self.manifest_path = self.team_state_path.parent / f"{self.team_state_path.name}.manifest"
+        self._files: dict[str, Path] = {}
+        self._offset = 0
+        self.marker_path = self.team_state_path / ".indexed"
+        self._manifest_inode: int | None = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def __len__(self) -> int:
+        """Return the number of registered teams."""
+        self.refresh()
+        return len(self._files)
+
+    def __contains__(self, team_name: object) -> bool:
+        """Check if a team is registered."""
+        self.refresh()
+        return team_name in self._files
+
+    def files(self) -> dict[str, Path]:
+        """
+        Get the state files of all registered teams.
+
+        Returns
+        -------
+        dict[str, Path]
+            A dictionary where keys are team names and values are team state files.
+        """
+        self.refresh()
+        with self._lock:
+            return dict(self._files)
+
+    def get(self, team_name: str) -> Path | None:
+        """
+        Get the state file of a registered team.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+
+        Returns
+        -------
+        Path or None
+            The state file of the team, or None if the team is not registered.
+        """
+        self.refresh()
+        return self._files.get(team_name)
+
+    def add(self, team_state_file: Path) -> None:
+        """
+        Register a team state file.
+
+        Parameters
+        ----------
+        team_state_file : Path
+            The state file of the team.
+        """
+        self.refresh()
+        if self._files.get(team_state_file.stem) != team_state_file:
+            self._append(f"+{team_state_file.name}")
+
+    def remove(self, team_name: str) -> None:
+        """
+        Unregister a team.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+        """
+        self.refresh()
+        team_state_file = self._files.get(team_name)
+        if team_state_file is not None:
+            self._append(f"-{team_state_file.name}")
+
+    def refresh(self) -> None:
+        """Read lines appended by other processes, rebuilding the manifest if needed."""
+        with self._lock:
+            try:
+                stat_result = os.stat(self.manifest_path)
+                os.stat(self.marker_path)
+            except FileNotFoundError:
+                self._rebuild()
+                return
+
+            if stat_result.st_ino != self._manifest_inode or stat_result.st_size < self._offset:
+                self._files = {}
+                self._offset = 0
+                self._manifest_inode = stat_result.st_ino
+
+            if stat_result.st_size > self._offset:
+                self._read_tail()
+
+    def rebuild(self) -> None:
+        """Rebuild the manifest from the team state files in the folder."""
+        with self._lock:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Rebuild the manifest, the lock must be held."""
+        self.team_state_path.mkdir(parents=True, exist_ok=True)
+        team_state_files = sorted(
+            team_state_file
+            for team_state_file in self.team_state_path.iterdir()
+            if team_state_file.suffix in SUFFIXES
+        )
+        lines = [f"+{team_state_file.name}\n" for team_state_file in team_state_files]
+
+        temporary_path = self.manifest_path.with_name(f".{self.manifest_path.name}.{os.getpid()}")
+        with open(temporary_path, "w") as file:
+            file.writelines(lines)
+        os.replace(temporary_path, self.manifest_path)
+        self.marker_path.touch()
+
+        self._files = {}
+        self._offset = 0
+        self._manifest_inode = os.stat(self.manifest_path).st_ino
+        self._read_tail()
+
+    def _read_tail(self) -> None:
+        """Apply the complete lines after the current offset, the lock must be held."""
+        with open(self.manifest_path, "rb") as file:
+            file.seek(self._offset)
+            content = file.read()
+
+        if b"\n" not in content:
+            return
+
+        complete = content[: content.rindex(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            if line.startswith("+"):
+                team_state_file = self.team_state_path / line[1:]
+                self._files[team_state_file.stem] = team_state_file
+            elif line.startswith("-"):
+                team_state_file = self.team_state_path / line[1:]
+                if self._files.get(team_state_file.stem) == team_state_file:
+                    del self._files[team_state_file.stem]
+
+        self._offset += len(complete)
+
+    def _append(self, line: str) -> None:
+        """Append a line to the manifest with a single write and apply it."""
+        file_descriptor = os.open(self.manifest_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+        try:
+            os.write(file_descriptor, f"{line}\n".encode("utf-8"))
+        finally:
+            os.close(file_descriptor)
+
+        self.refresh()
+
+
+_INDEXES: dict[str, TeamIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_team_index(team_state_path: Path) -> TeamIndex:
+    """
+    Get the process-wide index of a team state folder, creating it on first use.
+
+    Parameters
+    ----------
+    team_state_path : Path
+        The folder holding one state file per team.
+
+    Returns
+    -------
+    TeamIndex
+        The index of the folder.
+    """
+    key = str(Path(team_state_path).resolve())
+    with _INDEXES_LOCK:
+        team_index = _INDEXES.get(key)
+        if team_index is None:
+            team_index = TeamIndex(Path(team_state_path))
+            _INDEXES[key] = team_index
+
+        return team_index
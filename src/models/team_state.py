@@ -1,9 +1,45 @@
 """Model for the state of a team in the game."""
 
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 from pydantic import BaseModel, PrivateAttr
-import yaml
+
+from .answer_log import AnswerLogStore
+from .codecs import dump_file, load_file
+from .sqlite_team_store import SQLiteTeamStore
+from .team_index import TeamIndex
+from .write_behind import WriteBehindFlusher
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+
+TeamStore = SQLiteTeamStore | AnswerLogStore
+
+
+@contextmanager
+def _file_lock(file_path: str) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock for a single team state file.
+
+    The lock lives in a hidden file next to the state file, so writers of different teams
+    never wait for each other. On platforms without `fcntl` no lock is taken.
+    """
+    if fcntl is None:  # pragma: no cover
+        yield
+        return
+
+    path = Path(file_path)
+    with open(path.parent / f".{path.name}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
 
 
 class TeamState(BaseModel):
@@ -18,17 +54,28 @@ class TeamState(BaseModel):
         The current goal (location) of the team.
     solved : dict[str, int], optional
         A dictionary where keys are location names and values are scores for solved locations. Defaults to an empty dictionary.
+    version : int, optional
+        The number of times the team state has been saved. Used to detect concurrent writes.
+        Defaults to 0.
     """
 
     name: str
     goal_location_name: str
     solved: dict[str, int] = {}
+    version: int = 0
 
     _file_path: str = PrivateAttr(init=True)
+    _store: TeamStore | None = PrivateAttr(default=None)
+    _flusher: WriteBehindFlusher | None = PrivateAttr(default=None)
+    _team_index: TeamIndex | None = PrivateAttr(default=None)
+    _options: dict[str, str] = PrivateAttr(default_factory=dict)
 
     def __init__(
         self,
         file_path: str,
+        store: TeamStore | None = None,
+        flusher: WriteBehindFlusher | None = None,
+        team_index: TeamIndex | None = None,
         **data,
     ):
         """
@@ -37,19 +84,117 @@ class TeamState(BaseModel):
         Parameters
         ----------
         file_path : str
-            The path to the YAML file storing the game state.
+            The path to the file storing the game state. The suffix of the file selects the
+            codec, see `models.codecs`.
+        store : SQLiteTeamStore or AnswerLogStore, optional
+            Store to persist the team state in instead of the YAML file. A team state
+            backed by a store is not saved on creation; the caller decides when to save.
+        flusher : WriteBehindFlusher, optional
+            Hands saves to a background flusher instead of writing them directly.
+        team_index : TeamIndex, optional
+            Registers the team once the write creating its file succeeded, so no other
+            process sees a registered team without a file.
         """
         super().__init__(**data)
         self._file_path = file_path
+        self._store = store
+        self._flusher = flusher
+        self._team_index = team_index
 
-        if not Path(self._file_path).exists():
+        if self._store is None and not Path(self._file_path).exists():
             self.save()
 
+    def record_answer(self, location_name: str, score: int, option: str | None = None) -> None:
+        """
+        Record the answer given at a location.
+
+        Parameters
+        ----------
+        location_name : str
+            The name of the answered location.
+        score : int
+            The score of the answer.
+        option : str, optional
+            The chosen or typed answer option. Kept in the answer log when the team state is
+            stored in one.
+        """
+        self.solved[location_name] = score
+        if option is not None:
+            self._options[location_name] = option
+
     def save(self) -> None:
-        """Save the team state to a YAML file."""
-        with open(self._file_path, "w") as file:
-            yaml.dump(
-                data=self.model_dump(),
-                stream=file,
-                default_flow_style=False,
+        """
+        Save the team state.
+
+        With a write-behind flusher the save is only scheduled and written later from a
+        background thread, otherwise it is written immediately with `write`.
+        """
+        if self._flusher is not None:
+            self._flusher.schedule(self)
+        else:
+            self.write()
+
+    def write(self, retries: int = 10) -> None:
+        """
+        Write the team state to its store, or to its file when there is no store.
+
+        The save only succeeds when the stored version equals the version of this team state.
+        Otherwise another session saved in the meantime: the stored state is merged into this
+        one and the save is retried. Locations solved by the other session keep their score
+        and its goal is kept unless it has been solved here.
+
+        Parameters
+        ----------
+        retries : int, optional
+            Number of attempts before giving up (default is 10).
+
+        Raises
+        ------
+        RuntimeError
+            If the team state could not be saved within the number of attempts.
+        """
+        for _ in range(retries):
+            current = self._compare_and_swap()
+            if current is None:
+                return
+
+            self._merge(current)
+
+        raise RuntimeError(f"Failed to save team state '{self.name}' after {retries} attempts.")
+
+    def _compare_and_swap(self) -> dict | None:
+        """Write the next version if the stored version matches, else return the stored data."""
+        if self._store is not None:
+            current = self._store.save_team(
+                name=self.name,
+                goal_location_name=self.goal_location_name,
+                solved=self.solved,
+                version=self.version,
+                options=self._options,
             )
+        else:
+            with _file_lock(self._file_path):
+                current = load_file(self._file_path) if Path(self._file_path).exists() else None
+                if current is not None and current.get("version", 0) == self.version:
+                    current = None
+
+                if current is None:
+                    created = not Path(self._file_path).exists()
+                    dump_file(self.model_dump() | {"version": self.version + 1}, self._file_path)
+                    if created and self._team_index is not None:
+                        self._team_index.add(Path(self._file_path))
+
+        if current is None:
+            self.version += 1
+
+        return current
+
+    def _merge(self, current: dict) -> None:
+        """Merge the stored team data into this team state."""
+        solved = self.solved | (current.get("solved") or {})
+
+        if current["goal_location_name"] not in solved:
+            self.goal_location_name = current["goal_location_name"]
+
+        self.solved = solved
+        self.version = current.get("version", 0)
@@ -0,0 +1,124 @@
+"""Process-wide cache for team states loaded from state files."""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from .codecs import load_file
+from .team_state import TeamState
+
+
+class TeamStateCache:
+    """
+    Least-recently-used cache of parsed team state files.
+
+    Entries are keyed by the team state file (one file per team name) and validated by the
+    inode, modification time in nanoseconds and size of the file. A cache hit therefore only
+    costs a single `stat` call instead of a YAML parse and a pydantic validation.
+
+    Parameters
+    ----------
+    maxsize : int, optional (default=1024)
+        The maximum number of team states kept in memory.
+
+    Attributes
+    ----------
+    hits : int
+        The number of loads served from the cache.
+    misses : int
+        The number of loads that had to parse the file.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """Initialize an empty cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[tuple[int, int, int], TeamState]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached team states."""
+        return len(self._entries)
+
+    def load(self, file_path: Path, copy: bool = True) -> TeamState | None:
+        """
+        Load a team state, parsing the file only when it changed since the previous load.
+
+        Parameters
+        ----------
+        file_path : Path
+            The path to the state file of the team.
+        copy : bool, optional (default=True)
+            Return a copy that can be modified freely. Without a copy the cached team state
+            itself is returned, which must be treated as read-only.
+
+        Returns
+        -------
+        TeamState or None
+            The team state, or None if the file does not exist.
+        """
+        key = str(file_path)
+        try:
+            stat_result = os.stat(key)
+        except FileNotFoundError:
+            self.invalidate(file_path)
+            return None
+
+        signature = (stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._copy(entry[1]) if copy else entry[1]
+
+            self.misses += 1
+
+        try:
+            team_data = load_file(key)
+        except FileNotFoundError:
+            # deleted since the `stat` call
+            self.invalidate(file_path)
+            return None
+        team_state = TeamState(file_path=key, **team_data)
+
+        with self._lock:
+            self._entries[key] = (signature, team_state)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return self._copy(team_state) if copy else team_state
+
+    def invalidate(self, file_path: Path) -> None:
+        """
+        Remove a team state from the cache.
+
+        Parameters
+        ----------
+        file_path : Path
+            The path to the state file of the team.
+        """
+        with self._lock:
+            self._entries.pop(str(file_path), None)
+
+    def clear(self) -> None:
+        """Remove all team states from the cache and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @staticmethod
+    def _copy(team_state: TeamState) -> TeamState:
+        """Copy a cached team state so callers cannot change the cached version."""
+        copied = team_state.model_copy(update={"solved": dict(team_state.solved)})
+        # private attributes are copied shallowly, so the chosen options would be shared
+        copied._options = dict(team_state._options)
+        return copied
+
+
+TEAM_STATE_CACHE = TeamStateCache()
@@ -0,0 +1,193 @@
+"""Write-behind flushing of team state saves."""
+
+import atexit
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .team_state import TeamState
+
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindFlusher:
+    """
+    Collects team state saves in memory and writes them from a background thread.
+
+    Saves of the same team are coalesced into a single write. Pending saves are written
+    when the durability window has passed, when `max_pending` teams are waiting, or when the
+    process exits.
+
+    Parameters
+    ----------
+    durability_window : float
+        The maximum number of seconds a save stays in memory before it is written. This is
+        the amount of progress that can be lost when the process is killed.
+    max_pending : int, optional (default=50)
+        The number of pending teams that triggers an immediate flush.
+    """
+
+    def __init__(self, durability_window: float, max_pending: int = 50):
+        """Initialize the flusher and start its background thread."""
+        if durability_window <= 0:
+            raise ValueError("The durability window must be positive.")
+
+        self.durability_window = durability_window
+        self.max_pending = max_pending
+        self.n_writes = 0
+        self._pending: dict[str, "TeamState"] = {}
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="team-state-flusher", daemon=True)
+        self._thread.start()
+
+    def schedule(self, team_state: "TeamState") -> None:
+        """
+        Mark a team state as dirty.
+
+        A snapshot of the team state is kept, so the caller can keep changing its object.
+        When the team already has a pending save, both are merged.
+
+        Parameters
+        ----------
+        team_state : TeamState
+            The team state to save.
+        """
+        snapshot = team_state.model_copy(update={"solved": dict(team_state.solved)})
+        snapshot._flusher = None
+        snapshot._options = dict(team_state._options)
+
+        with self._condition:
+            previous = self._pending.get(team_state.name)
+            if previous is not None:
+                snapshot._merge(previous.model_dump())
+                snapshot._options = previous._options | snapshot._options
+            self._pending[team_state.name] = snapshot
+
+            if len(self._pending) >= self.max_pending:
+                self._condition.notify()
+
+    def pending(self, team_name: str) -> "TeamState | None":
+        """
+        Get the pending save of a team.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+
+        Returns
+        -------
+        TeamState or None
+            A copy of the team state that is waiting to be written, or None.
+        """
+        with self._condition:
+            team_state = self._pending.get(team_name)
+            if team_state is None:
+                return None
+
+            return team_state.model_copy(update={"solved": dict(team_state.solved)})
+
+    def pending_names(self) -> set[str]:
+        """Return the names of the teams waiting to be written."""
+        with self._condition:
+            return set(self._pending)
+
+    def discard(self, team_name: str) -> None:
+        """
+        Drop the pending save of a team, for example because the team was deleted.
+
+        Parameters
+        ----------
+        team_name : str
+            The name of the team.
+        """
+        with self._condition:
+            self._pending.pop(team_name, None)
+
+    def flush(self) -> None:
+        """Write all pending team states now."""
+        with self._flush_lock:
+            with self._condition:
+                pending, self._pending = self._pending, {}
+
+            for team_name, team_state in pending.items():
+                try:
+                    team_state.write()
+                    self.n_writes += 1
+                except Exception:
+                    logger.exception("Failed to write team state '%s'.", team_name)
+                    with self._condition:
+                        newer = self._pending.get(team_name)
+                        if newer is not None:
+                            newer._merge(team_state.model_dump())
+                        else:
+                            self._pending[team_name] = team_state
+
+    def stop(self) -> None:
+        """Stop the background thread after writing all pending team states."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+        self._thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        """Flush whenever the durability window passes or too many saves are pending."""
+        while True:
+            with self._condition:
+                if not self._stopped and len(self._pending) < self.max_pending:
+                    self._condition.wait(timeout=self.durability_window)
+                if self._stopped:
+                    return
+
+            self.flush()
+
+
+_FLUSHERS: dict[str, WriteBehindFlusher] = {}
+_FLUSHERS_LOCK = threading.Lock()
+
+
+def get_flusher(key: str, durability_window: float, max_pending: int = 50) -> WriteBehindFlusher:
+    """
+    Get the process-wide flusher for a team state location, creating it on first use.
+
+    Parameters
+    ----------
+    key : str
+        Identifies where the team states are stored, for example the team state folder.
+    durability_window : float
+        See `WriteBehindFlusher`.
+    max_pending : int, optional (default=50)
+        See `WriteBehindFlusher`.
+
+    Returns
+    -------
+    WriteBehindFlusher
+        The flusher for the location.
+    """
+    with _FLUSHERS_LOCK:
+        flusher = _FLUSHERS.get(key)
+        if flusher is None:
+            flusher = WriteBehindFlusher(durability_window, max_pending)
+            _FLUSHERS[key] = flusher
+        else:
+            flusher.durability_window = durability_window
+            flusher.max_pending = max_pending
+
+        return flusher
+
+
+@atexit.register
+def stop_all_flushers() -> None:
+    """Write all pending team states of every flusher, called on shutdown."""
+    with _FLUSHERS_LOCK:
+        flushers = list(_FLUSHERS.values())
+        _FLUSHERS.clear()
+
+    for flusher in flushers:
+        flusher.stop()
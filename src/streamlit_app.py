@@ -2,19 +2,80 @@
 
 import re
 import time
+from pathlib import Path
 
 from streamlit_geolocation import streamlit_geolocation
-from geopy.distance import geodesic
 import streamlit as st
 
-from models import State, Game
-from helpers import calculate_bearing, log_ndjson, handle_question
-from constants import STATE_FILE, GAME_FILE, LOGGING_FILE
+from models.game_provider import get_game_provider
+from helpers import (
+    OverflowPolicy,
+    SegmentedLog,
+    get_ndjson_writer,
+    get_ping_filter,
+    get_ping_log,
+    handle_question,
+)
+from constants import (
+    STATE_FILE,
+    GAME_FILE,
+    LOGGING_FILE,
+    LOGGING_FORMAT,
+    LOGGING_MIN_DISTANCE,
+    LOGGING_MIN_INTERVAL,
+    LOGGING_FLUSH_INTERVAL,
+    LOGGING_OVERFLOW,
+    LOGGING_QUEUE_SIZE,
+    LOGGING_MAX_BYTES,
+    LOGGING_MAX_AGE,
+    LOGGING_COMPRESS,
+    LOGGING_RETENTION_SEGMENTS,
+    LOGGING_RETENTION_BYTES,
+)
+
+
+# Get game files, shared by all sessions and only reloaded when they change
+game, state = get_game_provider(game_file=GAME_FILE, state_file=STATE_FILE).get()
+
+
+def log_location(**ping) -> None:
+    """Log the position of a team, unless it did not move or progress since its last ping."""
+    ping_filter = get_ping_filter(
+        LOGGING_FILE, min_distance=LOGGING_MIN_DISTANCE, min_interval=LOGGING_MIN_INTERVAL
+    )
+    if not ping_filter.should_log(
+        ping["team_name"],
+        ping["latitude"],
+        ping["longitude"],
+        ping["solved"],
+        ping["current_goal"],
+        ping["beam_to_location"],
+    ):
+        return
 
+    if LOGGING_FORMAT == "binary":
+        get_ping_log(str(Path(LOGGING_FILE).with_suffix(".pings"))).append(**ping)
+        return
 
-# Get game files
-game = Game.from_yaml_file(file_path=GAME_FILE)
-state = State.from_yaml_file(file_path=STATE_FILE, game=game)
+    get_ndjson_writer(
+        LOGGING_FILE,
+        flush_interval=LOGGING_FLUSH_INTERVAL,
+        max_queue=LOGGING_QUEUE_SIZE,
+        overflow=OverflowPolicy(LOGGING_OVERFLOW),
+        make_segmented_log=make_segmented_log,
+    ).write(**ping)
+
+
+def make_segmented_log() -> SegmentedLog:
+    """Create the segmented location log, once per process by the writer factory."""
+    return SegmentedLog(
+        LOGGING_FILE,
+        max_bytes=LOGGING_MAX_BYTES,
+        max_age=LOGGING_MAX_AGE,
+        compress=LOGGING_COMPRESS,
+        max_segments=LOGGING_RETENTION_SEGMENTS,
+        max_total_bytes=LOGGING_RETENTION_BYTES,
+    )
 
 
 #############
@@ -56,7 +117,7 @@ def scavenger(team_name: str) -> None:
             "longitude": goal_location.longitude,
         }
 
-    distance = None
+    within_radius = False
 
     ## Check if all locations are solved
     if len(team_state.solved) == len(game.locations):
@@ -69,8 +130,7 @@ def scavenger(team_name: str) -> None:
     ## Location information
     if location is not None and location.get("latitude") is not None:
         # Log location
-        log_ndjson(
-            file_path=LOGGING_FILE,
+        log_location(
             team_name=team_name,
             timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
             latitude=location.get("latitude"),
@@ -82,11 +142,11 @@ def scavenger(team_name: str) -> None:
         st.markdown("---")
         st.subheader("Location and direction")
 
-        current_location = (location.get("latitude"), location.get("longitude"))
-        goal_coordinates = (goal_location.latitude, goal_location.longitude)
-
-        distance = geodesic(current_location, goal_coordinates).meters
-        bearing = calculate_bearing(current_location, goal_coordinates)
+        distance_check = game.check_distance(
+            goal_location.name, location.get("latitude"), location.get("longitude")
+        )
+        distance, bearing = distance_check.distance, distance_check.bearing
+        within_radius = distance_check.within_radius
 
         location_column_1, location_column_2 = st.columns([1, 1])
         with location_column_1:
@@ -100,11 +160,13 @@ def scavenger(team_name: str) -> None:
 
     ## Question when in radius
     st.markdown("---")
-    if distance is not None and distance <= game.radius:
+    if within_radius:
         handle_question(
             goal_location=goal_location,
             team_state=team_state,
             game=game,
+            mechanic=state.next_location_mechanic,
+            goal_counter=state.goal_counter,
         )
     else:
         st.subheader("Question")
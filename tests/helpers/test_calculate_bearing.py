@@ -2,7 +2,9 @@
 
 import math
 
-from helpers import calculate_bearing
+import numpy as np
+
+from helpers import calculate_bearing, calculate_bearings
 
 
 def test_calculate_bearing_north():
@@ -47,3 +49,46 @@ def test_calculate_bearing_random():
     expected_bearing = 249.2  # Approximate expected bearing from Enschede to Arnhem
 
     assert math.isclose(calculate_bearing(location_1, location_2), expected_bearing, abs_tol=1.0)
+
+
+def test_calculate_bearings_matches_calculate_bearing():
+    """Test that the vectorized bearings agree with the scalar bearing."""
+    generator = np.random.default_rng(42)
+    latitude_1, latitude_2 = generator.uniform(-89, 89, size=(2, 1_000))
+    longitude_1, longitude_2 = generator.uniform(-180, 180, size=(2, 1_000))
+
+    bearings = calculate_bearings(latitude_1, longitude_1, latitude_2, longitude_2)
+    expected = [
+        calculate_bearing(location_1, location_2)
+        for location_1, location_2 in zip(
+            zip(latitude_1, longitude_1, strict=True),
+            zip(latitude_2, longitude_2, strict=True),
+            strict=True,
+        )
+    ]
+
+    difference = (bearings - np.array(expected) + 180) % 360 - 180
+    assert np.abs(difference).max() < 1e-9
+
+
+def test_calculate_bearings_broadcasts():
+    """Test that a single coordinate is broadcast against an array of coordinates."""
+    bearings = calculate_bearings(0.0, 0.0, [1.0, 0.0, -1.0, 0.0], [0.0, 1.0, 0.0, -1.0])
+    assert np.allclose(bearings, [0.0, 90.0, 180.0, 270.0])
+
+
+def test_calculate_bearings_million_points():
+    """Test that a million bearings are calculated like the scalar bearing."""
+    generator = np.random.default_rng(0)
+    latitudes = generator.uniform(50, 54, size=(2, 1_000_000))
+    longitudes = generator.uniform(3, 7, size=(2, 1_000_000))
+
+    bearings = calculate_bearings(latitudes[0], longitudes[0], latitudes[1], longitudes[1])
+    assert bearings.shape == (1_000_000,)
+    assert ((bearings >= 0) & (bearings < 360)).all()
+
+    for index in generator.integers(0, 1_000_000, size=100).tolist():
+        expected = calculate_bearing(
+            (latitudes[0, index], longitudes[0, index]), (latitudes[1, index], longitudes[1, index])
+        )
+        assert math.isclose(bearings[index], expected, abs_tol=1e-9)
@@ -0,0 +1,50 @@
+"""Tests for the calculate_distances function."""
+
+import numpy as np
+from geopy.distance import geodesic
+
+from helpers import calculate_distances
+
+
+def test_calculate_distances_matches_geodesic():
+    """Test that the haversine distances are within 0.5% of the geodesic distances."""
+    generator = np.random.default_rng(42)
+    latitude_1, latitude_2 = generator.uniform(-80, 80, size=(2, 500))
+    longitude_1, longitude_2 = generator.uniform(-180, 180, size=(2, 500))
+
+    distances = calculate_distances(latitude_1, longitude_1, latitude_2, longitude_2)
+    expected = np.array(
+        [
+            geodesic((lat_1, lon_1), (lat_2, lon_2)).meters
+            for lat_1, lon_1, lat_2, lon_2 in zip(
+                latitude_1, longitude_1, latitude_2, longitude_2, strict=True
+            )
+        ]
+    )
+
+    assert np.all(np.abs(distances - expected) <= 0.005 * expected)
+
+
+def test_calculate_distances_short_distances():
+    """Test distances at the scale of a game, between Enschede and Arnhem."""
+    distance = calculate_distances(52.2215, 6.8937, 51.9851, 5.8987)
+    expected = geodesic((52.2215, 6.8937), (51.9851, 5.8987)).meters
+    assert abs(distance - expected) < 0.005 * expected
+    assert calculate_distances(52.0, 6.0, 52.0, 6.0) == 0.0
+
+
+def test_calculate_distances_million_points():
+    """Test that a million distances are calculated within 0.5% of the geodesic distances."""
+    generator = np.random.default_rng(0)
+    latitudes = generator.uniform(50, 54, size=(2, 1_000_000))
+    longitudes = generator.uniform(3, 7, size=(2, 1_000_000))
+
+    distances = calculate_distances(latitudes[0], longitudes[0], latitudes[1], longitudes[1])
+    assert distances.shape == (1_000_000,)
+    assert (distances >= 0).all()
+
+    for index in generator.integers(0, 1_000_000, size=100).tolist():
+        expected = geodesic(
+            (latitudes[0, index], longitudes[0, index]), (latitudes[1, index], longitudes[1, index])
+        ).meters
+        assert abs(distances[index] - expected) <= 0.005 * expected
@@ -0,0 +1,65 @@
+"""Tests for the calculate_travel_distances function."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import calculate_distances, calculate_travel_distances
+
+
+def make_logs(pings: list[tuple[str, float, float, bool]]) -> pd.DataFrame:
+    """Create a location log from pings of (team, latitude, longitude, beamed)."""
+    return pd.DataFrame(pings, columns=["team_name", "latitude", "longitude", "beam_to_location"])
+
+
+def test_calculate_travel_distances_per_team():
+    """Test that the first ping of a team is not measured against another team."""
+    logs = make_logs(
+        [
+            ("Team A", 52.0, 5.0, False),
+            ("Team B", 53.0, 6.0, False),
+            ("Team A", 52.01, 5.0, False),
+            ("Team B", 53.0, 6.01, False),
+        ]
+    )
+    distances = calculate_travel_distances(logs)
+
+    assert distances.loc["Team A", "distance_traveled"] == pytest.approx(
+        calculate_distances(52.0, 5.0, 52.01, 5.0) / 1000
+    )
+    assert distances.loc["Team B", "distance_traveled"] == pytest.approx(
+        calculate_distances(53.0, 6.0, 53.0, 6.01) / 1000
+    )
+    assert distances["points_clicked"].tolist() == [2, 2]
+
+
+def test_calculate_travel_distances_beamed():
+    """Test that the distance to a beamed ping is counted as beamed."""
+    logs = make_logs(
+        [
+            ("Team A", 52.0, 5.0, False),
+            ("Team A", 52.01, 5.0, True),
+            ("Team A", 52.02, 5.0, False),
+        ]
+    )
+    distances = calculate_travel_distances(logs)
+
+    leg = calculate_distances(52.0, 5.0, 52.01, 5.0) / 1000
+    assert distances.loc["Team A", "distance_beamed"] == pytest.approx(leg)
+    assert distances.loc["Team A", "distance_traveled"] == pytest.approx(leg)
+    assert distances.loc["Team A", "points_clicked"] == 2
+
+
+def test_calculate_travel_distances_missing_coordinates():
+    """Test that pings without coordinates add no distance."""
+    logs = make_logs([("Team A", 52.0, 5.0, False), ("Team A", np.nan, np.nan, False)])
+
+    assert calculate_travel_distances(logs).loc["Team A", "distance_traveled"] == 0
+
+
+def test_calculate_travel_distances_categorical_teams():
+    """Test that categorical team names, as read from a binary ping log, are supported."""
+    logs = make_logs([("Team A", 52.0, 5.0, False), ("Team A", 52.01, 5.0, False)])
+    logs["team_name"] = pd.Categorical(logs["team_name"], categories=["Team A", "Team B"])
+
+    assert calculate_travel_distances(logs).index.tolist() == ["Team A"]
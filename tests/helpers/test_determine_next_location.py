@@ -1,13 +1,15 @@
 """Tests for the determine_next_location function."""
 
+import importlib
 from random import seed
 import tempfile
 
 import pytest
 from unittest.mock import MagicMock
 
-from models import Location, TeamState, Game, AnswerOption, QuestionType
-from helpers.determine_next_location import determine_next_location
+from models import Location, TeamState, Game, AnswerOption, QuestionType, NextLocationMechanic
+from models.goal_counter import GoalCounter
+from helpers.determine_next_location import NEXT_LOCATION_STRATEGIES, determine_next_location
 
 
 def create_location(
@@ -157,3 +159,97 @@ def test_all_locations_unsolved(mock_team_state, mock_game):
         mock_team_state, mock_game, previous_score, current_location
     )
     assert next_location == "Location A"
+
+
+@pytest.fixture
+def game(mock_game) -> Game:
+    """Create a `Game` with the locations of the mocked game."""
+    return Game(file_path="game.yaml", locations=mock_game.locations, radius=100)
+
+
+def test_next_location_by_name_matches_coordinates(mock_team_state, game, monkeypatch):
+    """Test that the precomputed distances give the same locations as calculated distances."""
+    # compute the matrix before geodesic is disabled
+    assert len(game.distances) == 4
+    module = importlib.import_module("helpers.determine_next_location")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Distances should not be calculated.")
+
+    for previous_score in [1, -1, 0]:
+        mock_team_state.solved = {}
+        for _ in range(len(game.locations)):
+            seed(1)
+            expected = determine_next_location(mock_team_state, game, previous_score, (0.0, 0.0))
+            with monkeypatch.context() as patch:
+                patch.setattr(module, "geodesic", fail)
+                seed(1)
+                assert (
+                    determine_next_location(mock_team_state, game, previous_score, "Location A")
+                    == expected
+                )
+            mock_team_state.solved[expected] = 1
+
+
+@pytest.mark.parametrize(
+    ("mechanic", "previous_score", "expected"),
+    [
+        (NextLocationMechanic.NEAREST, -1, ["Location D", "Location B", "Location C"]),
+        (NextLocationMechanic.FURTHEST, 1, ["Location C", "Location B", "Location D"]),
+        (NextLocationMechanic.NEAREST_WHEN_CORRECT, 1, ["Location D", "Location B"]),
+        (NextLocationMechanic.NEAREST_WHEN_CORRECT, -1, ["Location C", "Location B"]),
+        (NextLocationMechanic.FURTHEST_WHEN_CORRECT, 1, ["Location C", "Location B"]),
+        (NextLocationMechanic.FURTHEST_WHEN_CORRECT, -1, ["Location D", "Location B"]),
+    ],
+)
+def test_next_location_mechanics(mock_team_state, game, mechanic, previous_score, expected):
+    """Test that every mechanic walks the locations in its order, skipping solved ones."""
+    mock_team_state.solved = {"Location A": 1}
+    for name in expected:
+        next_location = determine_next_location(
+            mock_team_state, game, previous_score, "Location A", mechanic
+        )
+        assert next_location == name
+        mock_team_state.solved[name] = 1
+
+
+def test_next_location_random_mechanic(mock_team_state, game):
+    """Test that the random mechanic only picks unsolved locations, whatever the score."""
+    mock_team_state.solved = {"Location A": 1, "Location D": 1}
+    for previous_score in [-1, 0, 1]:
+        for _ in range(10):
+            next_location = determine_next_location(
+                mock_team_state, game, previous_score, "Location A", NextLocationMechanic.RANDOM
+            )
+            assert next_location in {"Location B", "Location C"}
+
+
+def test_next_location_least_crowded_mechanic(mock_team_state, game):
+    """Test that the least crowded mechanic spreads teams and records their goals."""
+    goal_counter = GoalCounter(len(game.locations))
+    goal_counter.rebuild({"Team B": 1, "Team C": 2, "Team D": 3})
+    mock_team_state.solved = {"Location A": 1}
+
+    next_location = determine_next_location(
+        mock_team_state,
+        game,
+        1,
+        "Location A",
+        NextLocationMechanic.LEAST_CROWDED,
+        goal_counter,
+    )
+    assert next_location in {"Location B", "Location C", "Location D"}
+    assert sum(goal_counter.counts()) == 4
+    assert goal_counter.count(game.index.ordinal(next_location)) == 2
+
+    # other mechanics keep the counters up to date as well
+    next_location = determine_next_location(
+        mock_team_state, game, 1, "Location A", NextLocationMechanic.NEAREST, goal_counter
+    )
+    assert next_location == "Location D"
+    assert goal_counter.counts() == [0, 1, 1, 2]
+
+
+def test_every_mechanic_has_a_strategy():
+    """Test that the strategy registry covers all mechanics."""
+    assert set(NEXT_LOCATION_STRATEGIES) == set(NextLocationMechanic)
@@ -7,7 +7,15 @@ import tempfile
 import pytest
 import streamlit as st
 
-from models import Location, TeamState, Game, State, QuestionType, AnswerOption
+from models import (
+    Location,
+    TeamState,
+    Game,
+    State,
+    QuestionType,
+    AnswerOption,
+    NextLocationMechanic,
+)
 from helpers.handle_question import (
     handle_answer_submission,
     handle_button_click,
@@ -17,6 +25,9 @@ from helpers.handle_question import (
 )
 
 
+DEFAULT_MECHANIC = NextLocationMechanic.NEAREST_WHEN_CORRECT
+
+
 @pytest.fixture(autouse=True)
 def mock_streamlit():
     """
@@ -178,19 +189,19 @@ def test_handle_answer_submission(mock_team_state, mock_goal_location, mock_game
     with patch("helpers.handle_question.update_team_state") as mock_update_team_state:
         handle_answer_submission("A", options, mock_team_state, mock_goal_location, mock_game)
         mock_update_team_state.assert_called_once_with(
-            mock_team_state, 10, mock_goal_location, mock_game
+            mock_team_state, 10, mock_goal_location, mock_game, DEFAULT_MECHANIC, None
         )
 
     with patch("helpers.handle_question.update_team_state") as mock_update_team_state:
         handle_answer_submission("b", options, mock_team_state, mock_goal_location, mock_game)
         mock_update_team_state.assert_called_once_with(
-            mock_team_state, 5, mock_goal_location, mock_game
+            mock_team_state, 5, mock_goal_location, mock_game, DEFAULT_MECHANIC, None
         )
 
     with patch("helpers.handle_question.update_team_state") as mock_update_team_state:
         handle_answer_submission("hello", options, mock_team_state, mock_goal_location, mock_game)
         mock_update_team_state.assert_called_once_with(
-            mock_team_state, -10, mock_goal_location, mock_game
+            mock_team_state, -10, mock_goal_location, mock_game, DEFAULT_MECHANIC, None
         )
 
 
@@ -217,6 +228,8 @@ def test_handle_button_click(mock_team_state, mock_goal_location, mock_game):
             10,
             mock_goal_location,
             mock_game,
+            DEFAULT_MECHANIC,
+            None,
         )
 
 
@@ -3,11 +3,15 @@
 import os
 import json
 import tempfile
-from unittest.mock import patch, mock_open
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from helpers.log_ndjson import log_ndjson
+from helpers.segmented_log import SegmentedLog
 
 
 def test_log_ndjson_success():
@@ -30,46 +34,181 @@ def test_log_ndjson_success():
     os.remove(file_path)
 
 
-def test_log_ndjson_retry_on_failure():
+@pytest.fixture
+def log_file():
+    """Create a temporary NDJSON file path."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield str(Path(temp_dir) / "log.ndjson")
+
+
+def test_log_ndjson_retry_on_failure(log_file):
     """Test that the log_ndjson function retries on failure."""
     data = {"event": "retry_event", "status": "retry"}
 
     # Simulate the first two write attempts failing, then succeeding
-    with patch("builtins.open", mock_open()) as mocked_open:
-        mocked_open.side_effect = [
-            OSError("File error"),
-            OSError("File error"),
-            mock_open().return_value,
-        ]
+    write = os.write
+    errors = [OSError("File error"), OSError("File error")]
+
+    def fail_twice(file_descriptor: int, content: bytes) -> int:
+        if errors:
+            raise errors.pop()
+        return write(file_descriptor, content)
 
+    with patch("helpers.append_handle.os.write", side_effect=fail_twice) as mocked_write:
         # Call log_ndjson with retry logic
-        log_ndjson("test_path.ndjson", retry=3, **data)
+        log_ndjson(log_file, retry=3, **data)
+
+        # Verify that write was called three times (two failures, one success)
+        assert mocked_write.call_count == 3
+
+    with open(log_file, "r") as file:
+        assert [json.loads(line) for line in file] == [data]
+
+
+def test_log_ndjson_completes_short_writes(log_file):
+    """Test that a short write is completed by writing the rest."""
+    write = os.write
+
+    def write_ten_bytes(file_descriptor: int, content: bytes) -> int:
+        return write(file_descriptor, content[:10])
+
+    with patch("helpers.append_handle.os.write", side_effect=write_ten_bytes):
+        log_ndjson(log_file, retry=1, event="short_write")
+
+    with open(log_file, "r") as file:
+        assert [json.loads(line) for line in file] == [{"event": "short_write"}]
 
-        # Verify that open was called three times (two failures, one success)
-        assert mocked_open.call_count == 3
 
+def test_log_ndjson_removes_partial_write(log_file):
+    """Test that a write failing halfway is removed before it is retried."""
+    log_ndjson(log_file, event="first")
+    write = os.write
+    writes = []
 
-def test_log_ndjson_fails_after_max_retries():
+    def fail_after_ten_bytes(file_descriptor: int, content: bytes) -> int:
+        writes.append(len(content))
+        if len(writes) == 2:
+            raise OSError("No space left on device")
+        return write(file_descriptor, content[:10])
+
+    with patch("helpers.append_handle.os.write", side_effect=fail_after_ten_bytes):
+        with pytest.raises(IOError, match="Failed to log data after 1 attempts"):
+            log_ndjson(log_file, retry=1, event="second")
+
+    with open(log_file, "r") as file:
+        assert [json.loads(line) for line in file] == [{"event": "first"}]
+
+
+def test_log_ndjson_fails_after_max_retries(log_file):
     """Test that the log_ndjson function raises an IOError after max retries."""
     data = {"event": "failure_event", "status": "failure"}
 
     # Simulate all write attempts failing
-    with patch("builtins.open", side_effect=OSError("File error")) as mocked_open:
+    with patch("helpers.append_handle.os.write", side_effect=OSError("File error")) as mocked_write:
         with pytest.raises(IOError, match="Failed to log data after 3 attempts"):
-            log_ndjson("test_path.ndjson", retry=3, **data)
+            log_ndjson(log_file, retry=3, **data)
 
-        # Verify that open was called three times (equal to the retry limit)
-        assert mocked_open.call_count == 3
+        # Verify that write was called three times (equal to the retry limit)
+        assert mocked_write.call_count == 3
 
 
-def test_log_ndjson_no_retry():
+def test_log_ndjson_no_retry(log_file):
     """Test that log_ndjson does not retry if no retries are allowed (retry=1)."""
     data = {"event": "no_retry_event", "status": "no_retry"}
 
     # Simulate a write attempt failure
-    with patch("builtins.open", side_effect=OSError("File error")) as mocked_open:
+    with patch("helpers.append_handle.os.write", side_effect=OSError("File error")) as mocked_write:
         with pytest.raises(IOError, match="Failed to log data after 1 attempts"):
-            log_ndjson("test_path.ndjson", retry=1, **data)
+            log_ndjson(log_file, retry=1, **data)
+
+        # Verify that write was called only once
+        assert mocked_write.call_count == 1
+
+
+def test_log_ndjson_backs_off_without_sleeping(log_file):
+    """Test that calls after a failed call fail at once until the backoff passed."""
+    with patch("helpers.append_handle.os.write", side_effect=OSError("File error")):
+        with pytest.raises(IOError, match="Failed to log data"):
+            log_ndjson(log_file, retry=1, event="failure")
+
+    with patch("helpers.append_handle.os.write") as mocked_write:
+        with pytest.raises(IOError, match="Not logging to"):
+            log_ndjson(log_file, event="backing_off")
+        assert mocked_write.call_count == 0
+
+    with patch("helpers.append_handle.time.monotonic", return_value=time.monotonic() + 1):
+        log_ndjson(log_file, event="recovered")
+
+    with open(log_file, "r") as file:
+        assert [json.loads(line)["event"] for line in file] == ["recovered"]
+
+
+def test_log_ndjson_keeps_file_open(log_file):
+    """Test that the file is opened once and every line is a single write."""
+    with patch("helpers.append_handle.os.open", wraps=os.open) as mocked_open:
+        with patch("helpers.append_handle.os.write", wraps=os.write) as mocked_write:
+            for index in range(3):
+                log_ndjson(log_file, index=index)
+
+    assert mocked_open.call_count == 1
+    assert mocked_write.call_count == 3
+
+
+def test_log_ndjson_reopens_deleted_file(log_file):
+    """Test that a deleted file is created again."""
+    log_ndjson(log_file, index=0)
+    os.remove(log_file)
+
+    with patch("helpers.append_handle.time.monotonic", return_value=time.monotonic() + 2):
+        log_ndjson(log_file, index=1)
+
+    with open(log_file, "r") as file:
+        assert [json.loads(line)["index"] for line in file] == [1]
+
+
+def test_log_ndjson_reopens_rotated_file(log_file):
+    """Test that the file is reopened at once after a rotation in the process."""
+    segmented_log = SegmentedLog(log_file, max_bytes=0, compress=False)
+    log_ndjson(log_file, index=0)
+    segmented_log.rotate()
+    log_ndjson(log_file, index=1)
+
+    assert [record["index"] for record in segmented_log.read()] == [0, 1]
+    with open(log_file, "r") as file:
+        assert [json.loads(line)["index"] for line in file] == [1]
+
+
+def test_log_ndjson_concurrent_lines_do_not_interleave(log_file):
+    """Test that lines of concurrent threads are written whole."""
+
+    def log_lines(thread: int) -> None:
+        for index in range(200):
+            log_ndjson(log_file, thread=thread, index=index, padding="x" * 1000)
+
+    threads = [threading.Thread(target=log_lines, args=(thread,)) for thread in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(log_file, "r") as file:
+        records = [json.loads(line) for line in file]
+    assert len(records) == 800
+
+
+def test_log_ndjson_concurrent_rotations_keep_all_lines(log_file):
+    """Test that no line is written into a segment after it was sealed."""
+    segmented_log = SegmentedLog(log_file, max_bytes=2000)
+
+    def log_lines(thread: int) -> None:
+        for index in range(100):
+            log_ndjson(log_file, segmented_log=segmented_log, thread=thread, index=index)
+
+    threads = [threading.Thread(target=log_lines, args=(thread,)) for thread in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
 
-        # Verify that open was called only once
-        assert mocked_open.call_count == 1
+    assert len(segmented_log.segments()) > 2
+    assert len(list(segmented_log.read())) == 400
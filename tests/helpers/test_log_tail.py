@@ -0,0 +1,152 @@
+"""Tests for the LogTail class."""
+
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from helpers.log_ndjson import log_ndjson
+from helpers.log_tail import LogTail, get_log_tail
+from helpers.segmented_log import SegmentedLog
+
+
+@pytest.fixture
+def log_file():
+    """Create a temporary NDJSON file path."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield str(Path(temp_dir) / "location_log.ndjson")
+
+
+def log_teams(log_file: str, teams: list[str], **kwargs) -> None:
+    """Log a record per team."""
+    for team_name in teams:
+        log_ndjson(log_file, timestamp="2024-11-30 10:00:00", team_name=team_name, **kwargs)
+
+
+def test_read_parses_only_appended_lines(log_file):
+    """Test that a read parses only the lines appended since the previous read."""
+    tail = LogTail(log_file)
+    assert tail.read().empty
+
+    log_teams(log_file, ["Team A", "Team B"])
+    assert tail.read()["team_name"].tolist() == ["Team A", "Team B"]
+    assert tail.n_parsed == 2
+
+    log_teams(log_file, ["Team C"])
+    assert tail.read()["team_name"].tolist() == ["Team A", "Team B", "Team C"]
+    assert tail.n_parsed == 3
+
+    tail.read()
+    assert tail.n_parsed == 3
+
+
+def test_read_waits_for_partial_line(log_file):
+    """Test that a partially written last line is read once it is complete."""
+    tail = LogTail(log_file)
+    line = json.dumps({"team_name": "Team B"})
+    with open(log_file, "w") as file:
+        file.write(json.dumps({"team_name": "Team A"}) + "\n" + line[:5])
+
+    assert tail.read()["team_name"].tolist() == ["Team A"]
+
+    with open(log_file, "a") as file:
+        file.write(line[5:] + "\n")
+
+    assert tail.read()["team_name"].tolist() == ["Team A", "Team B"]
+    assert tail.n_parsed == 2
+
+
+def test_read_after_truncation(log_file):
+    """Test that a truncated file is read again from the start."""
+    tail = LogTail(log_file)
+    log_teams(log_file, ["Team A", "Team B"])
+    tail.read()
+
+    Path(log_file).write_text(json.dumps({"team_name": "Team C"}) + "\n")
+
+    assert tail.read()["team_name"].tolist() == ["Team C"]
+
+
+def test_read_does_not_change_cache(log_file):
+    """Test that a returned frame cannot change the records of the reader."""
+    tail = LogTail(log_file)
+    log_teams(log_file, ["Team A"])
+    frame = tail.read()
+    frame["team_name"] = "Team X"
+    frame = tail.read()
+    with pytest.raises(ValueError, match="read-only"):
+        frame.loc[0, "team_name"] = "Team X"
+
+    assert tail.read()["team_name"].tolist() == ["Team A"]
+
+
+def test_read_keeps_returned_frames(log_file):
+    """Test that reads append without changing the frames returned before."""
+    tail = LogTail(log_file)
+    log_teams(log_file, ["Team A"], latitude=52)
+    first = tail.read()
+
+    for index in range(2000):
+        log_ndjson(log_file, team_name=f"Team {index}", latitude=52.5, accuracy=5)
+    second = tail.read()
+
+    assert first.to_dict("records") == [
+        {"timestamp": "2024-11-30 10:00:00", "team_name": "Team A", "latitude": 52}
+    ]
+    assert len(second) == 2001
+    assert second["latitude"].dtype == "float64"
+    assert second["timestamp"].isna().sum() == 2000
+    assert second["accuracy"].isna().tolist() == [True] + [False] * 2000
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_read_after_rotation(log_file, compress):
+    """Test that rotated records are not parsed again."""
+    tail = LogTail(log_file)
+    segmented_log = SegmentedLog(log_file, max_bytes=0, compress=compress)
+    log_teams(log_file, ["Team A"])
+    tail.read()
+
+    log_teams(log_file, ["Team B"])
+    segmented_log.rotate()
+    log_teams(log_file, ["Team C"])
+
+    assert tail.read()["team_name"].tolist() == ["Team A", "Team B", "Team C"]
+    assert tail.n_parsed == 3
+
+
+def test_read_after_retention(log_file):
+    """Test that segments deleted by retention are dropped."""
+    tail = LogTail(log_file)
+    segmented_log = SegmentedLog(log_file, max_bytes=1, max_segments=1)
+    log_teams(log_file, ["Team A", "Team B"], segmented_log=segmented_log)
+    tail.read()
+
+    log_teams(log_file, ["Team C"], segmented_log=segmented_log)
+
+    assert tail.read()["team_name"].tolist() == ["Team C"]
+
+
+def test_read_only_reads_changed_manifest(log_file):
+    """Test that the segments are listed again only after the manifest changed."""
+    tail = LogTail(log_file)
+    segmented_log = SegmentedLog(log_file, max_bytes=0)
+    log_teams(log_file, ["Team A"])
+    with patch.object(tail.segmented_log, "segments", wraps=tail.segmented_log.segments) as mock:
+        tail.read()
+        log_teams(log_file, ["Team B"])
+        tail.read()
+        assert mock.call_count == 1
+
+        segmented_log.rotate()
+        tail.read()
+        assert mock.call_count == 2
+
+    assert tail.read()["team_name"].tolist() == ["Team A", "Team B"]
+
+
+def test_get_log_tail(log_file):
+    """Test that the reader of a log is shared."""
+    assert get_log_tail(log_file) is get_log_tail(log_file)
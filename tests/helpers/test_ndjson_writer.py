@@ -0,0 +1,192 @@
+"""Tests for the NdjsonWriter class."""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from helpers.ndjson_writer import NdjsonWriter, OverflowPolicy, get_ndjson_writer
+from helpers.segmented_log import SegmentedLog
+
+
+@pytest.fixture
+def log_file():
+    """Create a temporary NDJSON file path."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield str(Path(temp_dir) / "log.ndjson")
+
+
+def read_records(file_path: str) -> list[dict]:
+    """Read all records of an NDJSON file."""
+    with open(file_path, "r") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_write_and_flush(log_file):
+    """Test that records are written in order in batches."""
+    writer = NdjsonWriter(log_file, flush_interval=0.05)
+    with patch.object(writer, "_write_batch", wraps=writer._write_batch) as write_batch:
+        for index in range(500):
+            assert writer.write(index=index, team_name="Team A")
+
+        assert writer.flush(timeout=5)
+        assert write_batch.call_count < 500
+
+    assert read_records(log_file) == [{"index": i, "team_name": "Team A"} for i in range(500)]
+    assert writer.n_written == 500
+    writer.close()
+
+
+def test_flush_interval(log_file):
+    """Test that records are written without a flush once the interval has passed."""
+    writer = NdjsonWriter(log_file, flush_interval=0.01)
+    writer.write(index=0)
+    deadline = time.monotonic() + 5
+    while writer.n_written == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert read_records(log_file) == [{"index": 0}]
+    writer.close()
+
+
+def test_close_writes_queued_records(log_file):
+    """Test that closing the writer writes everything that is queued."""
+    writer = NdjsonWriter(log_file, flush_interval=60)
+    for index in range(10):
+        writer.write(index=index)
+
+    writer.close()
+    assert len(read_records(log_file)) == 10
+    assert writer._handle._file_descriptor is None
+    assert writer.flush()
+
+    with pytest.raises(RuntimeError):
+        writer.write(index=11)
+
+
+def blocked_writer(log_file: str, overflow: OverflowPolicy) -> tuple[NdjsonWriter, threading.Event]:
+    """Create a writer with a queue of two records whose thread waits for an event."""
+    release = threading.Event()
+    writer = NdjsonWriter(log_file, flush_interval=0, max_queue=2, overflow=overflow)
+    write_batch = writer._write_batch
+
+    def wait_and_write(batch):
+        release.wait()
+        write_batch(batch)
+
+    writer._write_batch = wait_and_write
+    writer.write(index=0)
+    deadline = time.monotonic() + 5
+    while not writer._queue.empty() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    return writer, release
+
+
+def test_drop_policy(log_file):
+    """Test that records are dropped instead of blocking when the queue is full."""
+    writer, release = blocked_writer(log_file, OverflowPolicy.DROP)
+    assert writer.write(index=1)
+    assert writer.write(index=2)
+
+    start = time.monotonic()
+    assert not writer.write(index=3)
+    assert time.monotonic() - start < 0.5
+    assert writer.n_dropped == 1
+
+    release.set()
+    writer.close()
+    assert [record["index"] for record in read_records(log_file)] == [0, 1, 2]
+
+
+def test_block_policy(log_file):
+    """Test that the caller waits for room in the queue with the block policy."""
+    writer, release = blocked_writer(log_file, OverflowPolicy.BLOCK)
+    writer.write(index=1)
+    writer.write(index=2)
+
+    done = threading.Event()
+    thread = threading.Thread(target=lambda: done.set() if writer.write(index=3) else None)
+    thread.start()
+    assert not done.wait(0.2)
+
+    release.set()
+    thread.join(timeout=5)
+    assert done.is_set()
+    writer.close()
+    assert [record["index"] for record in read_records(log_file)] == [0, 1, 2, 3]
+
+
+def test_failed_writes_are_retried(log_file):
+    """Test that a failing write is retried on the writer thread and finally dropped."""
+    writer = NdjsonWriter(log_file, flush_interval=0, retry=3)
+    file_descriptor = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+    with patch(
+        "helpers.append_handle.os.open", side_effect=[OSError("File error"), file_descriptor]
+    ):
+        writer.write(index=0)
+        assert writer.flush(timeout=5)
+
+    assert read_records(log_file) == [{"index": 0}]
+
+    with patch("helpers.append_handle.os.write", side_effect=OSError("Disk full")):
+        with patch("time.sleep"):
+            writer.write(index=1)
+            assert writer.flush(timeout=5)
+
+    assert writer.n_dropped == 1
+    writer.close()
+
+
+def test_deleted_file_is_recreated(log_file):
+    """Test that the writer reopens a file that was deleted by another process."""
+    writer = NdjsonWriter(log_file, flush_interval=0.01)
+    with patch("helpers.append_handle.REOPEN_CHECK_INTERVAL", 0):
+        writer.write(index=0)
+        assert writer.flush(timeout=5)
+        Path(log_file).unlink()
+
+        writer.write(index=1)
+        assert writer.flush(timeout=5)
+
+    assert read_records(log_file) == [{"index": 1}]
+    writer.close()
+
+
+def test_rotation_holds_the_file(log_file):
+    """Test that the writer appends to a new file after it rotated the log."""
+    segmented_log = SegmentedLog(log_file, max_bytes=1, compress=False)
+    writer = NdjsonWriter(log_file, flush_interval=0, segmented_log=segmented_log)
+    with patch("helpers.append_handle.os.write", wraps=os.write) as write:
+        for index in range(3):
+            writer.write(index=index)
+            assert writer.flush(timeout=5)
+
+    assert write.call_count == 3
+    assert [record["index"] for record in segmented_log.read()] == [0, 1, 2]
+    assert len(segmented_log.segments()) == 3
+    writer.close()
+
+
+def test_get_ndjson_writer_is_shared(log_file):
+    """Test that every file has a single writer per process."""
+    writer = get_ndjson_writer(log_file, flush_interval=0.1)
+    assert get_ndjson_writer(log_file, flush_interval=0.2) is writer
+    assert writer.flush_interval == 0.2
+    writer.close()
+
+
+def test_get_ndjson_writer_creates_segmented_log_once(log_file):
+    """Test that the segmented log is only created with the writer."""
+    make_segmented_log = MagicMock(return_value=SegmentedLog(log_file))
+    writer = get_ndjson_writer(log_file, make_segmented_log=make_segmented_log)
+    assert get_ndjson_writer(log_file, make_segmented_log=make_segmented_log) is writer
+
+    assert make_segmented_log.call_count == 1
+    assert writer.segmented_log is make_segmented_log.return_value
+    writer.close()
@@ -0,0 +1,55 @@
+"""Tests for the PingFilter class."""
+
+import pytest
+
+from helpers.ping_filter import PingFilter, get_ping_filter
+
+# about 11 meters north
+STEP = 0.0001
+
+
+def test_suppress_standing_still():
+    """Test that pings of a team that did not move are suppressed until the interval passed."""
+    ping_filter = PingFilter(min_distance=10, min_interval=60)
+    assert ping_filter.should_log("Team A", 50.0, 7.0, now=0)
+    assert not ping_filter.should_log("Team A", 50.0, 7.0, now=10)
+    assert not ping_filter.should_log("Team A", 50.0 + STEP / 2, 7.0, now=20)
+    assert ping_filter.should_log("Team A", 50.0, 7.0, now=60)
+    assert (ping_filter.n_logged, ping_filter.n_suppressed) == (2, 2)
+
+
+def test_log_movement():
+    """Test that a ping is logged once the team moved far enough from its last logged ping."""
+    ping_filter = PingFilter(min_distance=10, min_interval=60)
+    assert ping_filter.should_log("Team A", 50.0, 7.0, now=0)
+    assert not ping_filter.should_log("Team A", 50.0 + STEP / 2, 7.0, now=1)
+    assert ping_filter.should_log("Team A", 50.0 + STEP, 7.0, now=2)
+
+    # other teams have their own last ping
+    assert ping_filter.should_log("Team B", 50.0 + STEP, 7.0, now=2)
+
+
+def test_log_progress():
+    """Test that a ping is logged whenever the progress of the team changes."""
+    ping_filter = PingFilter(min_distance=10, min_interval=60)
+    assert ping_filter.should_log("Team A", 50.0, 7.0, 0, "Ladders", now=0)
+    assert not ping_filter.should_log("Team A", 50.0, 7.0, 0, "Ladders", now=1)
+    assert ping_filter.should_log("Team A", 50.0, 7.0, 1, "Three doors", now=2)
+
+    ping_filter.forget("Team A")
+    assert ping_filter.should_log("Team A", 50.0, 7.0, 1, "Three doors", now=3)
+
+
+@pytest.mark.parametrize("min_interval", [0, -1])
+def test_no_interval_logs_everything(min_interval):
+    """Test that every ping is logged without an interval."""
+    ping_filter = PingFilter(min_distance=10, min_interval=min_interval)
+    assert all(ping_filter.should_log("Team A", 50.0, 7.0, now=now) for now in range(5))
+    assert ping_filter.n_suppressed == 0
+
+
+def test_get_ping_filter_is_shared():
+    """Test that every log has a single filter per process."""
+    ping_filter = get_ping_filter("test-ping-filter", min_distance=5)
+    assert get_ping_filter("test-ping-filter", min_distance=20) is ping_filter
+    assert ping_filter.min_distance == 20
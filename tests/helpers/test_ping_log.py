@@ -0,0 +1,160 @@
+"""Tests for the PingLog class."""
+
+import json
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from helpers.ping_log import HEADER_SIZE, PING_DTYPE, PingLog, convert_ndjson_to_pings
+
+
+@pytest.fixture
+def folder():
+    """Create a temporary folder."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+def ping(team_name: str, minute: int, goal: str = "Ladders", **kwargs) -> dict:
+    """Create a ping like the ones in the NDJSON location log."""
+    return {
+        "team_name": team_name,
+        "timestamp": f"2024-11-30 10:{minute:02d}:00",
+        "latitude": 50.36 + minute / 1000,
+        "longitude": 7.6,
+        "solved": minute // 10,
+        "current_goal": goal,
+        "beam_to_location": False,
+    } | kwargs
+
+
+def test_append_and_map(folder):
+    """Test that pings are appended and mapped with dictionary encoded names."""
+    ping_log = PingLog(str(folder / "location_log.pings"))
+    ping_log.append(**ping("Team A", 0))
+    ping_log.append_many(
+        [ping("Team B", 1, "Three doors"), ping("Team A", 2, beam_to_location=True)]
+    )
+
+    assert len(ping_log) == 3
+    assert ping_log.teams == ("Team A", "Team B")
+    assert ping_log.goals == ("Ladders", "Three doors")
+    assert (folder / "location_log.pings").stat().st_size == HEADER_SIZE + 3 * PING_DTYPE.itemsize
+
+    pings = ping_log.pings()
+    assert isinstance(pings, np.memmap)
+    assert pings["team"].tolist() == [0, 1, 0]
+    assert pings["timestamp"][1] == np.datetime64("2024-11-30T10:01:00")
+
+    logs = ping_log.to_dataframe()
+    assert logs["team_name"].tolist() == ["Team A", "Team B", "Team A"]
+    assert logs["current_goal"].tolist() == ["Ladders", "Three doors", "Ladders"]
+    assert logs["beam_to_location"].tolist() == [False, False, True]
+    assert logs["latitude"].tolist() == pytest.approx([50.36, 50.361, 50.362])
+
+    # a second reader sees the same names
+    assert PingLog(str(folder / "location_log.pings")).to_dataframe().equals(logs)
+
+
+def test_empty_log(folder):
+    """Test that a missing log has no pings."""
+    ping_log = PingLog(str(folder / "location_log.pings"))
+    assert len(ping_log) == 0
+    assert ping_log.to_dataframe().empty
+
+
+def test_partial_writes_are_ignored(folder):
+    """Test that partially written pings and names are ignored and overwritten."""
+    ping_log = PingLog(str(folder / "location_log.pings"))
+    ping_log.append(**ping("Team A", 0))
+    with open(ping_log.file_path, "ab") as file:
+        file.write(b"\x01\x02\x03")
+    with open(ping_log.names_path, "a") as file:
+        file.write('["team", "Team')
+
+    reader = PingLog(str(ping_log.file_path))
+    assert len(reader) == 1
+    assert reader.teams == ("Team A",)
+
+    reader.append(**ping("Team B", 1))
+    assert reader.to_dataframe()["team_name"].tolist() == ["Team A", "Team B"]
+
+
+def test_append_after_deleting_the_log(folder):
+    """Test that the names are written again after the log and its names were deleted."""
+    ping_log = PingLog(str(folder / "location_log.pings"))
+    admin_log = PingLog(str(folder / "location_log.pings"))
+    ping_log.append_many([ping("Team A", 0), ping("Team B", 1, "Three doors")])
+    assert admin_log.to_dataframe()["team_name"].tolist() == ["Team A", "Team B"]
+
+    ping_log.file_path.unlink()
+    ping_log.names_path.unlink()
+    assert admin_log.to_dataframe().empty
+
+    ping_log.append(**ping("Team C", 2))
+
+    assert b"\x00" not in ping_log.names_path.read_bytes()
+    for reader in (admin_log, PingLog(str(folder / "location_log.pings"))):
+        logs = reader.to_dataframe()
+        assert logs["team_name"].tolist() == ["Team C"]
+        assert logs["current_goal"].tolist() == ["Ladders"]
+
+
+def test_failed_append_forgets_new_names(folder):
+    """Test that names of a failed append are not used by the next one."""
+    ping_log = PingLog(str(folder / "location_log.pings"))
+    ping_log.append(**ping("Team A", 0))
+
+    with pytest.raises(ValueError):
+        ping_log.append_many([ping("Team B", 1, "Three doors"), ping("Team C", 2, timestamp="")])
+    with patch("builtins.open", side_effect=OSError("No space left on device")):
+        with pytest.raises(OSError):
+            ping_log.append(**ping("Team D", 3))
+
+    ping_log.append(**ping("Team E", 4, "Ladders"))
+
+    assert ping_log.teams == ("Team A", "Team E")
+    logs = PingLog(str(ping_log.file_path)).to_dataframe()
+    assert logs["team_name"].tolist() == ["Team A", "Team E"]
+    assert logs["current_goal"].tolist() == ["Ladders", "Ladders"]
+
+
+def test_wrong_header(folder):
+    """Test that a file of another format is rejected."""
+    file_path = folder / "location_log.pings"
+    file_path.write_bytes(b"{" * (HEADER_SIZE + PING_DTYPE.itemsize))
+    with pytest.raises(ValueError):
+        PingLog(str(file_path)).pings()
+
+
+def test_convert_ndjson_to_pings(folder):
+    """Test that an NDJSON location log is converted, skipping incomplete records."""
+    ndjson_path = folder / "location_log.ndjson"
+    records = [ping(f"Team {index % 3}", index % 60) for index in range(100)]
+    with open(ndjson_path, "w") as file:
+        for record in records + [{"team_name": "Team X", "latitude": None}]:
+            file.write(json.dumps(record) + "\n")
+
+    assert convert_ndjson_to_pings(str(ndjson_path), str(folder / "location_log.pings"), 30) == 100
+
+    logs = PingLog(str(folder / "location_log.pings")).to_dataframe()
+    assert logs["team_name"].tolist() == [record["team_name"] for record in records]
+    assert logs["timestamp"].iloc[-1] == datetime(2024, 11, 30, 10, 39)
+
+
+def test_map_million_pings(folder):
+    """Test that a million pings are mapped without parsing."""
+    ping_log = PingLog(str(folder / "location_log.pings"))
+    ping_log.append(**ping("Team A", 0))
+    with open(ping_log.file_path, "ab") as file:
+        file.write(np.zeros(1_000_000, dtype=PING_DTYPE).tobytes())
+
+    start = time.perf_counter()
+    logs = ping_log.to_dataframe()
+    assert len(logs) == 1_000_001
+    assert time.perf_counter() - start < 1
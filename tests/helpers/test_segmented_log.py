@@ -0,0 +1,144 @@
+"""Tests for the SegmentedLog class."""
+
+import gzip
+import json
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from helpers.log_ndjson import log_ndjson
+from helpers.ndjson_writer import NdjsonWriter
+from helpers.segmented_log import SegmentedLog
+
+
+@pytest.fixture
+def log_file():
+    """Create a temporary NDJSON file path."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield str(Path(temp_dir) / "location_log.ndjson")
+
+
+def log_hour(log_file: str, hour: int, teams: list[str], **kwargs) -> None:
+    """Log a record per team at the given hour."""
+    for team_name in teams:
+        log_ndjson(
+            log_file, timestamp=f"2024-11-30 {hour:02d}:00:00", team_name=team_name, **kwargs
+        )
+
+
+def test_rotate_by_size(log_file):
+    """Test that the log is rotated into compressed segments with a manifest."""
+    segmented_log = SegmentedLog(log_file, max_bytes=1)
+    log_hour(log_file, 10, ["Team A", "Team B"], segmented_log=segmented_log)
+    log_hour(log_file, 11, ["Team C"])
+
+    directory = Path(log_file).parent
+    assert sorted(path.name for path in directory.iterdir()) == [
+        "location_log.000001.ndjson.gz",
+        "location_log.000002.ndjson.gz",
+        "location_log.ndjson",
+        "location_log.ndjson.manifest.json",
+    ]
+    with gzip.open(directory / "location_log.000001.ndjson.gz", "rt") as file:
+        assert json.loads(file.readline())["team_name"] == "Team A"
+
+    manifest = json.loads((directory / "location_log.ndjson.manifest.json").read_text())
+    assert [segment["teams"] for segment in manifest["segments"]] == [["Team A"], ["Team B"]]
+    assert manifest["segments"][0]["start"] == "2024-11-30 10:00:00"
+    assert manifest["segments"][0]["records"] == 1
+
+    assert [record["team_name"] for record in segmented_log.read()] == [
+        "Team A",
+        "Team B",
+        "Team C",
+    ]
+
+
+def test_rotate_by_age(log_file):
+    """Test that the log is rotated once the active file is old enough."""
+    segmented_log = SegmentedLog(log_file, max_bytes=0, max_age=60, compress=False)
+    log_hour(log_file, 10, ["Team A"], segmented_log=segmented_log)
+    assert segmented_log.rotate() is not None
+    assert not segmented_log.should_rotate()
+
+    log_hour(log_file, 11, ["Team A"], segmented_log=segmented_log)
+    assert not Path(log_file).with_name("location_log.000002.ndjson").exists()
+
+    with patch("time.time", return_value=segmented_log._active_since + 61):
+        assert segmented_log.should_rotate()
+        segmented_log.rotate()
+
+    assert Path(log_file).with_name("location_log.000002.ndjson").exists()
+    assert segmented_log.rotate() is None
+
+
+def test_read_skips_segments_outside_the_window(log_file):
+    """Test that readers only open the segments overlapping their window."""
+    segmented_log = SegmentedLog(log_file, max_bytes=0)
+    for hour in [9, 10, 11]:
+        log_hour(log_file, hour, ["Team A", "Team B"])
+        segmented_log.rotate()
+    log_hour(log_file, 12, ["Team A"])
+
+    segments = segmented_log.segments(start="2024-11-30 10:30:00", end="2024-11-30 11:30:00")
+    assert [path.name for path in segments] == [
+        "location_log.000003.ndjson.gz",
+        "location_log.ndjson",
+    ]
+
+    records = list(
+        segmented_log.read(start=datetime(2024, 11, 30, 10), end=datetime(2024, 11, 30, 11))
+    )
+    assert [record["timestamp"][11:13] for record in records] == ["10", "10", "11", "11"]
+
+
+def test_retention(log_file):
+    """Test that the oldest segments are deleted beyond the retention settings."""
+    segmented_log = SegmentedLog(log_file, max_bytes=0, compress=False, max_segments=2)
+    for hour in range(5):
+        log_hour(log_file, hour, ["Team A"])
+        segmented_log.rotate()
+
+    assert [path.name for path in segmented_log.segments()] == [
+        "location_log.000004.ndjson",
+        "location_log.000005.ndjson",
+    ]
+
+    segment_bytes = Path(segmented_log.segments()[0]).stat().st_size
+    segmented_log.max_segments = 0
+    segmented_log.max_total_bytes = segment_bytes
+    log_hour(log_file, 6, ["Team A"])
+    segmented_log.rotate()
+    assert [path.name for path in segmented_log.segments()] == ["location_log.000006.ndjson"]
+
+
+def test_segments_missing_from_the_manifest(log_file):
+    """Test that segments left by an interrupted rotation are found and not overwritten."""
+    segmented_log = SegmentedLog(log_file, max_bytes=0, compress=False)
+    log_hour(log_file, 10, ["Team A"])
+    segmented_log.rotate()
+    Path(segmented_log.manifest_path).unlink()
+
+    log_hour(log_file, 11, ["Team B"])
+    entry = segmented_log.rotate()
+    assert entry["sequence"] == 2
+    assert [record["team_name"] for record in SegmentedLog(log_file).read()] == [
+        "Team A",
+        "Team B",
+    ]
+
+
+def test_writer_rotates(log_file):
+    """Test that the background writer rotates the log between batches."""
+    writer = NdjsonWriter(log_file, flush_interval=0, segmented_log=SegmentedLog(log_file, 200))
+    for index in range(50):
+        writer.write(timestamp="2024-11-30 10:00:00", team_name=f"Team {index}")
+        writer.flush()
+
+    writer.close()
+    segmented_log = SegmentedLog(log_file)
+    assert len(segmented_log.segments()) > 2
+    assert len(list(segmented_log.read())) == 50
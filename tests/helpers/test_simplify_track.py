@@ -0,0 +1,111 @@
+"""Tests for the track simplification."""
+
+import numpy as np
+import pandas as pd
+
+from helpers.simplify_track import TrackSimplifier, get_track_simplifier, simplify_track
+
+# about 1.1 meters of latitude
+METER = 1e-5
+
+
+def zigzag(n_points: int, amplitude: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    """Create a track walking north, stepping sideways on every other position."""
+    latitudes = 52.0 + np.arange(n_points) * 10 * METER
+    longitudes = 5.0 + (np.arange(n_points) % 2) * amplitude * METER
+    return latitudes, longitudes
+
+
+def make_logs(tracks: dict[str, tuple[np.ndarray, np.ndarray]]) -> pd.DataFrame:
+    """Create a location log from tracks, interleaving the teams."""
+    rows = [
+        {"team_name": team_name, "latitude": latitude, "longitude": longitude, "step": step}
+        for team_name, (latitudes, longitudes) in tracks.items()
+        for step, (latitude, longitude) in enumerate(zip(latitudes, longitudes, strict=True))
+    ]
+    return pd.DataFrame(rows).sort_values("step", kind="stable").reset_index(drop=True)
+
+
+def test_simplify_track_straight_line():
+    """Test that a straight track is simplified to its ends."""
+    latitudes, longitudes = zigzag(100)
+
+    assert simplify_track(latitudes, longitudes, 1.0).tolist() == [0, 99]
+
+
+def test_simplify_track_keeps_corners():
+    """Test that a position further than the tolerance from the track is kept."""
+    latitudes = np.array([52.0, 52.0 + 100 * METER, 52.0 + 100 * METER])
+    longitudes = np.array([5.0, 5.0, 5.0 + 100 * METER])
+
+    assert simplify_track(latitudes, longitudes, 5.0).tolist() == [0, 1, 2]
+    assert simplify_track(latitudes, longitudes, 100.0).tolist() == [0, 2]
+
+
+def test_simplify_track_tolerance():
+    """Test that the dropped positions are within the tolerance."""
+    latitudes, longitudes = zigzag(50, amplitude=3)
+
+    assert len(simplify_track(latitudes, longitudes, 10.0)) == 2
+    assert len(simplify_track(latitudes, longitudes, 1.0)) == 50
+
+
+def test_simplify_track_short():
+    """Test that tracks of up to two positions are kept."""
+    assert simplify_track(np.array([]), np.array([]), 5.0).tolist() == []
+    assert simplify_track(np.array([52.0]), np.array([5.0]), 5.0).tolist() == [0]
+
+
+def test_simplifier_returns_rows_per_team():
+    """Test that the simplified rows of every team are returned in order."""
+    logs = make_logs({"Team A": zigzag(100), "Team B": zigzag(100, amplitude=20)})
+    simplified = TrackSimplifier(tolerance=5.0).simplify(logs)
+
+    assert simplified.index.is_monotonic_increasing
+    assert len(simplified[simplified["team_name"] == "Team A"]) == 2
+    assert len(simplified[simplified["team_name"] == "Team B"]) == 100
+
+
+def test_simplifier_incremental():
+    """Test that new pings extend the cached track up to the last ping."""
+    latitudes, longitudes = zigzag(1000, amplitude=20)
+    latitudes[500:] = latitudes[500]
+    simplifier = TrackSimplifier(tolerance=5.0, max_vertices=0, chunk_size=100)
+    for n_points in range(50, 1001, 50):
+        logs = make_logs({"Team A": (latitudes[:n_points], longitudes[:n_points])})
+        simplified = simplifier.simplify(logs)
+
+    assert simplified["step"].iloc[-1] == 999
+    assert len(simplified) < 600
+
+
+def test_simplifier_bounds_vertices():
+    """Test that the tracks are coarsened to the maximum number of vertices."""
+    logs = make_logs({team_name: zigzag(1000, amplitude=20) for team_name in "ABC"})
+    simplified = TrackSimplifier(tolerance=1.0, max_vertices=100).simplify(logs)
+
+    assert len(simplified) <= 100
+    assert set(simplified["team_name"]) == set("ABC")
+
+
+def test_simplifier_resets_shrunk_track():
+    """Test that a track with fewer pings than before is simplified from the start."""
+    simplifier = TrackSimplifier(tolerance=5.0)
+    simplifier.simplify(make_logs({"Team A": zigzag(100, amplitude=20)}))
+    simplified = simplifier.simplify(make_logs({"Team A": zigzag(10)}))
+
+    assert simplified["step"].tolist() == [0, 9]
+
+
+def test_simplifier_empty():
+    """Test that an empty log is returned as is."""
+    assert TrackSimplifier().simplify(pd.DataFrame()).empty
+
+
+def test_get_track_simplifier():
+    """Test that the simplifier is shared and replaced for a new tolerance."""
+    simplifier = get_track_simplifier("test_key", 5.0, 100)
+
+    assert get_track_simplifier("test_key", 5.0, 200) is simplifier
+    assert simplifier.max_vertices == 200
+    assert get_track_simplifier("test_key", 10.0, 200) is not simplifier
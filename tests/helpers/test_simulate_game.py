@@ -0,0 +1,155 @@
+"""Tests for the simulate_game function."""
+
+import tempfile
+import time
+
+import numpy as np
+import pytest
+
+from models import AnswerOption, Game, Location, NextLocationMechanic, QuestionType, TeamState
+from helpers.determine_next_location import determine_next_location
+from helpers.simulate_game import VECTORIZED_STRATEGIES, simulate_game
+
+
+@pytest.fixture
+def game() -> Game:
+    """Create a game with locations on a small irregular grid."""
+    rng = np.random.default_rng(3)
+    return Game(
+        file_path="game.yaml",
+        radius=25,
+        locations=[
+            Location(
+                name=f"Location {index}",
+                latitude=52.0 + rng.uniform(0, 0.03),
+                longitude=6.0 + rng.uniform(0, 0.05),
+                question_type=QuestionType.MultipleChoice,
+                question="A test location.",
+                image="test_image.png",
+                answer=[AnswerOption(option="Option A", score=10)],
+            )
+            for index in range(9)
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "mechanic",
+    [
+        NextLocationMechanic.NEAREST,
+        NextLocationMechanic.FURTHEST,
+        NextLocationMechanic.NEAREST_WHEN_CORRECT,
+        NextLocationMechanic.FURTHEST_WHEN_CORRECT,
+    ],
+)
+def test_vectorized_strategies_match_determine_next_location(game, mechanic):
+    """Test that the vectorized strategies pick the same locations as the game."""
+    rng = np.random.default_rng(1)
+    n_teams, n_locations = 200, len(game.locations)
+    goals = rng.integers(n_locations, size=n_teams)
+    unsolved = rng.random((n_teams, n_locations)) < 0.5
+    unsolved[np.arange(n_teams), rng.integers(n_locations, size=n_teams)] = True
+    scores = rng.choice([-1, 1], size=n_teams)
+
+    strategy = VECTORIZED_STRATEGIES[mechanic]
+    next_goals = strategy(game.distances.distances[goals], unsolved, scores, goals, rng)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for team in range(n_teams):
+            team_state = TeamState(
+                name=f"Team {team}",
+                goal_location_name=game.index.names[goals[team]],
+                solved={
+                    name: 1
+                    for name, is_unsolved in zip(game.index.names, unsolved[team], strict=True)
+                    if not is_unsolved
+                },
+                file_path=f"{temp_dir}/team_state.yaml",
+            )
+            expected = determine_next_location(
+                team_state, game, scores[team], game.index.names[goals[team]], mechanic
+            )
+            assert game.index.names[next_goals[team]] == expected
+
+
+def test_every_mechanic_has_a_vectorized_strategy():
+    """Test that the vectorized strategies cover all mechanics."""
+    assert set(VECTORIZED_STRATEGIES) == set(NextLocationMechanic)
+
+
+def test_random_and_least_crowded_only_pick_unsolved(game):
+    """Test that the random strategies pick unsolved locations and least crowded spreads teams."""
+    rng = np.random.default_rng(2)
+    n_teams, n_locations = 900, len(game.locations)
+    goals = np.zeros(n_teams, dtype=int)
+    unsolved = np.ones((n_teams, n_locations), dtype=bool)
+    unsolved[:, 0] = False
+    scores = np.zeros(n_teams, dtype=int)
+    distances = game.distances.distances[goals]
+
+    for mechanic in VECTORIZED_STRATEGIES:
+        next_goals = VECTORIZED_STRATEGIES[mechanic](distances, unsolved, scores, goals, rng)
+        assert unsolved[np.arange(n_teams), next_goals].all()
+
+    next_goals = VECTORIZED_STRATEGIES[NextLocationMechanic.LEAST_CROWDED](
+        distances, unsolved, scores, goals, rng
+    )
+    counts = np.bincount(next_goals, minlength=n_locations)[1:]
+    assert counts.max() - counts.min() <= 2 * n_teams / 256
+
+
+def test_simulate_game(game):
+    """Test that every team visits every location once and the results add up."""
+    result = simulate_game(
+        game, n_teams=500, walking_speed=1.0, answer_time=60, start_spread=0, seed=1
+    )
+    assert result.distances.shape == result.durations.shape == (500,)
+    assert result.arrivals.shape == (500, len(game.locations))
+    assert np.isfinite(result.arrivals).all()
+    assert (result.durations > result.distances).all()
+    assert result.congestion.shape == (len(game.locations),)
+    assert result.congestion.max() <= 500
+    assert result.radius == game.radius
+
+    summary = result.summary()
+    assert summary["distance_p5_km"] <= summary["distance_p50_km"] <= summary["distance_p95_km"]
+
+    # reproducible with a seed, and a larger radius shortens the walks
+    repeated = simulate_game(
+        game, n_teams=500, walking_speed=1.0, answer_time=60, start_spread=0, seed=1
+    )
+    np.testing.assert_array_equal(result.distances, repeated.distances)
+    wider = simulate_game(game, n_teams=500, radius=200, seed=1)
+    assert wider.distances.mean() < result.distances.mean()
+
+
+def test_simulate_game_mechanics(game):
+    """Test that nearest routes are shorter than furthest routes."""
+    nearest = simulate_game(game, NextLocationMechanic.NEAREST, n_teams=200, seed=1)
+    furthest = simulate_game(game, NextLocationMechanic.FURTHEST, n_teams=200, seed=1)
+    assert nearest.distances.max() < furthest.distances.min()
+
+
+def test_simulate_game_processes(game):
+    """Test that the teams are split over processes."""
+    result = simulate_game(game, n_teams=101, processes=2, seed=1)
+    assert result.distances.shape == (101,)
+    assert np.isfinite(result.arrivals).all()
+
+
+def test_simulate_game_probabilities(game):
+    """Test that invalid answer probabilities are rejected."""
+    with pytest.raises(ValueError):
+        simulate_game(game, n_teams=10, p_correct=0.8, p_dont_know=0.3)
+
+    with pytest.raises(ValueError):
+        simulate_game(game, n_teams=10, p_correct=[0.5, 1.5] + [0.5] * 7)
+
+    simulate_game(game, n_teams=10, p_correct=[1.0] * 9, p_dont_know=0.0)
+
+
+def test_simulate_game_performance(game):
+    """Test that 100k teams are simulated within seconds."""
+    start = time.perf_counter()
+    simulate_game(game, n_teams=100_000, processes=1, seed=1)
+    assert time.perf_counter() - start < 5
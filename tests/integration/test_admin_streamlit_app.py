@@ -9,6 +9,7 @@ import pytest
 from streamlit.testing.v1 import AppTest
 
 from models import Game
+from helpers.ping_log import PingLog
 import constants
 
 
@@ -140,6 +141,27 @@ def test_admin_streamlit_statistics_tab():
     assert at.subheader[-1].value == "Summary statistics"
 
 
+def test_admin_streamlit_app_binary_pings(monkeypatch):
+    """Test that the statistics are shown from a binary ping log."""
+    monkeypatch.setattr(constants, "LOGGING_FORMAT", "binary")
+    ping_log = PingLog(str(Path(constants.LOGGING_FILE).with_suffix(".pings")))
+    for index, team_name in enumerate(["Dennis", "Johanna", "Dennis"]):
+        ping_log.append(
+            team_name=team_name,
+            timestamp=f"2024-11-19 15:3{index}:45",
+            latitude=50.359 + index / 1000,
+            longitude=7.6,
+            solved=0,
+            current_goal="Weighing Coins",
+            beam_to_location=index == 1,
+        )
+
+    at = AppTest.from_file(STREAMLIT_APP_FILE)
+    at.run()
+    assert not at.exception
+    assert at.subheader[-1].value == "Summary statistics"
+
+
 def test_admin_streamlit_questions_tab(game):
     """Test if streamlit app starts."""
     at = AppTest.from_file(STREAMLIT_APP_FILE)
@@ -8,6 +8,7 @@ from geopy.distance import geodesic
 from streamlit.testing.v1 import AppTest
 
 from models import State, Game, QuestionType
+from helpers.ndjson_writer import close_all_writers
 import constants
 
 
@@ -24,6 +25,7 @@ def temporary_state_folder():
         constants.STATE_FILE = f"{temporary_folder}/state.yaml"
         constants.LOGGING_FILE = f"{temporary_folder}/logging.ndjson"
         yield
+        close_all_writers()
 
     constants.STATE_FILE = previous_state_file
     constants.LOGGING_FILE = previous_log_file
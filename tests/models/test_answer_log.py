@@ -0,0 +1,138 @@
+"""Tests for the AnswerLogStore."""
+
+import json
+import tempfile
+from pathlib import Path
+from typing import Generator
+
+import pytest
+import yaml
+
+from models.answer_log import AnswerLogStore
+
+
+@pytest.fixture
+def temp_dir() -> Generator[Path, None, None]:
+    """Create a temporary folder for testing."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+@pytest.fixture
+def log_path(temp_dir) -> str:
+    """Return the path of an answer log."""
+    return str(temp_dir / "state.answers.ndjson")
+
+
+def read_events(log_path: str) -> list[dict]:
+    """Read all events of a log."""
+    with open(log_path) as file:
+        return [json.loads(line) for line in file]
+
+
+def test_save_appends_answer_events(log_path):
+    """Test that a save appends an event with only the new answers and their option."""
+    store = AnswerLogStore(log_path)
+    assert store.save_team(name="TeamA", goal_location_name="Park", solved={}) is None
+    assert (
+        store.save_team(
+            name="TeamA",
+            goal_location_name="Hotel",
+            solved={"Park": 10},
+            version=1,
+            options={"Park": "A"},
+        )
+        is None
+    )
+
+    events = read_events(log_path)
+    assert len(events) == 2
+    assert events[1]["a"] == [["Park", 10, "A"]]
+
+    assert store.load_team("TeamA") == {
+        "name": "TeamA",
+        "goal_location_name": "Hotel",
+        "version": 2,
+        "solved": {"Park": 10},
+    }
+    history = store.history("TeamA")
+    assert [(answer["location_name"], answer["option"]) for answer in history] == [("Park", "A")]
+
+
+def test_save_team_with_outdated_version(log_path):
+    """Test that a save with an outdated version returns the stored team."""
+    store = AnswerLogStore(log_path)
+    store.save_team(name="TeamA", goal_location_name="Park", solved={})
+
+    current = store.save_team(name="TeamA", goal_location_name="Hotel", solved={}, version=0)
+    assert current is not None
+    assert current["goal_location_name"] == "Park"
+    assert len(read_events(log_path)) == 1
+
+
+def test_first_answer_wins(log_path):
+    """Test that a location answered again keeps its first score."""
+    store = AnswerLogStore(log_path)
+    store.save_team(name="TeamA", goal_location_name="Park", solved={"Park": 10})
+    store.save_team(name="TeamA", goal_location_name="Park", solved={"Park": -10}, version=1)
+
+    assert store.load_team("TeamA")["solved"] == {"Park": 10}
+
+
+def test_other_processes_see_appended_events(log_path):
+    """Test that a second store on the same log picks up the appended events."""
+    store = AnswerLogStore(log_path)
+    other_store = AnswerLogStore(log_path)
+
+    store.save_team(name="TeamA", goal_location_name="Park", solved={})
+    assert other_store.team_exists("TeamA")
+
+    other_store.delete_team("TeamA")
+    assert not store.team_exists("TeamA")
+    assert store.count_teams() == 0
+
+
+def test_snapshot_replays_only_the_tail(log_path):
+    """Test that a new store starts from the snapshot and replays the later events."""
+    store = AnswerLogStore(log_path, snapshot_interval=3)
+    for version in range(4):
+        store.save_team(
+            name="TeamA",
+            goal_location_name="Park",
+            solved={f"Location {version}": version},
+            version=version,
+        )
+
+    assert store.snapshot_path.exists()
+
+    new_store = AnswerLogStore(log_path)
+    assert new_store._events_since_snapshot == 1
+    assert new_store.load_teams() == store.load_teams()
+    assert len(new_store.history("TeamA")) == 4
+
+
+def test_deleted_log_starts_empty(log_path):
+    """Test that a deleted log and its snapshot leave no teams behind."""
+    store = AnswerLogStore(log_path, snapshot_interval=1)
+    store.save_team(name="TeamA", goal_location_name="Park", solved={})
+
+    Path(log_path).unlink()
+    store.snapshot_path.unlink()
+    assert store.count_teams() == 0
+
+    store.save_team(name="TeamB", goal_location_name="Park", solved={})
+    assert set(store.load_teams()) == {"TeamB"}
+
+
+def test_migrate_from_yaml(temp_dir, log_path):
+    """Test that the YAML team states are imported into the log once."""
+    team_state_path = temp_dir / "team_states"
+    team_state_path.mkdir()
+    with open(team_state_path / "TeamA.yaml", "w") as file:
+        yaml.dump({"name": "TeamA", "goal_location_name": "Park", "solved": {"Hotel": 5}}, file)
+
+    store = AnswerLogStore(log_path)
+    assert store.migrate_from_yaml(team_state_path) == 1
+    assert store.migrate_from_yaml(team_state_path) == 0
+    assert store.load_team("TeamA")["solved"] == {"Hotel": 5}
+    assert AnswerLogStore(log_path).migrate_from_yaml(team_state_path) == 0
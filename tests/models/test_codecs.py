@@ -0,0 +1,100 @@
+"""Tests for the state file codecs."""
+
+import tempfile
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from models import State, StateCodec
+from models.codecs import (
+    CODECS,
+    BinaryCodec,
+    JsonCodec,
+    YamlCodec,
+    codec_for_path,
+    dump_file,
+    load_file,
+)
+
+DATA = {
+    "name": "TeamA",
+    "goal_location_name": "Three doors",
+    "solved": {"Ladders": 1, "Two kids": -1},
+}
+
+
+@pytest.fixture
+def temp_dir() -> Generator[Path, None, None]:
+    """Create a temporary folder for testing."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+@pytest.mark.parametrize("codec", CODECS.values())
+def test_codec_round_trip(codec):
+    """Test that every codec returns the data it serialized."""
+    assert codec.loads(codec.dumps(DATA)) == DATA
+
+
+def test_codec_for_path():
+    """Test that the codec is detected from the file suffix."""
+    assert isinstance(codec_for_path("team.yaml"), YamlCodec)
+    assert isinstance(codec_for_path("team.yml"), YamlCodec)
+    assert isinstance(codec_for_path("team.json"), JsonCodec)
+    assert isinstance(codec_for_path("team.bin"), BinaryCodec)
+    assert isinstance(codec_for_path("team"), YamlCodec)
+
+
+def test_dump_file_permissions(temp_dir):
+    """Test that a dumped file gets the permissions of a file created by `open`."""
+    file_path = temp_dir / "team.yaml"
+    (temp_dir / "other.yaml").touch()
+    with patch("models.codecs.os.fsync") as fsync:
+        dump_file(DATA, file_path)
+
+    assert fsync.called
+    assert file_path.stat().st_mode & 0o777 == (temp_dir / "other.yaml").stat().st_mode & 0o777
+    assert load_file(file_path) == DATA
+
+
+def test_binary_codec_rejects_other_content():
+    """Test that the binary codec refuses content without its header."""
+    with pytest.raises(ValueError, match="not in the binary state format"):
+        BinaryCodec().loads(b"name: TeamA\n")
+
+
+@pytest.mark.parametrize("codec", list(StateCodec))
+def test_state_writes_team_states_with_configured_codec(temp_dir, codec):
+    """Test that new team states use the configured codec and can be read back."""
+    game = MagicMock()
+    game.locations = [MagicMock()]
+    game.locations[0].name = "Location A"
+
+    state = State(file_path=str(temp_dir / "state.yaml"), game=game, team_state_codec=codec)
+    state.get_or_create_team_state("TeamA")
+
+    team_state_file = temp_dir / "team_states" / f"TeamA{CODECS[codec].suffix}"
+    assert team_state_file.exists()
+    assert load_file(team_state_file)["name"] == "TeamA"
+    assert state.team_exists("TeamA")
+    assert state.n_active_teams == 1
+    assert state.get_teams_as_dict()["TeamA"].goal_location_name == "Location A"
+
+
+def test_state_reads_existing_yaml_team_states_with_other_codec(temp_dir):
+    """Test that switching codecs keeps existing team states readable."""
+    game = MagicMock()
+    game.locations = [MagicMock()]
+    game.locations[0].name = "Location A"
+
+    state = State(file_path=str(temp_dir / "state.yaml"), game=game)
+    state.get_or_create_team_state("TeamA")
+
+    json_state = State(
+        file_path=str(temp_dir / "state.yaml"), game=game, team_state_codec=StateCodec.JSON
+    )
+    assert json_state.team_exists("TeamA")
+    assert json_state.get_or_create_team_state("TeamA").name == "TeamA"
+    assert not (temp_dir / "team_states" / "TeamA.json").exists()
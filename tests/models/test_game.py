@@ -1,9 +1,11 @@
 """Tests for the Game model."""
 
-import tempfile
+import numpy as np
 import yaml
 import pytest
+from geopy.distance import geodesic
 from models import Game, Location, AnswerOption, QuestionType
+from models.distance_matrix import DistanceMatrix
 from constants import GAME_FILE
 
 
@@ -90,12 +92,13 @@ def test_game_creation(game):
     assert game.locations[1].name == "Location B"
 
 
-def test_game_from_yaml_file(sample_game_data):
+def test_game_from_yaml_file(sample_game_data, tmp_path):
     """Test loading game data from a YAML file."""
-    with tempfile.NamedTemporaryFile(suffix=".yaml", mode="t+w") as temp_file:
-        yaml.dump(sample_game_data, temp_file)
-        file_path = temp_file.name
-        game = Game.from_yaml_file(file_path)
+    file_path = tmp_path / "game.yaml"
+    file_path.write_text(yaml.dump(sample_game_data))
+    game = Game.from_yaml_file(str(file_path))
+
+    assert list(tmp_path.iterdir()) == [file_path]
 
     assert len(game.locations) == 2
     assert game.radius == 100
@@ -124,3 +127,78 @@ def test_game_yaml_file_not_found():
     """Test that attempting to load from a non-existent file raises a FileNotFoundError."""
     with pytest.raises(FileNotFoundError):
         Game.from_yaml_file("non_existent_file.yaml")
+
+
+def test_game_rejects_duplicate_location_names(sample_game_data):
+    """Test that a game with two locations of the same name is rejected."""
+    sample_game_data["locations"][1]["name"] = "Location A"
+    with pytest.raises(ValueError, match="Duplicate location names in the game: Location A."):
+        Game(file_path="game.yaml", **sample_game_data)
+
+
+def test_game_location_index(game):
+    """Test the name and ordinal index of the locations."""
+    assert len(game.index) == 2
+    assert "Location B" in game.index
+    assert "Location C" not in game.index
+    assert game.index.ordinal("Location B") == 1
+    assert game.index[1] is game.locations[1]
+    assert game.index.location("Location A") is game.locations[0]
+    assert game.index.latitudes.tolist() == [0.0, 1.0]
+    assert game.index.coordinates.shape == (2, 2)
+    assert game.index.mask(["Location B", "Unknown"]).tolist() == [False, True]
+
+    with pytest.raises(ValueError, match="Location 'Location C' not found in the game."):
+        game.index.ordinal("Location C")
+
+
+def test_game_distances_are_cached_next_to_the_game_file(sample_game_data, tmp_path, monkeypatch):
+    """Test that the distance matrix is written on load and reused by the next load."""
+    file_path = str(tmp_path / "game.yaml")
+    with open(file_path, "w") as file:
+        yaml.dump(sample_game_data, file)
+
+    game = Game.from_yaml_file(file_path, cache_distances=True)
+    assert (tmp_path / "game.distances.npz").exists()
+    assert game.distances.distances[0, 1] == pytest.approx(156_899.568, abs=1)
+    assert game.distances.neighbors[1].tolist() == [1, 0]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The cached distances should be used.")
+
+    monkeypatch.setattr("models.distance_matrix.DistanceMatrix.compute", fail)
+    other_game = Game.from_yaml_file(file_path, cache_distances=True)
+    assert other_game.distances.distances.tolist() == game.distances.distances.tolist()
+
+
+def test_distance_matrix_matches_geodesic():
+    """Test that the computed distances are geodesic, also for antipodal locations."""
+    rng = np.random.default_rng(0)
+    latitudes = np.concatenate([[0.0, 0.5, 52.0], rng.uniform(-89, 89, 20)])
+    longitudes = np.concatenate([[0.0, 179.7, 5.0], rng.uniform(-180, 180, 20)])
+    matrix = DistanceMatrix.compute(latitudes, longitudes)
+
+    for i, j in [(0, 1), (1, 2), (0, 2), *rng.integers(0, len(latitudes), (50, 2)).tolist()]:
+        expected = geodesic((latitudes[i], longitudes[i]), (latitudes[j], longitudes[j])).meters
+        assert matrix.distances[i, j] == pytest.approx(expected, rel=1e-6, abs=1e-3)
+        assert matrix.distances[j, i] == matrix.distances[i, j]
+
+
+def test_game_spatial_queries(game):
+    """Test the radius and nearest queries of a game."""
+    within = game.locations_within(0.0, 0.0, 100)
+    assert [(location.name, distance) for location, distance in within] == [("Location A", 0.0)]
+
+    nearest = game.nearest_locations(0.5, 0.5, k=2, exclude=["Location A"])
+    assert [location.name for location, _ in nearest] == ["Location B"]
+
+
+def test_game_check_distance(game):
+    """Test the tiered distance check against the radius of a game."""
+    inside = game.check_distance("Location A", 0.0005, 0.0)
+    assert inside.within_radius
+    assert round(inside.bearing) == 180
+
+    outside = game.check_distance("Location B", 0.0, 0.0)
+    assert not outside.within_radius
+    assert not outside.exact
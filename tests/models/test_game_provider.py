@@ -0,0 +1,78 @@
+"""Tests for the GameProvider."""
+
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from constants import GAME_FILE
+from models.game_provider import GameProvider, get_game_provider
+
+
+@pytest.fixture
+def files() -> Generator[tuple[str, str], None, None]:
+    """Copy the game file into a temporary folder and return the game and state file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        game_file = shutil.copy(GAME_FILE, Path(temp_dir) / "game.yaml")
+        yield str(game_file), f"{temp_dir}/state.yaml"
+
+
+def test_get_loads_once(files):
+    """Test that repeated calls share the same objects without reloading."""
+    provider = GameProvider(*files)
+    game, state = provider.get()
+
+    assert provider.get() == (game, state)
+    assert provider.get()[0] is game
+    assert provider.n_loads == 1
+    assert Path(files[1]).exists()
+
+
+def test_get_reloads_changed_files(files):
+    """Test that a changed state file reloads the state and a changed game file both."""
+    game_file, state_file = files
+    provider = GameProvider(game_file, state_file)
+    game, state = provider.get()
+
+    other_state = provider.get()[1].model_copy()
+    other_state._file_path = state_file
+    other_state.button_beam_to_location_visible = True
+    other_state.save()
+
+    new_game, new_state = provider.get()
+    assert new_game is game
+    assert new_state is not state
+    assert new_state.button_beam_to_location_visible
+
+    with open(game_file, "a") as file:
+        file.write("\n")
+
+    assert provider.get()[0] is not game
+    assert provider.n_loads == 3
+
+
+def test_get_is_thread_safe(files):
+    """Test that concurrent callers share a single load."""
+    provider = GameProvider(*files)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(provider.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert provider.n_loads == 1
+    assert all(result[0] is results[0][0] for result in results)
+
+
+def test_get_game_provider_is_shared(files):
+    """Test that the provider of the same files is shared within the process."""
+    assert get_game_provider(*files) is get_game_provider(*files)
+    provider = get_game_provider(*files)
+    provider.invalidate()
+    provider.get()
+    assert provider.n_loads == 1
@@ -0,0 +1,90 @@
+"""Tests for the GoalCounter class."""
+
+import threading
+
+import pytest
+
+from models.goal_counter import GoalCounter, get_goal_counter
+
+
+def test_set_goal_moves_teams():
+    """Test that setting a goal moves the team from its previous goal."""
+    goal_counter = GoalCounter(3)
+    goal_counter.set_goal("Team A", 0)
+    goal_counter.set_goal("Team B", 0)
+    goal_counter.set_goal("Team A", 2)
+    assert goal_counter.counts() == [1, 0, 1]
+
+    goal_counter.set_goal("Team A", 2)
+    goal_counter.set_goal("Team B", None)
+    goal_counter.set_goal("Team C", None)
+    assert goal_counter.counts() == [0, 0, 1]
+
+
+def test_least_crowded():
+    """Test that the least crowded eligible location is found."""
+    goal_counter = GoalCounter(4)
+    goal_counter.rebuild({"Team A": 0, "Team B": 1, "Team C": 1, "Team D": 3})
+    assert goal_counter.least_crowded(lambda ordinal: True) == 2
+    assert goal_counter.least_crowded(lambda ordinal: ordinal != 2) in {0, 3}
+    assert goal_counter.least_crowded(lambda ordinal: ordinal == 1) == 1
+
+    with pytest.raises(IndexError):
+        goal_counter.least_crowded(lambda ordinal: False)
+
+    # skipped locations are still found afterwards
+    assert goal_counter.least_crowded(lambda ordinal: True) == 2
+
+
+def test_assign_spreads_teams():
+    """Test that assigning the least crowded location spreads teams evenly."""
+    goal_counter = GoalCounter(5)
+    for team in range(23):
+        goal_counter.assign(
+            f"Team {team}", lambda: goal_counter.least_crowded(lambda ordinal: True)
+        )
+
+    assert sorted(goal_counter.counts()) == [4, 4, 5, 5, 5]
+
+
+def test_heap_stays_bounded():
+    """Test that outdated heap entries are dropped when teams keep moving."""
+    goal_counter = GoalCounter(3)
+    for step in range(1000):
+        goal_counter.set_goal(f"Team {step % 7}", step % 3)
+
+    assert len(goal_counter._heap) <= 4 * 3 + 64
+    assert sum(goal_counter.counts()) == 7
+    assert goal_counter.least_crowded(lambda ordinal: True) == goal_counter.counts().index(
+        min(goal_counter.counts())
+    )
+
+
+def test_concurrent_assign():
+    """Test that concurrent sessions keep the counters consistent."""
+    goal_counter = GoalCounter(8)
+
+    def play(thread: int) -> None:
+        for step in range(200):
+            goal_counter.assign(
+                f"Team {thread}-{step % 5}",
+                lambda: goal_counter.least_crowded(lambda ordinal: True),
+            )
+
+    threads = [threading.Thread(target=play, args=(thread,)) for thread in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    counts = goal_counter.counts()
+    assert sum(counts) == 40
+    assert counts == [list(goal_counter._goals.values()).count(ordinal) for ordinal in range(8)]
+
+
+def test_get_goal_counter_is_shared():
+    """Test that the goal counter of a location is created once and filled from the goals."""
+    goal_counter = get_goal_counter("test-shared", 2, lambda: {"Team A": 1})
+    assert goal_counter.counts() == [0, 1]
+    assert get_goal_counter("test-shared", 2, lambda: {}) is goal_counter
+    assert get_goal_counter("test-shared", 3, lambda: {}) is not goal_counter
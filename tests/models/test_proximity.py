@@ -0,0 +1,64 @@
+"""Tests for the tiered distance checks."""
+
+import math
+
+import numpy as np
+from geopy.distance import geodesic
+
+from helpers import calculate_bearing
+from models.proximity import (
+    PLANAR_ABSOLUTE_ERROR,
+    PLANAR_RELATIVE_ERROR,
+    ProximityIndex,
+    planar_distance_and_bearing,
+)
+
+
+def random_positions(generator, latitude, longitude, max_distance, n):
+    """Create random positions around a location, up to a maximum distance."""
+    for _ in range(n):
+        destination = geodesic(meters=generator.uniform(0, max_distance)).destination(
+            (latitude, longitude), generator.uniform(0, 360)
+        )
+        yield destination.latitude, destination.longitude
+
+
+def test_planar_estimate_is_within_the_error_bound():
+    """Test that the planar distance stays within its error bound of the geodesic."""
+    generator = np.random.default_rng(3)
+    for latitude in [0.0, 52.2, -45.0, 70.0, 85.0]:
+        longitude = generator.uniform(-180, 180)
+        for position in random_positions(generator, latitude, longitude, 50_000, 200):
+            estimate, bearing = planar_distance_and_bearing(*position, latitude, longitude)
+            exact = geodesic(position, (latitude, longitude)).meters
+
+            assert abs(estimate - exact) <= PLANAR_RELATIVE_ERROR * exact + PLANAR_ABSOLUTE_ERROR
+            if 100 < exact < 5_000:
+                expected_bearing = calculate_bearing(position, (latitude, longitude))
+                assert abs((bearing - expected_bearing + 180) % 360 - 180) < 1
+
+
+def test_radius_decision_matches_geodesic():
+    """Test that positions around the radius are decided exactly like the geodesic."""
+    generator = np.random.default_rng(5)
+    latitudes = np.array([52.2215, 0.0, -33.9, 89.5, 10.0])
+    longitudes = np.array([6.8937, 179.9999, 18.4, 0.0, -60.0])
+    proximity = ProximityIndex(latitudes, longitudes, radius=100)
+
+    for ordinal, (latitude, longitude) in enumerate(zip(latitudes, longitudes, strict=True)):
+        for position in random_positions(generator, latitude, longitude, 300, 300):
+            check = proximity.check(ordinal, *position)
+            assert check.within_radius == (geodesic(position, (latitude, longitude)).meters <= 100)
+
+
+def test_far_positions_skip_the_geodesic():
+    """Test that positions far from the location never calculate the geodesic."""
+    proximity = ProximityIndex(np.array([52.2215]), np.array([6.8937]), radius=100)
+
+    check = proximity.check(0, 51.9851, 5.8987)
+    assert not check.within_radius
+    assert not check.exact
+    assert math.isclose(check.distance, 73_075, rel_tol=0.005)
+
+    assert proximity.check(0, 52.2215, 6.8937).within_radius
+    assert proximity.n_exact == 0
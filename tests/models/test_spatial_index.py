@@ -0,0 +1,62 @@
+"""Tests for the SpatialIndex."""
+
+import numpy as np
+import pytest
+
+from helpers import calculate_distances
+from models.spatial_index import SpatialIndex
+
+
+@pytest.fixture
+def coordinates() -> tuple[np.ndarray, np.ndarray]:
+    """Create random coordinates in and around a city."""
+    generator = np.random.default_rng(7)
+    return generator.uniform(52.0, 52.4, 2_000), generator.uniform(6.6, 7.2, 2_000)
+
+
+def test_within_matches_brute_force(coordinates):
+    """Test that the radius query finds exactly the locations of a full scan."""
+    latitudes, longitudes = coordinates
+    index = SpatialIndex(latitudes, longitudes)
+
+    for radius in [0, 250, 1_000, 5_000]:
+        ordinals, distances = index.within(52.2, 6.9, radius)
+        brute_force = calculate_distances(52.2, 6.9, latitudes, longitudes)
+
+        assert set(ordinals.tolist()) == set(np.flatnonzero(brute_force <= radius).tolist())
+        assert np.allclose(distances, brute_force[ordinals])
+        assert np.all(np.diff(distances) >= 0)
+
+
+def test_nearest_matches_brute_force(coordinates):
+    """Test that the nearest query finds the same locations as sorting all distances."""
+    latitudes, longitudes = coordinates
+    index = SpatialIndex(latitudes, longitudes)
+    brute_force = calculate_distances(52.1, 7.0, latitudes, longitudes)
+
+    ordinals, distances = index.nearest(52.1, 7.0, k=10)
+    assert ordinals.tolist() == np.argsort(brute_force, kind="stable")[:10].tolist()
+    assert np.allclose(distances, np.sort(brute_force)[:10])
+
+    mask = np.ones(len(latitudes), dtype=bool)
+    mask[ordinals[:5]] = False
+    masked_ordinals, _ = index.nearest(52.1, 7.0, k=5, mask=mask)
+    assert masked_ordinals.tolist() == ordinals[5:].tolist()
+
+
+def test_queries_across_the_antimeridian():
+    """Test that locations on both sides of the antimeridian are close to each other."""
+    index = SpatialIndex(np.array([0.0, 0.0, 0.0]), np.array([179.999, -179.999, 0.0]))
+
+    ordinals, distances = index.within(0.0, 180.0, 1_000)
+    assert sorted(ordinals.tolist()) == [0, 1]
+    assert np.all(distances < 200)
+
+
+def test_empty_index():
+    """Test that queries on an index without locations return nothing."""
+    index = SpatialIndex(np.array([]), np.array([]))
+
+    assert len(index) == 0
+    assert index.within(0.0, 0.0, 1_000)[0].tolist() == []
+    assert index.nearest(0.0, 0.0, k=3)[0].tolist() == []
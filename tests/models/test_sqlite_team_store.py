@@ -0,0 +1,103 @@
+"""Tests for the SQLiteTeamStore."""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Generator
+
+import pytest
+import yaml
+
+from models.sqlite_team_store import SQLiteTeamStore
+
+
+@pytest.fixture
+def temp_dir() -> Generator[Path, None, None]:
+    """Create a temporary folder for testing."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+@pytest.fixture
+def store(temp_dir) -> SQLiteTeamStore:
+    """Create an empty store."""
+    return SQLiteTeamStore(str(temp_dir / "state.sqlite3"))
+
+
+def test_store_uses_wal_mode(store):
+    """Test that the database is opened in WAL mode."""
+    with sqlite3.connect(store.path) as connection:
+        (journal_mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+
+    assert journal_mode == "wal"
+
+
+def test_save_and_load_team(store):
+    """Test that a saved team can be loaded again."""
+    assert not store.team_exists("TeamA")
+    assert store.load_team("TeamA") is None
+
+    assert store.save_team(name="TeamA", goal_location_name="Location A", solved={}) is None
+    assert store.team_exists("TeamA")
+    assert store.load_team("TeamA") == {
+        "name": "TeamA",
+        "goal_location_name": "Location A",
+        "version": 1,
+        "solved": {},
+    }
+
+    store.save_team(
+        name="TeamA",
+        goal_location_name="Location B",
+        solved={"Location A": 1, "Location C": -1},
+        version=1,
+    )
+    assert store.load_team("TeamA") == {
+        "name": "TeamA",
+        "goal_location_name": "Location B",
+        "version": 2,
+        "solved": {"Location A": 1, "Location C": -1},
+    }
+    assert store.count_teams() == 1
+
+
+def test_save_team_with_outdated_version(store):
+    """Test that a save with an outdated version is refused and returns the stored team."""
+    store.save_team(name="TeamA", goal_location_name="Location A", solved={})
+    store.save_team(name="TeamA", goal_location_name="Location B", solved={"A": 1}, version=1)
+
+    current = store.save_team(name="TeamA", goal_location_name="Location C", solved={}, version=1)
+
+    assert current["goal_location_name"] == "Location B"
+    assert current["version"] == 2
+    assert store.load_team("TeamA")["goal_location_name"] == "Location B"
+
+
+def test_load_teams(store):
+    """Test that all teams are loaded with their solved locations."""
+    store.save_team(name="TeamA", goal_location_name="Location A", solved={"Location B": 2})
+    store.save_team(name="TeamB", goal_location_name="Location B", solved={})
+
+    teams = store.load_teams()
+
+    assert store.count_teams() == 2
+    assert teams["TeamA"]["solved"] == {"Location B": 2}
+    assert teams["TeamB"]["solved"] == {}
+    assert teams["TeamB"]["goal_location_name"] == "Location B"
+
+
+def test_migrate_from_yaml_runs_once(store, temp_dir):
+    """Test that YAML team states are imported only once."""
+    team_state_path = temp_dir / "team_states"
+    team_state_path.mkdir()
+    with open(team_state_path / "TeamA.yaml", "w") as file:
+        yaml.dump({"name": "TeamA", "goal_location_name": "Location A", "solved": {"X": 1}}, file)
+
+    assert store.migrate_from_yaml(team_state_path) == 1
+    assert store.load_team("TeamA")["solved"] == {"X": 1}
+
+    with open(team_state_path / "TeamB.yaml", "w") as file:
+        yaml.dump({"name": "TeamB", "goal_location_name": "Location A", "solved": {}}, file)
+
+    assert store.migrate_from_yaml(team_state_path) == 0
+    assert not store.team_exists("TeamB")
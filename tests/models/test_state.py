@@ -8,7 +8,17 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from models import State, TeamState, Location, AnswerOption, QuestionType, NextLocationMechanic
+from models import (
+    Game,
+    State,
+    TeamState,
+    Location,
+    AnswerOption,
+    QuestionType,
+    NextLocationMechanic,
+    StorageMode,
+)
+from models.team_state_cache import TEAM_STATE_CACHE
 
 
 @pytest.fixture
@@ -89,3 +99,138 @@ def test_state_from_yaml(state_file, game):
 
     new_state = State.from_yaml_file(state_file, game)
     assert new_state.button_beam_to_location_visible
+
+
+def test_sqlite_storage_mode(state_file, game):
+    """Test that teams are stored in SQLite when the storage mode is `sqlite`."""
+    state = State(file_path=state_file, game=game, storage_mode=StorageMode.SQLITE)
+    assert state.n_active_teams == 0
+    assert not state.team_exists("TeamA")
+
+    team_state = state.get_or_create_team_state("TeamA")
+    assert state.team_exists("TeamA")
+    assert state.n_active_teams == 1
+    assert not (state._team_state_path / "TeamA.yaml").exists()
+
+    team_state.solved["Test Location"] = 10
+    team_state.save()
+
+    teams = state.get_teams_as_dict()
+    assert teams["TeamA"].solved == {"Test Location": 10}
+    assert state.get_or_create_team_state("TeamA").solved == {"Test Location": 10}
+
+    reloaded_state = State.from_yaml_file(state_file, game)
+    assert reloaded_state.storage_mode == StorageMode.SQLITE
+    assert reloaded_state.team_exists("TeamA")
+
+
+def test_sqlite_storage_mode_migrates_yaml_teams(state_file, game):
+    """Test that existing YAML team states are migrated into the database."""
+    state = State(file_path=state_file, game=game)
+    state.get_or_create_team_state("TeamA")
+
+    sqlite_state = State(file_path=state_file, game=game, storage_mode=StorageMode.SQLITE)
+    assert sqlite_state.team_exists("TeamA")
+    assert sqlite_state.n_active_teams == 1
+
+
+def test_n_active_teams_does_not_scan_folder(state_file, game, monkeypatch):
+    """Test that counting teams uses the team index instead of the `team_states` folder."""
+    state = State(file_path=state_file, game=game)
+    state.get_or_create_team_state("TeamA")
+    state.get_or_create_team_state("TeamB")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The team_states folder should not be scanned.")
+
+    monkeypatch.setattr(Path, "iterdir", fail)
+    monkeypatch.setattr(Path, "glob", fail)
+
+    assert state.n_active_teams == 2
+    assert set(state.get_teams_as_dict()) == {"TeamA", "TeamB"}
+
+
+def test_delete_teams(state_file, game):
+    """Test that deleted teams disappear from the state and the team index."""
+    state = State(file_path=state_file, game=game)
+    state.get_or_create_team_state("TeamA")
+    state.get_or_create_team_state("TeamB")
+    state.get_or_create_team_state("TeamC")
+
+    state.delete_team("TeamA")
+    assert not state.team_exists("TeamA")
+    assert state.n_active_teams == 2
+
+    state.delete_all_teams()
+    assert state.n_active_teams == 0
+    assert list(state._team_state_path.glob("Team*")) == []
+
+
+def test_get_teams_as_dict_only_parses_changed_files(state_file, game):
+    """Test that repeated calls only parse team state files that changed."""
+    state = State(file_path=state_file, game=game)
+    for team_name in ["TeamA", "TeamB", "TeamC"]:
+        state.get_or_create_team_state(team_name)
+
+    state.get_teams_as_dict()
+    misses = TEAM_STATE_CACHE.misses
+
+    teams = state.get_teams_as_dict()
+    assert TEAM_STATE_CACHE.misses == misses
+    assert teams["TeamA"] is state.get_teams_as_dict()["TeamA"]
+
+    team_state = state.get_or_create_team_state("TeamB")
+    team_state.solved["Test Location"] = 10
+    team_state.save()
+    (state._team_state_path / "TeamC.yaml").unlink()
+
+    teams = state.get_teams_as_dict()
+    assert TEAM_STATE_CACHE.misses == misses + 1
+    assert teams["TeamB"].solved == {"Test Location": 10}
+    assert set(teams) == {"TeamA", "TeamB"}
+    assert state.n_active_teams == 2
+
+
+def test_event_log_storage_mode(state_file, game):
+    """Test that answers are appended to the answer log when the storage mode is `event_log`."""
+    state = State(file_path=state_file, game=game, storage_mode=StorageMode.EVENT_LOG)
+    team_state = state.get_or_create_team_state("TeamA")
+    assert state.team_exists("TeamA")
+    assert state.n_active_teams == 1
+
+    team_state.record_answer("Test Location", 10, option="Option A")
+    team_state.save()
+
+    assert state.get_teams_as_dict()["TeamA"].solved == {"Test Location": 10}
+    history = state._store.history("TeamA")
+    assert [answer["option"] for answer in history] == ["Option A"]
+    assert Path(state_file).with_suffix(".answers.ndjson").exists()
+
+
+def test_least_crowded_mechanic_spreads_new_teams(state_file):
+    """Test that new teams start at the location with the fewest teams heading to it."""
+    locations = [
+        Location(
+            name=f"Location {index}",
+            latitude=index,
+            longitude=0.0,
+            question_type=QuestionType.MultipleChoice,
+            question="A test location.",
+            answer=[AnswerOption(option="Option A", score=10)],
+            image="test_image.png",
+        )
+        for index in range(3)
+    ]
+    game = Game(file_path="game.yaml", locations=locations, radius=100)
+    state = State(
+        file_path=state_file,
+        game=game,
+        next_location_mechanic=NextLocationMechanic.LEAST_CROWDED,
+    )
+    for team in range(6):
+        state.get_or_create_team_state(f"Team {team}")
+
+    assert state.goal_counter.counts() == [2, 2, 2]
+
+    state.delete_team("Team 0")
+    assert sum(state.goal_counter.counts()) == 5
@@ -0,0 +1,96 @@
+"""Tests for the TeamIndex."""
+
+import os
+import shutil
+import tempfile
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from models.team_index import TeamIndex
+
+
+@pytest.fixture
+def team_state_path() -> Generator[Path, None, None]:
+    """Create a temporary `team_states` folder for testing."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        team_state_path = Path(temp_dir) / "team_states"
+        team_state_path.mkdir()
+        yield team_state_path
+
+
+def test_index_is_built_from_existing_files(team_state_path):
+    """Test that a missing manifest is rebuilt from the team state files."""
+    (team_state_path / "TeamA.yaml").touch()
+    (team_state_path / "TeamB.json").touch()
+    (team_state_path / ".TeamA.yaml.lock").touch()
+
+    team_index = TeamIndex(team_state_path)
+
+    assert team_index.manifest_path.exists()
+    assert len(team_index) == 2
+    assert team_index.get("TeamB") == team_state_path / "TeamB.json"
+    assert "TeamC" not in team_index
+
+
+def test_index_add_and_remove(team_state_path):
+    """Test that registering and removing teams updates the index."""
+    team_index = TeamIndex(team_state_path)
+
+    team_index.add(team_state_path / "TeamA.yaml")
+    team_index.add(team_state_path / "TeamB.yaml")
+    team_index.add(team_state_path / "TeamA.yaml")
+    assert len(team_index) == 2
+
+    team_index.remove("TeamA")
+    assert "TeamA" not in team_index
+    assert list(team_index.files()) == ["TeamB"]
+
+
+def test_index_sees_changes_of_other_processes(team_state_path):
+    """Test that two indexes on the same folder pick up each other's changes."""
+    index_1 = TeamIndex(team_state_path)
+    index_2 = TeamIndex(team_state_path)
+
+    index_1.add(team_state_path / "TeamA.yaml")
+    assert "TeamA" in index_2
+
+    index_2.remove("TeamA")
+    assert "TeamA" not in index_1
+
+
+def test_index_ignores_partial_lines(team_state_path):
+    """Test that a line that is still being written is not applied."""
+    team_index = TeamIndex(team_state_path)
+
+    with open(team_index.manifest_path, "a") as file:
+        file.write("+TeamA.ya")
+    assert "TeamA" not in team_index
+
+    with open(team_index.manifest_path, "a") as file:
+        file.write("ml\n")
+    assert team_index.get("TeamA") == team_state_path / "TeamA.yaml"
+
+
+def test_index_rebuilds_when_manifest_is_deleted(team_state_path):
+    """Test that the index is rebuilt when the manifest disappears."""
+    team_index = TeamIndex(team_state_path)
+    team_index.add(team_state_path / "TeamA.yaml")
+
+    os.remove(team_index.manifest_path)
+    (team_state_path / "TeamB.yaml").touch()
+
+    assert list(team_index.files()) == ["TeamB"]
+
+
+def test_index_rebuilds_when_folder_is_recreated(team_state_path):
+    """Test that a manifest of an earlier `team_states` folder is considered stale."""
+    team_index = TeamIndex(team_state_path)
+    team_index.add(team_state_path / "TeamA.yaml")
+
+    shutil.rmtree(team_state_path)
+    team_state_path.mkdir()
+    (team_state_path / "TeamB.yaml").touch()
+
+    assert list(team_index.files()) == ["TeamB"]
@@ -1,8 +1,13 @@
 """Tests for the State model."""
 
 import tempfile
+import threading
 from pathlib import Path
+from unittest.mock import patch
 
+import pytest
+
+from models.codecs import load_file
 from models.team_state import TeamState
 
 
@@ -28,3 +33,78 @@ def test_team_state_creation():
         assert team.solved["Location1"] == 10
 
         assert Path(file_path).exists()
+
+
+def test_team_state_save_increments_version():
+    """Test that every save increments the version and writes the file atomically."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = f"{temp_dir}/team_state.yaml"
+
+        team = TeamState(name="Team A", goal_location_name="Location A", file_path=file_path)
+        assert team.version == 1
+
+        team.solved["Location A"] = 1
+        team.save()
+        assert team.version == 2
+        assert sorted(path.suffix for path in Path(temp_dir).iterdir()) == [".lock", ".yaml"]
+
+
+def test_team_state_concurrent_save_merges():
+    """Test that a save based on an outdated version keeps the answers of the other save."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = f"{temp_dir}/team_state.yaml"
+        TeamState(name="Team A", goal_location_name="Location A", file_path=file_path)
+
+        phone_1 = TeamState(file_path=file_path, **load_file(file_path))
+        phone_2 = TeamState(file_path=file_path, **load_file(file_path))
+
+        phone_1.solved["Location A"] = 1
+        phone_1.goal_location_name = "Location B"
+        phone_1.save()
+
+        phone_2.solved["Location A"] = -1
+        phone_2.solved["Location C"] = 2
+        phone_2.goal_location_name = "Location D"
+        phone_2.save()
+
+        stored = TeamState(file_path=file_path, **load_file(file_path))
+        assert stored.version == 3
+        assert stored.solved == {"Location A": 1, "Location C": 2}
+        assert stored.goal_location_name == "Location B"
+        assert phone_2.model_dump() == stored.model_dump()
+
+
+def test_team_state_parallel_saves_lose_no_answers():
+    """Test that many threads answering for the same team never lose an answer."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = f"{temp_dir}/team_state.yaml"
+        TeamState(name="Team A", goal_location_name="Location A", file_path=file_path)
+
+        def answer(location: str) -> None:
+            team = TeamState(file_path=file_path, **load_file(file_path))
+            team.solved[location] = 1
+            team.write(retries=100)
+
+        threads = [threading.Thread(target=answer, args=(f"L{ix}",)) for ix in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stored = load_file(file_path)
+        assert stored["solved"] == {f"L{ix}": 1 for ix in range(16)}
+        assert stored["version"] == 17
+
+
+def test_team_state_save_gives_up_after_retries():
+    """Test that a save raises when it keeps conflicting."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = f"{temp_dir}/team_state.yaml"
+        team = TeamState(name="Team A", goal_location_name="Location A", file_path=file_path)
+
+        with (
+            patch.object(TeamState, "_merge"),
+            pytest.raises(RuntimeError, match="Failed to save team state 'Team A' after 2"),
+        ):
+            team.version = 0
+            team.write(retries=2)
@@ -0,0 +1,106 @@
+"""Tests for the TeamStateCache."""
+
+import tempfile
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from models import TeamState
+from models.team_state_cache import TeamStateCache
+
+
+@pytest.fixture
+def temp_dir() -> Generator[Path, None, None]:
+    """Create a temporary folder for testing."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+def create_team_state(temp_dir: Path, name: str) -> Path:
+    """Create a team state file and return its path."""
+    file_path = temp_dir / f"{name}.yaml"
+    TeamState(file_path=str(file_path), name=name, goal_location_name="Location A")
+    return file_path
+
+
+def test_cache_hit_and_miss(temp_dir):
+    """Test that an unchanged file is only parsed once."""
+    cache = TeamStateCache()
+    file_path = create_team_state(temp_dir, "TeamA")
+
+    first = cache.load(file_path)
+    second = cache.load(file_path)
+
+    assert first == second
+    assert cache.misses == 1
+    assert cache.hits == 1
+
+
+def test_cache_returns_copies(temp_dir):
+    """Test that changing a loaded team state does not change the cached version."""
+    cache = TeamStateCache()
+    file_path = create_team_state(temp_dir, "TeamA")
+
+    team_state = cache.load(file_path)
+    team_state.record_answer("Location A", 1, option="Answer")
+
+    cached = cache.load(file_path, copy=False)
+    assert cached.solved == {}
+    assert cached._options == {}
+
+
+def test_cache_detects_changed_file(temp_dir):
+    """Test that a saved team state is re-read."""
+    cache = TeamStateCache()
+    file_path = create_team_state(temp_dir, "TeamA")
+
+    team_state = cache.load(file_path)
+    team_state.solved["Location A"] = 1
+    team_state.save()
+
+    assert cache.load(file_path).solved == {"Location A": 1}
+    assert cache.misses == 2
+
+
+def test_cache_missing_file(temp_dir):
+    """Test that a missing file returns None and drops the cached entry."""
+    cache = TeamStateCache()
+    file_path = create_team_state(temp_dir, "TeamA")
+    cache.load(file_path)
+
+    file_path.unlink()
+
+    assert cache.load(file_path) is None
+    assert len(cache) == 0
+
+
+def test_cache_file_deleted_after_stat(temp_dir):
+    """Test that a file deleted between the `stat` and the parse returns None."""
+    cache = TeamStateCache()
+    file_path = create_team_state(temp_dir, "TeamA")
+    cache.load(file_path)
+    file_path.write_text("name: TeamA\ngoal_location_name: Location B\n")
+
+    with patch("models.team_state_cache.load_file", side_effect=FileNotFoundError):
+        assert cache.load(file_path) is None
+
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used(temp_dir):
+    """Test that the cache never holds more than `maxsize` team states."""
+    cache = TeamStateCache(maxsize=2)
+    team_a, team_b, team_c = (create_team_state(temp_dir, name) for name in "ABC")
+
+    cache.load(team_a)
+    cache.load(team_b)
+    cache.load(team_a)
+    cache.load(team_c)
+
+    assert len(cache) == 2
+    cache.load(team_a)
+    assert cache.hits == 2
+    cache.load(team_b)
+    assert cache.misses == 4
@@ -0,0 +1,165 @@
+"""Tests for the write-behind flusher."""
+
+import tempfile
+import time
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from models import State, TeamState
+from models.codecs import load_file
+from models.write_behind import WriteBehindFlusher
+
+
+@pytest.fixture
+def temp_dir() -> Generator[Path, None, None]:
+    """Create a temporary folder for testing."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+@pytest.fixture
+def flusher() -> Generator[WriteBehindFlusher, None, None]:
+    """Create a flusher with a long durability window, so only explicit flushes write."""
+    flusher = WriteBehindFlusher(durability_window=3600)
+    yield flusher
+    flusher.stop()
+
+
+def test_flusher_requires_positive_window():
+    """Test that a flusher without a durability window is refused."""
+    with pytest.raises(ValueError, match="durability window must be positive"):
+        WriteBehindFlusher(durability_window=0)
+
+
+def test_flusher_coalesces_saves(temp_dir, flusher):
+    """Test that several saves of the same team result in a single write."""
+    file_path = str(temp_dir / "TeamA.yaml")
+    team_state = TeamState(
+        file_path=file_path, flusher=flusher, name="TeamA", goal_location_name="Location A"
+    )
+    assert not Path(file_path).exists()
+
+    for location in ["Location A", "Location B", "Location C"]:
+        team_state.solved[location] = 1
+        team_state.save()
+
+    assert flusher.pending("TeamA").solved == team_state.solved
+    flusher.flush()
+
+    assert flusher.n_writes == 1
+    assert flusher.pending("TeamA") is None
+    assert load_file(file_path)["solved"] == {
+        "Location A": 1,
+        "Location B": 1,
+        "Location C": 1,
+    }
+
+
+def test_flusher_merges_saves_of_different_sessions(temp_dir, flusher):
+    """Test that coalescing keeps the answers of two sessions of the same team."""
+    file_path = str(temp_dir / "TeamA.yaml")
+    TeamState(file_path=file_path, name="TeamA", goal_location_name="Location A")
+
+    phone_1 = TeamState(file_path=file_path, flusher=flusher, **load_file(file_path))
+    phone_2 = TeamState(file_path=file_path, flusher=flusher, **load_file(file_path))
+    phone_1.solved["Location A"] = 1
+    phone_1.save()
+    phone_2.solved["Location B"] = 2
+    phone_2.save()
+    flusher.flush()
+
+    assert load_file(file_path)["solved"] == {"Location A": 1, "Location B": 2}
+
+
+def test_flusher_flushes_when_too_many_teams_are_pending(temp_dir):
+    """Test that reaching `max_pending` triggers a flush before the window passes."""
+    flusher = WriteBehindFlusher(durability_window=3600, max_pending=2)
+    for team_name in ["TeamA", "TeamB"]:
+        TeamState(
+            file_path=str(temp_dir / f"{team_name}.yaml"),
+            flusher=flusher,
+            name=team_name,
+            goal_location_name="Location A",
+        )
+
+    deadline = time.monotonic() + 5
+    while flusher.n_writes < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert flusher.n_writes == 2
+    flusher.stop()
+
+
+def test_flusher_flushes_after_durability_window(temp_dir):
+    """Test that pending saves are written once the durability window passed."""
+    flusher = WriteBehindFlusher(durability_window=0.05)
+    file_path = temp_dir / "TeamA.yaml"
+    TeamState(
+        file_path=str(file_path), flusher=flusher, name="TeamA", goal_location_name="Location A"
+    )
+
+    deadline = time.monotonic() + 5
+    while not file_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert file_path.exists()
+    flusher.stop()
+
+
+def test_flusher_stop_writes_pending_saves(temp_dir):
+    """Test that stopping the flusher writes everything that is pending."""
+    flusher = WriteBehindFlusher(durability_window=3600)
+    file_path = temp_dir / "TeamA.yaml"
+    TeamState(
+        file_path=str(file_path), flusher=flusher, name="TeamA", goal_location_name="Location A"
+    )
+
+    flusher.stop()
+
+    assert file_path.exists()
+
+
+def test_state_with_write_behind(temp_dir):
+    """Test that a state with a durability window reads its own pending saves."""
+    game = MagicMock()
+    game.locations = [MagicMock()]
+    game.locations[0].name = "Location A"
+
+    state = State(file_path=str(temp_dir / "state.yaml"), game=game, write_behind_window=3600)
+    team_state = state.get_or_create_team_state("TeamA")
+    team_state.solved["Location A"] = 1
+    team_state.save()
+
+    assert not (temp_dir / "team_states" / "TeamA.yaml").exists()
+    assert state.team_exists("TeamA")
+    assert state.n_active_teams == 1
+    assert state.get_or_create_team_state("TeamA").solved == {"Location A": 1}
+    assert state.get_teams_as_dict()["TeamA"].solved == {"Location A": 1}
+
+    state._flusher.flush()
+
+    assert load_file(temp_dir / "team_states" / "TeamA.yaml")["solved"] == {"Location A": 1}
+    assert state.get_or_create_team_state("TeamA").solved == {"Location A": 1}
+
+
+def test_state_registers_team_after_first_write(temp_dir):
+    """Test that another state listing the teams before the first flush keeps the team."""
+    game = MagicMock()
+    game.locations = [MagicMock()]
+    game.locations[0].name = "Location A"
+
+    state = State(file_path=str(temp_dir / "state.yaml"), game=game, write_behind_window=3600)
+    state.get_or_create_team_state("TeamA").save()
+
+    # the admin app renders while the new team is only pending in the player's flusher
+    admin_state = State(file_path=str(temp_dir / "state.yaml"), game=game)
+    assert admin_state.get_teams_as_dict() == {}
+
+    state._flusher.flush()
+
+    assert "TeamA" in admin_state.get_teams_as_dict()
+    assert admin_state.n_active_teams == 1
+    assert "-TeamA.yaml" not in (temp_dir / "team_states.manifest").read_text()
@@ -23,6 +23,31 @@ def test_constants():
     assert LOGGING_FILE == DEFAULT_LOGGING_FILE
 
 
+def test_logging_constants():
+    """Test that the settings of the location log writer are parsed."""
+    from constants import (
+        LOGGING_FLUSH_INTERVAL,
+        LOGGING_QUEUE_SIZE,
+        LOGGING_OVERFLOW,
+        LOGGING_MIN_DISTANCE,
+        LOGGING_MIN_INTERVAL,
+    )
+
+    assert LOGGING_FLUSH_INTERVAL == 1.0
+    assert LOGGING_QUEUE_SIZE == 10_000
+    assert LOGGING_OVERFLOW == "drop"
+    assert LOGGING_MIN_DISTANCE == 10.0
+    assert LOGGING_MIN_INTERVAL == 60.0
+
+
+def test_map_constants():
+    """Test that the settings of the admin map are parsed."""
+    from constants import MAP_TOLERANCE, MAP_MAX_VERTICES
+
+    assert MAP_TOLERANCE == 5.0
+    assert MAP_MAX_VERTICES == 5000
+
+
 def test_overwritten_constants(monkeypatch):
     """Test that the constants are overwritten."""
     monkeypatch.setenv("GAME_FILE", "test_game.yaml")